@@ -1,18 +1,16 @@
+import sys
 import os
-import json
-import requests
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from datetime import datetime
-from groq import Groq
 import time
+from core.post_queue import get_queue
+from core import serialization
+from core.near_duplicate import NearDuplicateIndex
 
 class SEOAmplifier:
     def __init__(self):
-        # Remove proxy issues
-        for proxy_var in ['http_proxy', 'https_proxy', 'HTTP_PROXY', 'HTTPS_PROXY', 'proxies']:
-            os.environ.pop(proxy_var, None)
-        
-        # Initialize Groq for content expansion
-        self.groq_client = Groq(api_key=os.environ.get("GROQ_API_KEY"))
+        # Groq client for content expansion, created on first use
+        self._groq_client = None
         self.model = "llama-3.1-70b-versatile"  # Best for longer content
         
         # Platform credentials
@@ -22,19 +20,34 @@ class SEOAmplifier:
         
         # Track published articles to avoid duplicates
         self.published_history = self.load_published_history()
+        # Indexes of what was published, built on the first check
+        self._published_starts = None
+        self._published_similar = None
+    
+    @property
+    def groq_client(self):
+        """Groq client, created (and groq imported) on first use"""
+        if self._groq_client is None:
+            from groq import Groq
+            
+            # Remove proxy issues
+            for proxy_var in ['http_proxy', 'https_proxy', 'HTTP_PROXY', 'HTTPS_PROXY', 'proxies']:
+                os.environ.pop(proxy_var, None)
+            
+            self._groq_client = Groq(api_key=os.environ.get("GROQ_API_KEY"))
+        return self._groq_client
     
     def load_published_history(self):
         """Load history of published articles"""
         try:
-            with open('published_articles.json', 'r') as f:
-                return json.load(f)
-        except:
-            return {"articles": []}
+            history = serialization.load('published_articles.json')
+        except ValueError:
+            history = None
+        return history or {"articles": []}
     
     def save_published_history(self):
         """Save published history"""
-        with open('published_articles.json', 'w') as f:
-            json.dump(self.published_history, f, indent=2)
+        serialization.save('published_articles.json', self.published_history)
     
     def expand_expert_post(self, expert_post):
         """Expand a 250-char expert post into a full article"""
@@ -201,6 +214,8 @@ class SEOAmplifier:
             }
         }
         
+        import requests
+        
         try:
             response = requests.post(
                 'https://dev.to/api/articles',
@@ -254,6 +269,8 @@ class SEOAmplifier:
             'publishStatus': 'public'
         }
         
+        import requests
+        
         try:
             response = requests.post(
                 f'https://api.medium.com/v1/users/{self.medium_user_id}/posts',
@@ -279,13 +296,8 @@ class SEOAmplifier:
     
     def amplify_expert_posts(self, num_posts=1):
         """Load expert posts and amplify them to articles"""
-        # Load expert queue
-        try:
-            with open('expert_queue.json', 'r') as f:
-                expert_posts = json.load(f)
-        except:
-            print("❌ No expert posts found in queue")
-            return
+        # Look at the next posts in the expert queue (they stay queued)
+        expert_posts = get_queue('expert').peek(num_posts)
         
         if not expert_posts:
             print("📭 Expert queue is empty")
@@ -331,13 +343,24 @@ class SEOAmplifier:
         
         print(f"\n📊 Amplified {amplified_count} posts to SEO platforms")
     
+    def index_published(self):
+        """Index published articles by start and by wording (once)"""
+        if self._published_starts is None:
+            self._published_starts = set()
+            self._published_similar = NearDuplicateIndex()
+            for number, article in enumerate(self.published_history['articles']):
+                self._add_to_index(number, article['original_content'])
+    
+    def _add_to_index(self, number, content):
+        self._published_starts.add(content[:50].lower())
+        self._published_similar.add(number, content)
+    
     def is_already_published(self, content):
-        """Check if content was already published"""
-        content_start = content[:50].lower()
-        for article in self.published_history['articles']:
-            if article['original_content'][:50].lower() == content_start:
-                return True
-        return False
+        """Check if content (or a rewording of it) was already published"""
+        self.index_published()
+        if content[:50].lower() in self._published_starts:
+            return True
+        return self._published_similar.find(content) is not None
     
     def track_publication(self, original_post, article, results):
         """Track published articles"""
@@ -351,9 +374,12 @@ class SEOAmplifier:
         }
         
         self.published_history['articles'].append(publication_record)
+        if self._published_starts is not None:
+            self._add_to_index(len(self.published_history['articles']) - 1, original_post['content'])
         self.save_published_history()
-# Add this to the end of seo_amplifier.py after the main execution line
 
+# Main execution
+if __name__ == "__main__":
     import sys
     
     amplifier = SEOAmplifier()
@@ -364,8 +390,7 @@ class SEOAmplifier:
             amplifier.amplify_expert_posts(num_posts=3)
         elif sys.argv[1] == "--preview":
             # Just preview expansion
-            with open('expert_queue.json', 'r') as f:
-                posts = json.load(f)
+            posts = get_queue('expert').peek(1)
             if posts:
                 article = amplifier.expand_expert_post(posts[0])
                 if article:
@@ -20,8 +20,95 @@ class Config:
     FACEBOOK_PAGE_ID = os.environ.get('FACEBOOK_PAGE_ID')
     FACEBOOK_ACCESS_TOKEN = os.environ.get('FACEBOOK_ACCESS_TOKEN')
     
+    # Extra accounts (brands), comma separated; each reads its credentials
+    # from the same variables prefixed with its name (ACME_TWITTER_API_KEY)
+    ACCOUNTS = [name.strip() for name in os.environ.get('ACCOUNTS', '').split(',') if name.strip()]
+    # Posts in flight at once across all accounts (tenant scheduler)
+    TENANT_WORKERS = int(os.environ.get('TENANT_WORKERS', '4'))
+    
+    # Posting fan-out: platforms posted in parallel (1 = one at a time)
+    # and seconds each platform gets before it is reported as timed out
+    POST_MAX_WORKERS = int(os.environ.get('POST_MAX_WORKERS', '4'))
+    POST_PLATFORM_TIMEOUT = float(os.environ.get('POST_PLATFORM_TIMEOUT', '60'))
+    # Batch posting (post_many): requests in flight per platform
+    POST_MANY_CONCURRENCY = int(os.environ.get('POST_MANY_CONCURRENCY', '2'))
+    
+    # HTTP sessions for LinkedIn/Facebook/Dev.to/Medium: keep-alive
+    # connections per host, timeouts in seconds, connection retries
+    HTTP_POOL_SIZE = int(os.environ.get('HTTP_POOL_SIZE', '10'))
+    HTTP_CONNECT_TIMEOUT = float(os.environ.get('HTTP_CONNECT_TIMEOUT', '10'))
+    HTTP_READ_TIMEOUT = float(os.environ.get('HTTP_READ_TIMEOUT', '30'))
+    HTTP_RETRIES = int(os.environ.get('HTTP_RETRIES', '2'))
+    
     # Groq AI
     GROQ_API_KEY = os.environ.get('GROQ_API_KEY')
+    # Groq budget (requests and tokens per minute of the model in use) and
+    # how many posts are generated at once
+    GROQ_RPM = int(os.environ.get('GROQ_RPM', '30'))
+    GROQ_TPM = int(os.environ.get('GROQ_TPM', '6000'))
+    GROQ_WORKERS = int(os.environ.get('GROQ_WORKERS', '4'))
+    # Posts asked for in one request (JSON reply); 1 = one request per post
+    GROQ_BATCH_SIZE = int(os.environ.get('GROQ_BATCH_SIZE', '1'))
+    
+    # Rate limits: override the known per-platform quotas as
+    # platform=requests/seconds, e.g. RATE_LIMITS=twitter=50/86400,devto=10/30
+    RATE_LIMITS = {
+        name.strip(): tuple(int(n) for n in quota.split('/'))
+        for name, quota in (item.split('=') for item in
+                            os.environ.get('RATE_LIMITS', '').split(',') if item.strip())
+    }
+    # Longest a post waits for its platform's budget before it is deferred
+    RATE_LIMIT_MAX_WAIT = float(os.environ.get('RATE_LIMIT_MAX_WAIT', '60'))
+    
+    # Retrying failed platforms of a queued item: attempts before a platform
+    # is given up on, and the exponential backoff between them (seconds)
+    DELIVERY_MAX_ATTEMPTS = int(os.environ.get('DELIVERY_MAX_ATTEMPTS', '5'))
+    DELIVERY_BACKOFF_BASE = float(os.environ.get('DELIVERY_BACKOFF_BASE', '300'))
+    DELIVERY_BACKOFF_MAX = float(os.environ.get('DELIVERY_BACKOFF_MAX', '21600'))
+    
+    # Post queues (content, expert) live in one SQLite database
+    QUEUE_DB = os.environ.get('QUEUE_DB', os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), 'data', 'queue.db'))
+    # A claimed item is leased to its worker this long before others may take it
+    QUEUE_LEASE_SECONDS = float(os.environ.get('QUEUE_LEASE_SECONDS', '300'))
+    # A failed item is retried after an exponential backoff (seconds) and
+    # moved to the dead-letter store after QUEUE_MAX_ATTEMPTS failures
+    QUEUE_MAX_ATTEMPTS = int(os.environ.get('QUEUE_MAX_ATTEMPTS', '10'))
+    QUEUE_RETRY_BASE = float(os.environ.get('QUEUE_RETRY_BASE', '60'))
+    QUEUE_RETRY_MAX = float(os.environ.get('QUEUE_RETRY_MAX', '21600'))
+    # Daily slots scheduled expert posts are spread over (HH:MM, comma separated)
+    EXPERT_POST_TIMES = [t.strip() for t in os.environ.get(
+        'EXPERT_POST_TIMES', '09:00,10:30,11:45,14:00,15:30,17:00,18:30').split(',') if t.strip()]
+    
+    # Post history: append-only JSONL, rotated at HISTORY_MAX_BYTES keeping
+    # HISTORY_BACKUPS old files; fsync after N records or N seconds
+    HISTORY_FILE = os.environ.get('HISTORY_FILE', os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), 'data', 'post_history.jsonl'))
+    HISTORY_MAX_BYTES = int(os.environ.get('HISTORY_MAX_BYTES', str(10 * 1024 * 1024)))
+    HISTORY_BACKUPS = int(os.environ.get('HISTORY_BACKUPS', '10'))
+    HISTORY_FSYNC_EVERY = int(os.environ.get('HISTORY_FSYNC_EVERY', '10'))
+    HISTORY_FSYNC_INTERVAL = float(os.environ.get('HISTORY_FSYNC_INTERVAL', '5'))
+    
+    # Ledger of what was posted where, checked before every post so the
+    # same content never goes to a platform twice (empty to disable)
+    DELIVERY_LEDGER = os.environ.get('DELIVERY_LEDGER', os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), 'data', 'delivery_ledger.db'))
+    
+    # Format for saved history and queue files: auto (orjson if installed,
+    # else json), json, orjson or msgpack. Files in any format still load.
+    SERIALIZER = os.environ.get('SERIALIZER', 'auto')
+    
+    # Near-duplicate detection: posts whose word-pair shingles overlap at
+    # least THRESHOLD (Jaccard, 0-1) with a past post count as duplicates
+    NEAR_DUPLICATE_THRESHOLD = float(os.environ.get('NEAR_DUPLICATE_THRESHOLD', '0.25'))
+    NEAR_DUPLICATE_SIGNATURE = int(os.environ.get('NEAR_DUPLICATE_SIGNATURE', '128'))
+    NEAR_DUPLICATE_SHINGLE = int(os.environ.get('NEAR_DUPLICATE_SHINGLE', '2'))
+    
+    # Cache of expanded long-form content: entries kept in memory, and a
+    # directory shared across processes (empty to keep it in memory only)
+    EXPANSION_CACHE_SIZE = int(os.environ.get('EXPANSION_CACHE_SIZE', '256'))
+    EXPANSION_CACHE_DIR = os.environ.get('EXPANSION_CACHE_DIR', os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), 'data', 'expansion_cache'))
     
     # SEO Platforms (optional)
     DEVTO_API_KEY = os.environ.get('DEVTO_API_KEY')
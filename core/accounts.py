@@ -0,0 +1,77 @@
+# accounts.py
+"""Accounts (tenants): one brand's credentials each
+
+The default account uses the plain variables (TWITTER_API_KEY, ...).
+Other accounts are listed in ACCOUNTS and set the same variables with the
+account name as a prefix:
+
+    ACCOUNTS=acme,globex
+    ACME_TWITTER_API_KEY=...
+    GLOBEX_DEVTO_API_KEY=...
+
+Each account gets its own platform clients, rate-limit budgets, queue
+partitions, delivery records and post histories, so accounts never post
+for each other, spend each other's quota or block each other's posts as
+duplicates.
+"""
+import os
+
+from config import Config
+
+DEFAULT_ACCOUNT = 'default'
+
+# Settings each account sets for itself
+CREDENTIALS = [
+    'TWITTER_API_KEY', 'TWITTER_API_SECRET', 'TWITTER_ACCESS_TOKEN',
+    'TWITTER_ACCESS_SECRET', 'TWITTER_BEARER_TOKEN',
+    'LINKEDIN_ACCESS_TOKEN', 'LINKEDIN_USER_ID',
+    'FACEBOOK_PAGE_ID', 'FACEBOOK_ACCESS_TOKEN',
+    'DEVTO_API_KEY',
+    'MEDIUM_ACCESS_TOKEN', 'MEDIUM_USER_ID',
+    'REDDIT_CLIENT_ID', 'REDDIT_CLIENT_SECRET', 'REDDIT_USERNAME', 'REDDIT_PASSWORD',
+    'MASTODON_ACCESS_TOKEN',
+]
+
+# Settings an account may override, defaulting to the global value
+OVERRIDABLE = ['MASTODON_INSTANCE_URL', 'REDDIT_USER_AGENT', 'RATE_LIMITS']
+
+
+def is_default(account):
+    return account is None or account == DEFAULT_ACCOUNT
+
+
+class AccountConfig:
+    """Config as one account sees it: its own credentials, Config for the rest"""
+
+    def __init__(self, name):
+        self.name = name
+        self.prefix = name.upper().replace('-', '_') + '_'
+
+    def __getattr__(self, key):
+        if key in CREDENTIALS:
+            return os.environ.get(self.prefix + key)
+        if key in OVERRIDABLE and os.environ.get(self.prefix + key):
+            value = os.environ[self.prefix + key]
+            if key == 'RATE_LIMITS':
+                return {name.strip(): tuple(int(n) for n in quota.split('/'))
+                        for name, quota in (item.split('=') for item in value.split(',') if item.strip())}
+            return value
+        return getattr(Config, key)
+
+
+def account_config(account=None):
+    """Settings for an account (Config itself for the default account)"""
+    return Config if is_default(account) else AccountConfig(account)
+
+
+def account_path(path, account=None):
+    """An account's copy of a file: data/post_history.jsonl -> data/post_history.acme.jsonl"""
+    if is_default(account):
+        return path
+    base, extension = os.path.splitext(path)
+    return f"{base}.{account}{extension}"
+
+
+def account_names():
+    """The default account followed by those in ACCOUNTS"""
+    return [DEFAULT_ACCOUNT] + [name for name in Config.ACCOUNTS if name != DEFAULT_ACCOUNT]
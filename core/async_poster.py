@@ -0,0 +1,674 @@
+# async_poster.py
+import asyncio
+import functools
+import queue
+import threading
+from datetime import datetime
+
+from config import Config
+from core.client_registry import LazyPlatforms, get_client_registry
+from core.delivery_ledger import fingerprint, get_delivery_ledger
+from core.expansion_cache import get_expansion_cache
+from core.rate_limiter import get_rate_limiter
+from core.renderer import PostRenderer, truncate
+
+# Model and prompt used by expand_content_for_platform. Bump the prompt
+# version whenever the prompt changes so cached expansions are not reused.
+EXPANSION_MODEL = "llama-3.1-8b-instant"
+EXPANSION_PROMPT_VERSION = 1
+
+
+class AsyncSocialMediaPoster:
+    """Asyncio posting engine
+
+    LinkedIn, Facebook, Dev.to and Medium go through a pooled keep-alive
+    httpx client per host (HttpSessionPool).
+    The blocking SDKs (tweepy, praw, Mastodon.py) run in the loop's executor.
+    Clients come from the process-wide ClientRegistry and are built the
+    first time a platform is used.
+    """
+
+    # Order in which results are reported (and platforms are posted to
+    # when running sequentially)
+    PLATFORM_ORDER = ['twitter', 'linkedin', 'facebook', 'devto',
+                      'medium', 'reddit', 'mastodon']
+
+    def __init__(self, max_workers=None, platform_timeout=None, http_pool=None,
+                 expansion_cache=None, registry=None, rate_limiter=None, renderer=None,
+                 ledger=None, account=None):
+        # The account (brand) posts go out as; see core/accounts.py
+        self.account = account
+        self.registry = registry if registry is not None else get_client_registry(account)
+        self.platforms = LazyPlatforms(self.registry)
+        # Fan-out settings: max_workers <= 1 posts one platform at a time
+        self.max_workers = max_workers if max_workers is not None else Config.POST_MAX_WORKERS
+        self.platform_timeout = platform_timeout if platform_timeout is not None else Config.POST_PLATFORM_TIMEOUT
+        # Keep-alive clients for the REST platforms (default: the registry's)
+        self._http_pool = http_pool
+        # One Groq expansion per content: cached, and shared while in flight
+        self.expansion_cache = expansion_cache if expansion_cache is not None else get_expansion_cache()
+        self._expansions_in_flight = {}
+        # Per-platform budgets, kept up to date from rate-limit headers
+        self.rate_limiter = rate_limiter if rate_limiter is not None else get_rate_limiter(account)
+        # Builds each platform's text, counting length the platform's way
+        self.renderer = renderer if renderer is not None else PostRenderer()
+        # What already went where (default: the shared ledger, opened on first post)
+        self._ledger = ledger
+        self._deliveries_in_flight = {}
+
+    @property
+    def http_pool(self):
+        """HTTP pool for the REST platforms (call from the running loop)"""
+        if self._http_pool is not None:
+            return self._http_pool
+        return self.registry.http_pool()
+
+    @property
+    def ledger(self):
+        """Delivery ledger consulted before each post (None = disabled)"""
+        if self._ledger is not None:
+            return self._ledger
+        return get_delivery_ledger()
+
+    async def _run_blocking(self, func, *args, **kwargs):
+        """Run a blocking SDK call in the loop's executor"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, functools.partial(func, *args, **kwargs))
+
+    async def aclose(self):
+        """Close the HTTP pool passed to this poster; the shared one stays open"""
+        if self._http_pool is not None:
+            await self._http_pool.aclose()
+
+    def create_post(self, title, content, url):
+        """Create a post object with platform-specific formatting"""
+        return {
+            'title': title,
+            'content': content,
+            'url': url,
+            'timestamp': datetime.now().isoformat()
+        }
+
+    async def expand_content_for_platform(self, post, platform):
+        """Expand short content to longer form for certain platforms"""
+        if platform in ['twitter', 'facebook']:
+            # Keep short for Twitter/Facebook
+            return post['content']
+
+        # For platforms that support longer content: every platform gets
+        # the same expansion, so ask Groq at most once per content
+        key = self.expansion_cache.make_key(
+            post['content'], EXPANSION_MODEL, EXPANSION_PROMPT_VERSION)
+        expanded = self.expansion_cache.get(key)
+        if expanded is not None:
+            return expanded
+
+        task = self._expansions_in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._expand(post['content']))
+            self._expansions_in_flight[key] = task
+            task.add_done_callback(lambda _: self._expansions_in_flight.pop(key, None))
+
+        # Shielded so one platform timing out doesn't cancel it for the others
+        expanded = await asyncio.shield(task)
+        if expanded is None:
+            return post['content']
+
+        self.expansion_cache.put(key, expanded)
+        return expanded
+
+    async def _expand(self, content):
+        """Ask Groq for the expansion; None if the call fails"""
+        try:
+            groq_client = self.registry.groq()
+
+            # Expand content using AI
+            response = await groq_client.chat.completions.create(
+                model=EXPANSION_MODEL,
+                messages=[
+                    {
+                        "role": "system",
+                        "content": "You are an AI/ML expert. Expand the following short insight into a detailed, engaging post (800-1000 characters). Keep the same tone and add valuable details, examples, or explanations."
+                    },
+                    {
+                        "role": "user",
+                        "content": f"Expand this into 800-1000 characters:\n\n{content}"
+                    }
+                ],
+                temperature=0.7,
+                max_tokens=300
+            )
+
+            expanded = response.choices[0].message.content.strip()
+
+            # Ensure it's not too long
+            if len(expanded) > 1000:
+                expanded = expanded[:997] + "..."
+
+            return expanded
+
+        except Exception as e:
+            print(f"⚠️  Expansion failed, using original: {e}")
+            return None
+
+    def _truncate_logical(self, text, max_length):
+        """Truncate text at last full sentence or word within max_length."""
+        return truncate(text, max_length)
+
+    async def post_to_mastodon(self, post):
+        """Post to Mastodon"""
+        try:
+            # 500 characters, links counted as 23
+            mastodon_text = self.renderer.render_mastodon(post)['text']
+            api = self.platforms['mastodon']
+            status = await self._run_blocking(
+                api.status_post,
+                mastodon_text,
+                visibility='public'
+            )
+            self.rate_limiter.observe('mastodon', api.ratelimit_remaining, api.ratelimit_reset)
+            return {
+                'success': True,
+                'id': status['id'],
+                'url': status['url']
+            }
+        except Exception as e:
+            return {'success': False, 'error': str(e)}
+
+    async def post_to_twitter(self, post):
+        """Post to Twitter/X with 280 character limit using v2 API"""
+        import tweepy
+
+        try:
+            # 280 weighted characters, links counted as 23 (t.co)
+            tweet = self.renderer.render_twitter(post)['text']
+
+            # Post tweet using v2 API
+            response = await self._run_blocking(
+                self.platforms['twitter'].create_tweet, text=tweet)
+
+            tweet_id = response.data['id'] if response.data else None
+
+            return {'success': True, 'id': tweet_id, 'text': tweet}
+
+        except tweepy.TweepyException as e:
+            return {'success': False, 'error': str(e)}
+        except Exception as e:
+            return {'success': False, 'error': f"Unexpected error: {str(e)}"}
+
+    async def post_to_linkedin(self, post):
+        """Post to LinkedIn"""
+        try:
+            headers = {
+                'Authorization': f'Bearer {self.platforms["linkedin"]["token"]}',
+                'Content-Type': 'application/json',
+                'X-Restli-Protocol-Version': '2.0.0'
+            }
+
+            # LinkedIn allows long posts - use expanded content
+            expanded = None
+            if post.get('content'):
+                expanded = await self.expand_content_for_platform(post, 'linkedin')
+            linkedin_text = self.renderer.render_linkedin(post, expanded)['text']
+
+            # LinkedIn API payload
+            data = {
+                "author": f"urn:li:person:{self.platforms['linkedin']['user_id']}",
+                "lifecycleState": "PUBLISHED",
+                "specificContent": {
+                    "com.linkedin.ugc.ShareContent": {
+                        "shareCommentary": {
+                            "text": linkedin_text  # No truncation needed for LinkedIn
+                        },
+                        "shareMediaCategory": "NONE"
+                    }
+                },
+                "visibility": {
+                    "com.linkedin.ugc.MemberNetworkVisibility": "PUBLIC"
+                }
+            }
+
+            response = await self.http_pool.post(
+                'https://api.linkedin.com/v2/ugcPosts',
+                headers=headers,
+                json=data
+            )
+            self.rate_limiter.observe_headers('linkedin', response.headers)
+
+            if response.status_code == 201:
+                return {'success': True, 'id': response.headers.get('x-restli-id')}
+            else:
+                return {'success': False, 'error': response.text}
+
+        except Exception as e:
+            return {'success': False, 'error': str(e)}
+
+    async def post_to_facebook(self, post):
+        """Post to Facebook Page"""
+        try:
+            # Format content for Facebook
+            message = self.renderer.render_facebook(post)['text']
+
+            # Facebook Graph API endpoint
+            url = f"https://graph.facebook.com/v18.0/{self.platforms['facebook']['page_id']}/feed"
+
+            params = {
+                'message': message,
+                'access_token': self.platforms['facebook']['token']
+            }
+
+            # If there's a URL, add it as a link
+            if post.get('url'):
+                params['link'] = post['url']
+
+            response = await self.http_pool.post(url, data=params)
+            self.rate_limiter.observe_headers('facebook', response.headers)
+
+            if response.status_code == 200:
+                result = response.json()
+                return {'success': True, 'id': result.get('id')}
+            else:
+                return {'success': False, 'error': response.text}
+
+        except Exception as e:
+            return {'success': False, 'error': str(e)}
+
+    async def post_to_devto(self, post):
+        """Post to Dev.to as an article"""
+        try:
+            headers = {
+                'api-key': self.platforms['devto']['api_key'],
+                'Content-Type': 'application/json'
+            }
+
+            # Expand content for Dev.to
+            expanded_content = await self.expand_content_for_platform(post, 'devto')
+            article = self.renderer.render_devto(post, expanded_content)
+
+            article_data = {
+                'article': {
+                    'title': article['title'],
+                    'body_markdown': article['text'],
+                    'tags': ['ai', 'machinelearning', 'technology', 'programming'],
+                    'published': True
+                }
+            }
+
+            response = await self.http_pool.post(
+                'https://dev.to/api/articles',
+                headers=headers,
+                json=article_data
+            )
+            self.rate_limiter.observe_headers('devto', response.headers)
+
+            if response.status_code == 201:
+                result = response.json()
+                return {'success': True,
+                    'id': result['id'], 'url': result['url']}
+            else:
+                return {'success': False, 'error': response.text}
+
+        except Exception as e:
+            return {'success': False, 'error': str(e)}
+
+    async def post_to_medium(self, post):
+        """Post to Medium"""
+        try:
+            headers = {
+                'Authorization': f'Bearer {self.platforms["medium"]["token"]}',
+                'Content-Type': 'application/json',
+                'Accept': 'application/json'
+            }
+
+            # Expand content for Medium
+            expanded_content = await self.expand_content_for_platform(post, 'medium')
+            article = self.renderer.render_medium(post, expanded_content)
+
+            article_data = {
+                'title': article['title'],
+                'contentFormat': 'html',
+                'content': article['text'],
+                'tags': ['artificial-intelligence', 'machine-learning', 'technology'],
+                'publishStatus': 'public'
+            }
+
+            response = await self.http_pool.post(
+                f'https://api.medium.com/v1/users/{self.platforms["medium"]["user_id"]}/posts',
+                headers=headers,
+                json=article_data
+            )
+            self.rate_limiter.observe_headers('medium', response.headers)
+
+            if response.status_code == 201:
+                result = response.json()
+                return {'success': True,
+                    'id': result['data']['id'], 'url': result['data']['url']}
+            else:
+                return {'success': False, 'error': response.text}
+
+        except Exception as e:
+            return {'success': False, 'error': str(e)}
+
+    async def post_to_reddit(self, post, subreddit=None):
+        """Post to Reddit"""
+        import praw
+
+        try:
+            reddit = self.platforms['reddit']
+
+            # Expand content, then apply the subreddit's title rules
+            expanded_content = await self.expand_content_for_platform(post, 'reddit')
+            payload = self.renderer.render_reddit(post, expanded_content, subreddit)
+            subreddit = payload['subreddit']
+
+            print(f"📮 Posting to r/{subreddit}")
+
+            sub = reddit.subreddit(subreddit)
+
+            # Check if subreddit allows text posts
+            if payload['link_only']:
+                # For link-only subs, need to provide a URL
+                submission = await self._run_blocking(
+                    sub.submit,
+                    title=payload['title'],
+                    url=payload['url']
+                )
+            else:
+                # Text post
+                submission = await self._run_blocking(
+                    sub.submit,
+                    title=payload['title'],
+                    selftext=payload['text']
+                )
+
+            limits = reddit.auth.limits
+            self.rate_limiter.observe('reddit', limits.get('remaining'), limits.get('reset_timestamp'))
+
+            print(f"✅ Posted to r/{subreddit}: {submission.url}")
+
+            return {
+                'success': True,
+                'id': submission.id,
+                'url': submission.url,
+                'subreddit': subreddit
+            }
+
+        except praw.exceptions.RedditAPIException as e:
+            error_msg = str(e)
+            if "NO_SELFS" in error_msg or "BODY_NOT_ALLOWED" in error_msg:
+                print(f"❌ r/{subreddit} doesn't allow text posts")
+            return {'success': False, 'error': error_msg}
+
+        except Exception as e:
+            return {'success': False, 'error': str(e)}
+
+    def _platform_posters(self):
+        """Map platform names to their posting coroutines"""
+        return {
+            'twitter': self.post_to_twitter,
+            'linkedin': self.post_to_linkedin,
+            'facebook': self.post_to_facebook,
+            'devto': self.post_to_devto,
+            'medium': self.post_to_medium,
+            'reddit': self.post_to_reddit,
+            'mastodon': self.post_to_mastodon
+        }
+
+    async def _post_with_deadline(self, platform, poster, post):
+        """Post once per content and platform
+
+        Content the ledger says already went to this platform is skipped,
+        returning the stored id and URL ('duplicate': True). The same
+        content being posted concurrently shares one request.
+        """
+        ledger = self.ledger
+        if ledger is None:
+            return await self._post_now(platform, poster, post)
+
+        key = (fingerprint(post, self.account), platform)
+        task = self._deliveries_in_flight.get(key)
+        if task is not None:
+            return dict(await asyncio.shield(task), duplicate=True)
+
+        task = asyncio.ensure_future(self._post_and_record(ledger, key, poster, post))
+        self._deliveries_in_flight[key] = task
+        task.add_done_callback(lambda _: self._deliveries_in_flight.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def _post_and_record(self, ledger, key, poster, post):
+        # The ledger is SQLite: a locked database must not stall the loop
+        try:
+            delivered = await self._run_blocking(ledger.get, *key)
+        except Exception as e:
+            return {'success': False, 'error': f"Delivery ledger unavailable: {e}"}
+        if delivered:
+            print(f"⏭️  {key[1]}: already posted, skipping")
+            return {'success': True, 'id': delivered['id'], 'url': delivered['url'], 'duplicate': True}
+
+        result = await self._post_now(key[1], poster, post)
+        if result.get('success'):
+            try:
+                await self._run_blocking(ledger.record, *key, result)
+            except Exception as e:
+                # It did go out; only a later repost of it won't be caught
+                print(f"⚠️  {key[1]}: posted but not recorded in the ledger: {e}")
+        return result
+
+    async def _post_now(self, platform, poster, post):
+        """Run one platform's poster, giving it platform_timeout seconds
+
+        Waits first for the platform's rate-limit budget; if that would take
+        longer than the limiter's max_wait the post is deferred instead and
+        the result says when to retry.
+        """
+        wait = await self.rate_limiter.acquire_async(platform)
+        if wait:
+            print(f"🚦 {platform} rate limited, deferring (retry in {wait:.0f}s)")
+            return {'success': False, 'error': f"Rate limited, retry in {wait:.0f}s",
+                    'retry_after': wait, 'deferred': True}
+
+        try:
+            return await asyncio.wait_for(poster(post), timeout=self.platform_timeout)
+        except asyncio.TimeoutError:
+            # SDK calls running in the executor finish in the background
+            print(f"⏱️  {platform} timed out after {self.platform_timeout:.0f}s")
+            return {'success': False, 'error': f"Timed out after {self.platform_timeout:.0f}s"}
+        except Exception as e:
+            return {'success': False, 'error': f"Unexpected error: {str(e)}"}
+
+    async def _fan_out(self, post, platforms):
+        """Post to the given platforms, at most max_workers at a time"""
+        posters = self._platform_posters()
+        targets = [p for p in self.PLATFORM_ORDER
+                   if p in platforms and p in self.platforms]
+
+        semaphore = asyncio.Semaphore(max(1, self.max_workers))
+
+        async def run(platform):
+            async with semaphore:
+                return await self._post_with_deadline(platform, posters[platform], post)
+
+        results = await asyncio.gather(*(run(platform) for platform in targets))
+        return dict(zip(targets, results))
+
+    async def post_to_platform(self, platform, post):
+        """Post a create_post() item to one platform"""
+        if platform not in self.platforms:
+            return {'success': False, 'error': f"{platform} is not configured"}
+        return await self._post_with_deadline(platform, self._platform_posters()[platform], post)
+
+    async def post_to_all(self, title, content, url, platforms=None):
+        """Post to all configured platforms (or only the ones given)"""
+        post = self.create_post(title, content, url)
+        return await self._fan_out(post, platforms if platforms is not None else self.PLATFORM_ORDER)
+
+    async def post_many(self, posts, concurrency=None):
+        """Post a batch of items, yielding (index, {platform: result}) as each finishes
+
+        posts is a list of dicts with 'title', 'content' and 'url' (missing
+        keys are treated as empty) and optionally 'platforms' to post to a
+        subset. Work is grouped per platform: each platform drains the whole
+        batch on its own, with up to concurrency requests in flight, so a
+        slow platform never holds up the others. Clients, connections and
+        expansions are shared across the batch.
+        """
+        if concurrency is None:
+            concurrency = Config.POST_MANY_CONCURRENCY
+
+        items = [self.create_post(p.get('title', ''), p.get('content', ''), p.get('url', ''))
+                 for p in posts]
+        posters = self._platform_posters()
+        enabled = [p for p in self.PLATFORM_ORDER if p in self.platforms]
+        targets = [[p for p in enabled if p in post.get('platforms', enabled)] for post in posts]
+
+        results = [{} for _ in items]
+        finished = asyncio.Queue()
+        for index, platforms in enumerate(targets):
+            if not platforms:
+                finished.put_nowait(index)
+
+        async def post_item(platform, index, semaphore):
+            try:
+                async with semaphore:
+                    result = await self._post_with_deadline(platform, posters[platform], items[index])
+            except Exception as e:
+                # Still report this item, or the batch would wait for it forever
+                result = {'success': False, 'error': f"Unexpected error: {str(e)}"}
+            results[index][platform] = result
+            if len(results[index]) == len(targets[index]):
+                await finished.put(index)
+
+        async def drain_platform(platform):
+            semaphore = asyncio.Semaphore(max(1, concurrency))
+            await asyncio.gather(*(post_item(platform, index, semaphore)
+                                   for index in range(len(items))
+                                   if platform in targets[index]))
+
+        workers = [asyncio.ensure_future(drain_platform(platform)) for platform in enabled]
+        try:
+            for _ in range(len(items)):
+                index = await finished.get()
+                yield index, {platform: results[index][platform] for platform in targets[index]}
+        finally:
+            for worker in workers:
+                worker.cancel()
+
+    def get_enabled_platforms(self):
+        """Return list of enabled platforms"""
+        return list(self.platforms.keys())
+
+    def rate_limit_status(self):
+        """Current rate-limit budget per platform"""
+        return self.rate_limiter.status()
+
+    async def post_short_content(self, content, platforms=None):
+        """Post short-form content to specific platforms or all"""
+        if platforms is None:
+            platforms = self.get_enabled_platforms()
+
+        post = self.create_post("", content, "")
+        # Short content is not sent to Mastodon
+        platforms = [p for p in platforms if p != 'mastodon']
+        return await self._fan_out(post, platforms)
+
+    async def get_recent_tweets(self, count=5):
+        """Get recent tweets (example of using the API)"""
+        try:
+            # Get authenticated user's ID
+            me = await self._run_blocking(self.platforms['twitter'].get_me)
+            user_id = me.data.id
+
+            # Get recent tweets
+            tweets = await self._run_blocking(
+                self.platforms['twitter'].get_users_tweets,
+                id=user_id,
+                max_results=count
+            )
+
+            return {'success': True, 'tweets': tweets.data}
+        except Exception as e:
+            return {'success': False, 'error': str(e)}
+
+    async def delete_tweet(self, tweet_id):
+        """Delete a tweet by ID"""
+        try:
+            await self._run_blocking(self.platforms['twitter'].delete_tweet, id=tweet_id)
+            return {'success': True}
+        except Exception as e:
+            return {'success': False, 'error': str(e)}
+
+    async def format_content_for_platform(self, platform, title, content, url):
+        """Helper method to format content based on platform limits"""
+        if platform in ('twitter', 'mastodon'):
+            # Shorten the content so the title and link still fit
+            post = {'title': title, 'content': content, 'url': url}
+            return self.renderer.render(post, [platform])[platform]['text']
+
+        elif platform == 'linkedin':
+            # LinkedIn has 3000 character limit for posts
+            return f"{title}\n\n{content}\n\n{url}"
+
+        elif platform == 'facebook':
+            # Facebook has high limit
+            return f"{title}\n\n{content}\n\n{url}"
+
+        elif platform in ['devto', 'medium', 'reddit']:
+            # These platforms get expanded content
+            return await self.expand_content_for_platform({'content': content}, platform)
+
+        else:
+            return f"{title}\n\n{content}\n\n{url}"
+
+
+# Shared event loop for the synchronous SocialMediaPoster wrapper. It lives
+# for the whole process so HTTP connections are reused between calls.
+_loop = None
+_loop_lock = threading.Lock()
+
+
+def _background_loop():
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever,
+                             name='poster-loop', daemon=True).start()
+    return _loop
+
+
+def run_sync(coro):
+    """Run a coroutine on the shared poster loop and wait for its result
+
+    Blocking; from async code await AsyncSocialMediaPoster directly instead.
+    """
+    return asyncio.run_coroutine_threadsafe(coro, _background_loop()).result()
+
+
+_DONE = object()
+
+
+def iterate_sync(async_iterator):
+    """Iterate an async iterator on the shared poster loop from blocking code"""
+    items = queue.Queue()
+
+    async def pump():
+        try:
+            async for item in async_iterator:
+                items.put(item)
+        finally:
+            if hasattr(async_iterator, 'aclose'):
+                await async_iterator.aclose()
+            items.put(_DONE)
+
+    future = asyncio.run_coroutine_threadsafe(pump(), _background_loop())
+    try:
+        while True:
+            item = items.get()
+            if item is _DONE:
+                break
+            yield item
+        # Re-raise anything the iterator failed with
+        future.result()
+    finally:
+        # Stops the batch if the caller breaks out early
+        future.cancel()
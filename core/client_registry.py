@@ -0,0 +1,213 @@
+# client_registry.py
+import asyncio
+import os
+import threading
+import weakref
+from collections.abc import Mapping
+from urllib.parse import urlsplit
+
+from core.accounts import account_config, is_default
+from core.http_pool import HttpSessionPool
+from core.rate_limiter import get_rate_limiter
+
+
+class ClientRegistry:
+    """Process-wide platform clients, built on first use
+
+    Nothing is built at startup: a platform's client (tweepy, praw,
+    Mastodon.py, or its credentials for the REST platforms) is created the
+    first time it is needed and then reused by every poster in the process.
+    Async clients (the HTTP pool, Groq) are bound to an event loop, so they
+    are kept per running loop instead. Each account has its own registry,
+    built from that account's credentials.
+    """
+
+    PLATFORMS = ['twitter', 'linkedin', 'facebook', 'devto',
+                 'medium', 'reddit', 'mastodon']
+
+    def __init__(self, account=None):
+        # The account whose credentials and rate-limit budget clients use
+        self.account = account
+        self.config = account_config(account)
+        self._builders = {
+            'twitter': self._build_twitter,
+            'linkedin': self._build_linkedin,
+            'facebook': self._build_facebook,
+            'devto': self._build_devto,
+            'medium': self._build_medium,
+            'reddit': self._build_reddit,
+            'mastodon': self._build_mastodon
+        }
+        self._clients = {}
+        self._build_locks = {platform: threading.Lock() for platform in self.PLATFORMS}
+        self._loop_resources = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def is_configured(self, platform):
+        """True when the platform has credentials (nothing is built)"""
+        required = {
+            'twitter': [self.config.TWITTER_API_KEY, self.config.TWITTER_ACCESS_TOKEN],
+            'linkedin': [self.config.LINKEDIN_ACCESS_TOKEN],
+            'facebook': [self.config.FACEBOOK_ACCESS_TOKEN],
+            'devto': [self.config.DEVTO_API_KEY],
+            'medium': [self.config.MEDIUM_ACCESS_TOKEN],
+            'reddit': [self.config.REDDIT_CLIENT_ID],
+            'mastodon': [self.config.MASTODON_ACCESS_TOKEN]
+        }
+        return platform in required and all(required[platform])
+
+    def configured_platforms(self):
+        return [p for p in self.PLATFORMS if self.is_configured(p)]
+
+    def is_built(self, platform):
+        return platform in self._clients
+
+    def get(self, platform):
+        """Return the platform's client, building it the first time"""
+        if not self.is_configured(platform):
+            raise KeyError(platform)
+
+        client = self._clients.get(platform)
+        if client is not None:
+            return client
+
+        with self._build_locks[platform]:
+            if platform not in self._clients:
+                try:
+                    self._clients[platform] = self._builders[platform]()
+                except Exception as e:
+                    # Not cached: the next call tries again
+                    print(f"✗ {platform} connection failed: {e}")
+                    raise
+            return self._clients[platform]
+
+    def _build_mastodon(self):
+        from mastodon import Mastodon
+        client = Mastodon(
+            access_token=self.config.MASTODON_ACCESS_TOKEN,
+            api_base_url=self.config.MASTODON_INSTANCE_URL,
+            # Our rate limiter decides when to wait, not the SDK
+            ratelimit_method='throw'
+        )
+        print("✓ Mastodon connected")
+        return client
+
+    def _build_twitter(self):
+        import tweepy
+        client = tweepy.Client(
+            consumer_key=self.config.TWITTER_API_KEY,
+            consumer_secret=self.config.TWITTER_API_SECRET,
+            access_token=self.config.TWITTER_ACCESS_TOKEN,
+            access_token_secret=self.config.TWITTER_ACCESS_SECRET
+        )
+        # tweepy hides response headers, so read rate limits off its session
+        client.session.hooks['response'].append(tweet_limits_hook(get_rate_limiter(self.account)))
+        print("✓ Twitter connected (v2 API)")
+        return client
+
+    def _build_linkedin(self):
+        print("✓ LinkedIn connected")
+        return {
+            'token': self.config.LINKEDIN_ACCESS_TOKEN,
+            'user_id': self.config.LINKEDIN_USER_ID
+        }
+
+    def _build_facebook(self):
+        print("✓ Facebook connected")
+        return {
+            'token': self.config.FACEBOOK_ACCESS_TOKEN,
+            'page_id': self.config.FACEBOOK_PAGE_ID
+        }
+
+    def _build_devto(self):
+        print("✓ Dev.to connected")
+        return {
+            'api_key': self.config.DEVTO_API_KEY
+        }
+
+    def _build_medium(self):
+        print("✓ Medium connected")
+        return {
+            'token': self.config.MEDIUM_ACCESS_TOKEN,
+            'user_id': self.config.MEDIUM_USER_ID
+        }
+
+    def _build_reddit(self):
+        import praw
+        client = praw.Reddit(
+            client_id=self.config.REDDIT_CLIENT_ID,
+            client_secret=self.config.REDDIT_CLIENT_SECRET,
+            username=self.config.REDDIT_USERNAME,
+            password=self.config.REDDIT_PASSWORD,
+            user_agent=self.config.REDDIT_USER_AGENT
+        )
+        print("✓ Reddit connected")
+        return client
+
+    def _loop_resource(self, name, factory):
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            resources = self._loop_resources.setdefault(loop, {})
+            if name not in resources:
+                resources[name] = factory()
+            return resources[name]
+
+    def http_pool(self):
+        """Shared HttpSessionPool for the running event loop"""
+        return self._loop_resource('http_pool', HttpSessionPool)
+
+    def groq(self):
+        """Shared AsyncGroq client for the running event loop"""
+        def build():
+            from groq import AsyncGroq
+            # Remove proxy issues
+            for proxy_var in ['http_proxy', 'https_proxy',
+                'HTTP_PROXY', 'HTTPS_PROXY', 'proxies']:
+                os.environ.pop(proxy_var, None)
+            return AsyncGroq(api_key=os.environ.get("GROQ_API_KEY"))
+        return self._loop_resource('groq', build)
+
+
+def tweet_limits_hook(limiter):
+    """requests response hook feeding the limiter from POST /2/tweets responses
+
+    Other endpoints (get_me, timelines, deletes) have their own limits,
+    which must not be taken for the posting budget.
+    """
+    def observe(response, *args, **kwargs):
+        request = response.request
+        if request.method == 'POST' and urlsplit(request.url).path.rstrip('/') == '/2/tweets':
+            limiter.observe_headers('twitter', response.headers)
+    return observe
+
+
+class LazyPlatforms(Mapping):
+    """Read-only {platform: client} view that builds clients on access"""
+
+    def __init__(self, registry):
+        self._registry = registry
+
+    def __getitem__(self, platform):
+        return self._registry.get(platform)
+
+    def __contains__(self, platform):
+        return self._registry.is_configured(platform)
+
+    def __iter__(self):
+        return iter(self._registry.configured_platforms())
+
+    def __len__(self):
+        return len(self._registry.configured_platforms())
+
+
+_registries = {}
+_registry_lock = threading.Lock()
+
+
+def get_client_registry(account=None):
+    """The process-wide registry of an account (default: the default account)"""
+    key = None if is_default(account) else account
+    with _registry_lock:
+        if key not in _registries:
+            _registries[key] = ClientRegistry(key)
+    return _registries[key]
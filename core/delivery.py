@@ -0,0 +1,152 @@
+# delivery.py
+"""Per-platform delivery state for queued items
+
+Each queued item carries a 'deliveries' dict with one entry per platform:
+
+    {'status': 'sent' | 'failed' | 'given_up', 'attempts': 2,
+     'next_attempt_at': '...', 'id': '...', 'url': '...', 'error': '...'}
+
+Retries only go to platforms that haven't succeeded yet, spaced with
+exponential backoff plus jitter. An item is done once every platform has
+either succeeded or been given up on.
+"""
+import random
+from datetime import datetime, timedelta
+
+from config import Config
+
+FINAL_STATUSES = ('sent', 'given_up')
+
+
+def _state(item, platform):
+    return item.get('deliveries', {}).get(platform, {})
+
+
+def outstanding_platforms(item, platforms):
+    """Platforms that still need a successful post"""
+    return [p for p in platforms if _state(item, p).get('status') not in FINAL_STATUSES]
+
+
+def due_platforms(item, platforms, now=None):
+    """Outstanding platforms whose backoff has expired"""
+    now = now or datetime.now()
+    due = []
+    for platform in outstanding_platforms(item, platforms):
+        next_attempt = _state(item, platform).get('next_attempt_at')
+        if not next_attempt or datetime.fromisoformat(next_attempt) <= now:
+            due.append(platform)
+    return due
+
+
+def is_done(item, platforms):
+    """True once every platform has succeeded or been given up on"""
+    return not outstanding_platforms(item, platforms)
+
+
+def next_attempt_at(item, platforms):
+    """Earliest time an outstanding platform may be retried (None = now)"""
+    times = []
+    for platform in outstanding_platforms(item, platforms):
+        next_attempt = _state(item, platform).get('next_attempt_at')
+        if not next_attempt:
+            return None
+        times.append(datetime.fromisoformat(next_attempt))
+    return min(times) if times else None
+
+
+def retry_delay(attempts, retry_after=None, base=None, maximum=None):
+    """Exponential backoff with full jitter, never shorter than retry_after"""
+    base = base if base is not None else Config.DELIVERY_BACKOFF_BASE
+    maximum = maximum if maximum is not None else Config.DELIVERY_BACKOFF_MAX
+    ceiling = min(maximum, base * 2 ** (attempts - 1))
+    delay = random.uniform(ceiling / 2, ceiling)
+    if retry_after:
+        delay = max(delay, retry_after)
+    return delay
+
+
+def record_results(item, results, now=None):
+    """Store the outcome of one posting attempt in the item"""
+    now = now or datetime.now()
+    deliveries = item.setdefault('deliveries', {})
+
+    for platform, result in results.items():
+        state = deliveries.setdefault(platform, {'attempts': 0})
+        state['updated_at'] = now.isoformat()
+
+        if result.get('deferred'):
+            # Never sent (rate limited): not an attempt, just wait it out
+            state.setdefault('status', 'failed')
+            state['error'] = result.get('error')
+            state['next_attempt_at'] = (now + timedelta(seconds=result.get('retry_after', 0))).isoformat()
+            continue
+
+        state['attempts'] += 1
+        if result.get('success'):
+            state['status'] = 'sent'
+            state.pop('error', None)
+            state.pop('next_attempt_at', None)
+            for key in ('id', 'url'):
+                if result.get(key):
+                    state[key] = result[key]
+        elif state['attempts'] >= Config.DELIVERY_MAX_ATTEMPTS:
+            state['status'] = 'given_up'
+            state['error'] = result.get('error')
+            state.pop('next_attempt_at', None)
+        else:
+            state['status'] = 'failed'
+            state['error'] = result.get('error')
+            delay = retry_delay(state['attempts'], result.get('retry_after'))
+            state['next_attempt_at'] = (now + timedelta(seconds=delay)).isoformat()
+
+    return item
+
+
+def settle(queue, item_id, item, results, platforms):
+    """Ack, release or nack a claimed item after a posting attempt
+
+    A finished item is removed. An attempt where nothing was sent counts as
+    a failure of the item (nack): it backs off, and is dead-lettered after
+    too many. Otherwise it goes back to retry its failed platforms, held
+    back (and not due) until the first of them may be retried.
+    Returns 'done', 'retry' or 'dead'.
+    """
+    if is_done(item, platforms):
+        queue.ack(item_id)
+        return 'done'
+
+    failed = {p: r for p, r in results.items() if not r.get('success') and not r.get('deferred')}
+    if failed and not any(r.get('success') for r in results.values()):
+        retry_at = next_attempt_at(item, platforms)
+        error = '; '.join(f"{p}: {r.get('error')}" for p, r in failed.items())
+        return queue.nack(item_id, item, error=error,
+                          retry_at=retry_at.timestamp() if retry_at else None) or 'retry'
+
+    release(queue, item_id, item, platforms)
+    return 'retry'
+
+
+def release(queue, item_id, item, platforms):
+    """Give a claimed item back until its next platform attempt is due"""
+    retry_at = next_attempt_at(item, platforms)
+    return queue.release(item_id, item, retry_at=retry_at.timestamp() if retry_at else None)
+
+
+def find_due_item(items, platforms, now=None):
+    """Index of the first item with a platform due for posting, or None"""
+    for index, item in enumerate(items):
+        if due_platforms(item, platforms, now):
+            return index
+    return None
+
+
+def describe(item, platforms):
+    """One-line summary, e.g. 'twitter ✅, devto ⏳ (attempt 2)'"""
+    parts = []
+    for platform in platforms:
+        state = _state(item, platform)
+        status = state.get('status')
+        icon = {'sent': '✅', 'given_up': '🚫', 'failed': '⏳'}.get(status, '•')
+        attempts = f" (attempt {state['attempts']})" if status == 'failed' else ""
+        parts.append(f"{platform} {icon}{attempts}")
+    return ", ".join(parts)
@@ -0,0 +1,158 @@
+# delivery_ledger.py
+"""What has been posted where
+
+Every successful post is recorded under (content fingerprint, platform)
+with the remote id and URL. The posting engine checks the ledger before
+each network call, so posting the same content to the same platform again
+(a requeued item, a retried batch, a second worker) is skipped and returns
+the stored result instead of making a duplicate post.
+
+The fingerprint is a hash of the normalized title, content and URL: case
+and whitespace differences don't make a post new.
+
+    python -m core.delivery_ledger stats
+    python -m core.delivery_ledger forget <fingerprint> [platform]
+"""
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+from config import Config
+from core.accounts import is_default
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS deliveries (
+    fingerprint TEXT NOT NULL,
+    platform TEXT NOT NULL,
+    remote_id TEXT,
+    url TEXT,
+    delivered_at REAL NOT NULL,
+    PRIMARY KEY (fingerprint, platform)
+) WITHOUT ROWID;
+"""
+
+
+def normalize(text):
+    """Lowercase with runs of whitespace collapsed"""
+    return ' '.join((text or '').lower().split())
+
+
+def fingerprint(post, account=None):
+    """Identity of a post's content: hash of its normalized title, content and URL
+
+    Other accounts than the default one get their own fingerprints, since
+    each brand posts the same content separately.
+    """
+    parts = (normalize(post.get('title')), normalize(post.get('content')), (post.get('url') or '').strip())
+    if not is_default(account):
+        parts += (account,)
+    return hashlib.sha256('\0'.join(parts).encode('utf-8')).hexdigest()
+
+
+class DeliveryLedger:
+    """SQLite record of deliveries, keyed by (fingerprint, platform)
+
+    Lookups go through the primary key, and hits are kept in memory so a
+    repeated check costs a dict lookup.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or Config.DELIVERY_LEDGER
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, timeout=30, isolation_level=None,
+                                     check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._known = {}
+        self._lock = threading.Lock()
+
+    def get(self, fingerprint, platform):
+        """{'id', 'url', 'delivered_at'} if this content already went to platform, else None"""
+        key = (fingerprint, platform)
+        with self._lock:
+            if key in self._known:
+                return self._known[key]
+            row = self._conn.execute(
+                "SELECT remote_id, url, delivered_at FROM deliveries "
+                "WHERE fingerprint = ? AND platform = ?", key
+            ).fetchone()
+            if row is None:
+                return None
+            self._known[key] = {'id': row[0], 'url': row[1], 'delivered_at': row[2]}
+            return self._known[key]
+
+    def record(self, fingerprint, platform, result):
+        """Remember a successful post (result holds the platform's 'id'/'url')"""
+        entry = {'id': result.get('id'), 'url': result.get('url'), 'delivered_at': time.time()}
+        remote_id = str(entry['id']) if entry['id'] is not None else None
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO deliveries (fingerprint, platform, remote_id, url, delivered_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (fingerprint, platform, remote_id, entry['url'], entry['delivered_at'])
+            )
+            self._known[(fingerprint, platform)] = dict(entry, id=remote_id)
+
+    def forget(self, fingerprint, platform=None):
+        """Drop records so the content can be posted again; returns how many"""
+        with self._lock:
+            if platform is None:
+                cursor = self._conn.execute(
+                    "DELETE FROM deliveries WHERE fingerprint = ?", (fingerprint,))
+            else:
+                cursor = self._conn.execute(
+                    "DELETE FROM deliveries WHERE fingerprint = ? AND platform = ?",
+                    (fingerprint, platform))
+            self._known = {key: value for key, value in self._known.items()
+                           if key[0] != fingerprint or (platform and key[1] != platform)}
+            return cursor.rowcount
+
+    def stats(self):
+        """Number of deliveries recorded per platform"""
+        with self._lock:
+            return dict(self._conn.execute(
+                "SELECT platform, COUNT(*) FROM deliveries GROUP BY platform ORDER BY platform"
+            ).fetchall())
+
+    def close(self):
+        self._conn.close()
+
+
+_ledger = None
+_ledger_lock = threading.Lock()
+
+
+def get_delivery_ledger():
+    """The process-wide ledger (None when DELIVERY_LEDGER is empty)"""
+    global _ledger
+    with _ledger_lock:
+        if _ledger is None and Config.DELIVERY_LEDGER:
+            _ledger = DeliveryLedger()
+    return _ledger
+
+
+# Main execution
+if __name__ == "__main__":
+    import sys
+
+    command = sys.argv[1] if len(sys.argv) > 1 else "stats"
+    ledger = DeliveryLedger()
+
+    if command == "stats":
+        counts = ledger.stats()
+        print(f"📒 {sum(counts.values())} deliveries recorded")
+        for platform, count in counts.items():
+            print(f"   {platform}: {count}")
+
+    elif command == "forget" and len(sys.argv) >= 3:
+        platform = sys.argv[3] if len(sys.argv) > 3 else None
+        count = ledger.forget(sys.argv[2], platform)
+        print(f"🗑️ Forgot {count} deliveries")
+
+    else:
+        print("Usage: python -m core.delivery_ledger [stats | forget <fingerprint> [platform]]")
@@ -0,0 +1,115 @@
+# expansion_cache.py
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+from config import Config
+from core import serialization
+
+
+class ExpansionCache:
+    """Cache of expanded content keyed by (content hash, model, prompt version)
+
+    Entries live in an in-memory LRU. With a directory set they are also
+    written there, one file per key, so other processes (and later runs of
+    a failed post) reuse them. Files are written to a temp file and renamed
+    into place, so readers never see a partial entry.
+    """
+
+    def __init__(self, max_entries=None, directory=None):
+        self.max_entries = max_entries if max_entries is not None else Config.EXPANSION_CACHE_SIZE
+        self.directory = directory if directory is not None else Config.EXPANSION_CACHE_DIR
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(content, model, prompt_version):
+        content_hash = hashlib.sha256(content.encode('utf-8')).hexdigest()
+        return (content_hash, model, str(prompt_version))
+
+    def _path(self, key):
+        name = hashlib.sha256('\0'.join(key).encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, f"{name}.json")
+
+    def get(self, key):
+        """Return the cached expansion for key, or None"""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+
+        value = self._read_disk(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._remember(key, value)
+        return value
+
+    def put(self, key, value):
+        """Store an expansion in memory and, if enabled, on disk"""
+        with self._lock:
+            self._remember(key, value)
+        self._write_disk(key, value)
+
+    def _remember(self, key, value):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _read_disk(self, key):
+        if not self.directory:
+            return None
+        try:
+            entry = serialization.load(self._path(key))
+        except (OSError, ValueError):
+            return None
+        # Guard against a (vanishingly unlikely) file name collision
+        if not isinstance(entry, dict) or tuple(entry.get('key', [])) != key:
+            return None
+        return entry.get('value')
+
+    def _write_disk(self, key, value):
+        if not self.directory:
+            return
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(serialization.encode({'key': list(key), 'value': value}))
+                os.replace(tmp_path, self._path(key))
+            except BaseException:
+                # Don't leave a half-written temp file behind
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+                raise
+        except OSError as e:
+            print(f"⚠️  Could not write expansion cache: {e}")
+
+    def clear(self):
+        """Drop the in-memory entries (the disk tier is left alone)"""
+        with self._lock:
+            self._entries.clear()
+
+
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_expansion_cache():
+    """Process-wide cache shared by every poster"""
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = ExpansionCache()
+    return _shared_cache
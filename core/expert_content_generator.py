@@ -1,24 +1,67 @@
 # expert_content_generator.py
+import sys
 import os
-import json
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import random
 import hashlib
+import threading
+from collections import Counter
 from datetime import datetime, timedelta
-from groq import Groq
+from config import Config
+from core.accounts import account_path
+from core.post_queue import format_age, get_queue
+from core.near_duplicate import NearDuplicateIndex
+from core import serialization
+from core.history_log import HistoryLog, iter_history
+
+# Snapshot of the post history, and the journal new posts are appended to
+# in between; the journal is folded into the snapshot every COMPACT_EVERY
+# posts and at the end of each generation run. Processes sharing them take
+# turns through a lock file beside the journal. Other accounts than the
+# default one keep their own (post_history_expert.acme.json)
+HISTORY_FILE = 'post_history_expert.json'
+HISTORY_JOURNAL = 'post_history_expert.journal'
+COMPACT_EVERY = 100
+# Posts kept in the history file
+HISTORY_LIMIT = 1000
+# Posts starting with the same normalized characters count as duplicates
+PREFIX_LENGTH = 50
+# Reply tokens allowed per post when several are asked for in one request
+BATCH_TOKENS_PER_POST = 120
+
+def content_hash(content):
+    return hashlib.md5(content.lower().encode()).hexdigest()
+
+def content_prefix(content):
+    """Start of the content, lowercased with whitespace collapsed"""
+    return ' '.join(content.lower().split())[:PREFIX_LENGTH]
+
+def clean_content(content):
+    """Generated text as a post: quotes stripped, at most 250 characters"""
+    content = content.strip().strip('"\'')
+    if len(content) > 250:
+        content = content[:247] + "..."
+    return content
 
 class ExpertContentGenerator:
-    def __init__(self):
-        # Remove proxy issues
-        for proxy_var in ['http_proxy', 'https_proxy', 'HTTP_PROXY', 'HTTPS_PROXY', 'proxies']:
-            os.environ.pop(proxy_var, None)
-        
-        api_key = os.environ.get("GROQ_API_KEY")
-        if not api_key:
-            raise ValueError("GROQ_API_KEY not found in environment")
-        
-        self.client = Groq(api_key=api_key)
+    def __init__(self, account=None):
+        # Posts are generated for this account's queue and checked against its history
+        self.account = account
+        self.history_file = account_path(HISTORY_FILE, account)
+        self.history_journal = account_path(HISTORY_JOURNAL, account)
+        
+        # Groq client is created on first use, so status/clear stay fast
+        self._client = None
+        self._client_lock = threading.Lock()
+        self._limiter = None
         self.model = "llama-3.1-8b-instant"  # Updated to working model
         
+        # Posts are generated from several threads; history updates take turns
+        self._history_lock = threading.Lock()
+        # Groq requests and tokens used by this generator
+        self.usage = Counter()
+        self._usage_lock = threading.Lock()
+        
         # Load post history to avoid duplicates
         self.post_history = self.load_post_history()
         
@@ -56,52 +99,187 @@ class ExpertContentGenerator:
         
         self.base_url = "https://carlosruizviquezinformationtechnology.blogspot.com/"
     
+    @property
+    def client(self):
+        """Groq client, created (and groq imported) on first use"""
+        with self._client_lock:
+            if self._client is None:
+                from groq import Groq
+                
+                # Remove proxy issues
+                for proxy_var in ['http_proxy', 'https_proxy', 'HTTP_PROXY', 'HTTPS_PROXY', 'proxies']:
+                    os.environ.pop(proxy_var, None)
+                
+                api_key = os.environ.get("GROQ_API_KEY")
+                if not api_key:
+                    raise ValueError("GROQ_API_KEY not found in environment")
+                
+                self._client = Groq(api_key=api_key)
+        return self._client
+    
+    @property
+    def limiter(self):
+        """Groq requests/tokens per minute budget (GROQ_RPM, GROQ_TPM)"""
+        if self._limiter is None:
+            from core.rate_limiter import get_groq_limiter
+            self._limiter = get_groq_limiter()
+        return self._limiter
+    
+    def complete(self, messages, temperature, max_tokens, **options):
+        """Chat completion, sent once the Groq budget allows it"""
+        # Roughly 4 characters per token, plus the longest possible reply
+        estimate = sum(len(message["content"]) for message in messages) // 4 + max_tokens
+        reserved = self.limiter.acquire(estimate)
+        response = self.client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            **options
+        )
+        usage = getattr(response, "usage", None)
+        self.limiter.settle(reserved, usage.total_tokens if usage else None)
+        with self._usage_lock:
+            self.usage["requests"] += 1
+            if usage:
+                self.usage["prompt_tokens"] += usage.prompt_tokens
+                self.usage["completion_tokens"] += usage.completion_tokens
+        return response
+    
+    def _journal_locked(self):
+        """Hold the journal's lock, shared with other processes (flock on a file beside it)"""
+        return self._journal.locked()
+    
     def load_post_history(self):
-        """Load history of generated posts to avoid duplicates"""
+        """Load history of generated posts, and index it for duplicate checks
+        
+        The snapshot holds the history up to its 'seq'; journal records past
+        that (posts generated since, possibly before a crash) are replayed.
+        """
+        # Every record is synced as it is written; no size rotation
+        self._journal = HistoryLog(self.history_journal, max_bytes=0, fsync_every=1)
+        with self._journal_locked():
+            history, _, _ = self._read_history()
+        self._index_history(history)
+        return history
+    
+    def _read_history(self):
+        """(history, seq, journal records) from disk: the snapshot plus the
+        journal records past its seq. Call with the journal lock held."""
         try:
-            with open('post_history_expert.json', 'r') as f:
-                return json.load(f)
-        except:
-            return {"hashes": [], "posts": []}
+            history = serialization.load(self.history_file)
+        except ValueError:
+            history = None
+        history = history or {"hashes": [], "posts": []}
+        seq = history.pop("seq", 0)
+        journaled = 0
+        for record in iter_history(self.history_journal):
+            journaled += 1
+            if record.get("seq", 0) > seq:
+                history["hashes"].append(record["post"]["hash"])
+                history["posts"].append(record["post"])
+                seq = record["seq"]
+        history["hashes"] = history["hashes"][-HISTORY_LIMIT:]
+        history["posts"] = history["posts"][-HISTORY_LIMIT:]
+        return history, seq, journaled
+    
+    def _last_seq(self):
+        """(highest seq on disk, journal records). Call with the journal lock held."""
+        seq = journaled = 0
+        for record in iter_history(self.history_journal):
+            journaled += 1
+            seq = max(seq, record.get("seq", 0))
+        if not journaled:
+            # Just compacted (maybe by another process): the snapshot has it
+            try:
+                seq = (serialization.load(self.history_file) or {}).get("seq", 0)
+            except ValueError:
+                seq = 0
+        return seq, journaled
+    
+    def _index_history(self, history):
+        # Counts rather than sets, so posts trimmed from the history can be removed
+        self._hashes = Counter(history["hashes"])
+        self._prefixes = Counter(content_prefix(post.get("content", "")) for post in history["posts"])
+        # Reworded posts: MinHash index, built on the first duplicate check
+        self._similar = None
+    
+    @property
+    def similar_posts(self):
+        """Near-duplicate index over the history, keyed by post hash"""
+        if self._similar is None:
+            self._similar = NearDuplicateIndex()
+            for post in self.post_history["posts"]:
+                content = post.get("content", "")
+                self._similar.add(post.get("hash") or content_hash(content), content)
+        return self._similar
+    
+    def remember_post(self, post_data):
+        """Add a generated post to the history, its index and the journal"""
+        with self._journal_locked():
+            # Numbered after every record on disk, whichever process wrote it
+            seq, journaled = self._last_seq()
+            self._journal.append({"seq": seq + 1, "post": post_data})
+        
+        self.post_history["hashes"].append(post_data["hash"])
+        self.post_history["posts"].append(post_data)
+        self._hashes[post_data["hash"]] += 1
+        self._prefixes[content_prefix(post_data["content"])] += 1
+        if self._similar is not None:
+            self._similar.add(post_data["hash"], post_data["content"])
+        self._trim_history()
+        
+        if journaled + 1 >= COMPACT_EVERY:
+            self.save_post_history()
+    
+    def _trim_history(self):
+        """Keep only the last HISTORY_LIMIT posts to prevent file from growing too large"""
+        for old_hash in self.post_history["hashes"][:-HISTORY_LIMIT]:
+            self._hashes[old_hash] -= 1
+        for old_post in self.post_history["posts"][:-HISTORY_LIMIT]:
+            content = old_post.get("content", "")
+            self._prefixes[content_prefix(content)] -= 1
+            old_hash = old_post.get("hash") or content_hash(content)
+            if self._similar is not None and self._hashes[old_hash] <= 0:
+                self._similar.remove(old_hash)
+        del self.post_history["hashes"][:-HISTORY_LIMIT]
+        del self.post_history["posts"][:-HISTORY_LIMIT]
     
     def save_post_history(self):
-        """Save post history"""
-        # Keep only last 1000 posts to prevent file from growing too large
-        if len(self.post_history["hashes"]) > 1000:
-            self.post_history["hashes"] = self.post_history["hashes"][-1000:]
-            self.post_history["posts"] = self.post_history["posts"][-1000:]
-        
-        with open('post_history_expert.json', 'w') as f:
-            json.dump(self.post_history, f, indent=2)
+        """Compact: fold the journal into a new snapshot, then empty the journal
+        
+        The snapshot is rebuilt from disk under the journal lock, so posts
+        other processes journaled are kept (and picked up here), and none
+        can be appended between the snapshot and emptying the journal. It is
+        replaced atomically and records its 'seq', so a crash before the
+        journal is emptied only leaves records the next load skips.
+        """
+        with self._journal_locked():
+            history, seq, journaled = self._read_history()
+            if not journaled:
+                return
+            serialization.save(self.history_file, dict(history, seq=seq))
+            self._journal.close()
+            if os.path.exists(self.history_journal):
+                os.remove(self.history_journal)
+        self.post_history = history
+        self._index_history(history)
     
     def is_duplicate(self, content):
-        """Check if content is too similar to previous posts"""
-        # Create hash of content
-        content_hash = hashlib.md5(content.lower().encode()).hexdigest()
-        
-        # Check exact match
-        if content_hash in self.post_history["hashes"]:
+        """Check if content matches, starts like, or rewords any post in the history"""
+        # Exact match, then same start (index lookups, whole history)
+        if self._hashes[content_hash(content)] > 0 or self._prefixes[content_prefix(content)] > 0:
             return True
         
-        # Check similarity (first 50 chars)
-        content_start = content[:50].lower()
-        for post in self.post_history["posts"][-100:]:  # Check last 100 posts
-            if post.get("content", "")[:50].lower() == content_start:
-                return True
-        
+        # Then mostly the same wording (NEAR_DUPLICATE_THRESHOLD)
+        match = self.similar_posts.find(content)
+        if match:
+            print(f"🔍 {match[1]:.0%} similar to an earlier post")
+            return True
         return False
     
-    def generate_expert_post(self, content_type=None, topic=None, retry_count=0):
-        """Generate a single expert post with duplicate checking"""
-        if retry_count > 3:
-            print("⚠️ Max retries reached, returning None")
-            return None
-        
-        if not content_type:
-            content_type = random.choice(self.content_types)
-        if not topic:
-            topic = random.choice(self.topics)
-        
+    def post_prompt(self, content_type, topic):
+        """Instruction for one post of content_type about topic"""
         # Complete prompts dictionary - MUST match content_types list
         prompts = {
             "breakthrough": f"Share a recent breakthrough in {topic} in 200 characters. Make it exciting and accessible. Include 🚀",
@@ -138,60 +316,157 @@ class ExpertContentGenerator:
             
             "success_metric": f"Share a key metric for measuring {topic} success in 200 chars. Be specific with numbers. Use 📈"
         }
+        return prompts[content_type]
+    
+    def system_prompt(self):
+        return f"You are Dr. Carlos Ruiz Viquez, a PhD in AI/ML expert. Create engaging, authoritative content that showcases deep expertise while being accessible. Never use hashtags. Be concise and impactful. Current date: {datetime.now().strftime('%B %Y')}. Make each post unique and fresh."
+    
+    def accept_post(self, content, content_type, topic):
+        """Add content to the history as a new post; None if it duplicates one
+        
+        The check and the update happen in one step, so posts generated at
+        the same time are checked against each other.
+        """
+        with self._history_lock:
+            if self.is_duplicate(content):
+                return None
+            post_data = {
+                "content": content,
+                "type": content_type,
+                "topic": topic,
+                "hash": content_hash(content),
+                "platform_suitable": ["twitter", "linkedin"],
+                "generated_at": datetime.now().isoformat()
+            }
+            self.remember_post(post_data)
+            return post_data
+    
+    def generate_expert_post(self, content_type=None, topic=None, retry_count=0):
+        """Generate a single expert post with duplicate checking"""
+        if retry_count > 3:
+            print("⚠️ Max retries reached, returning None")
+            return None
+        
+        if not content_type:
+            content_type = random.choice(self.content_types)
+        if not topic:
+            topic = random.choice(self.topics)
         
         try:
             # Add randomness to avoid repetition
             creativity = 0.8 + (random.random() * 0.2)  # 0.8 to 1.0
             
-            response = self.client.chat.completions.create(
-                model=self.model,
+            response = self.complete(
                 messages=[
                     {
                         "role": "system",
-                        "content": f"You are Dr. Carlos Ruiz Viquez, a PhD in AI/ML expert. Create engaging, authoritative content that showcases deep expertise while being accessible. Never use hashtags. Be concise and impactful. Current date: {datetime.now().strftime('%B %Y')}. Make each post unique and fresh."
+                        "content": self.system_prompt()
                     },
                     {
                         "role": "user",
-                        "content": prompts[content_type] + f" Make it unique and different from typical {topic} posts."
+                        "content": self.post_prompt(content_type, topic) + f" Make it unique and different from typical {topic} posts."
                     }
                 ],
                 temperature=creativity,
                 max_tokens=150
             )
             
-            content = response.choices[0].message.content.strip()
-            content = content.strip('"\'') 
-            # Ensure it's under 250 characters
-            if len(content) > 250:
-                content = content[:247] + "..."
+            content = clean_content(response.choices[0].message.content)
             
-            # Check for duplicates
-            if self.is_duplicate(content):
+            # Check for duplicates, then add to history
+            post_data = self.accept_post(content, content_type, topic)
+            if post_data is None:
                 print(f"🔄 Duplicate detected, regenerating...")
                 return self.generate_expert_post(content_type, None, retry_count + 1)  # Try different topic
             
-            # Add to history
-            content_hash = hashlib.md5(content.lower().encode()).hexdigest()
-            self.post_history["hashes"].append(content_hash)
-            
-            post_data = {
-                "content": content,
-                "type": content_type,
-                "topic": topic,
-                "hash": content_hash,
-                "platform_suitable": ["twitter", "linkedin"],
-                "generated_at": datetime.now().isoformat()
-            }
-            
-            self.post_history["posts"].append(post_data)
-            self.save_post_history()
-            
             return post_data
             
         except Exception as e:
             print(f"❌ Error generating content: {e}")
             return None
     
+    def batch_prompt(self, assignments):
+        """One request for several posts, answered as JSON"""
+        lines = [f"{number}. {self.post_prompt(content_type, topic)}"
+                 for number, (content_type, topic) in enumerate(assignments, 1)]
+        return (f"Write {len(assignments)} separate posts, one for each instruction below. "
+                "Each must be unique, different from typical posts on its topic, and under 250 characters.\n\n"
+                + "\n".join(lines) +
+                '\n\nReply with JSON only, one entry per instruction, in order: '
+                '{"posts": [{"id": 1, "content": "..."}, {"id": 2, "content": "..."}]}')
+    
+    def parse_batch(self, reply, count):
+        """{number: content} of the well-formed posts in a batch reply"""
+        try:
+            data = serialization.loads(reply)
+        except ValueError:
+            return {}
+        items = data.get("posts") if isinstance(data, dict) else data
+        if not isinstance(items, list):
+            return {}
+        
+        contents = {}
+        for position, item in enumerate(items, 1):
+            if not isinstance(item, dict):
+                continue
+            number = item.get("id", position)
+            content = item.get("content")
+            if isinstance(number, int) and 1 <= number <= count and isinstance(content, str) and content.strip():
+                contents.setdefault(number, clean_content(content))
+        return contents
+    
+    def generate_batch(self, assignments, retries=3):
+        """Generate posts for several (type, topic) pairs in one completion
+        
+        The reply is JSON with one post per pair. Posts that are missing,
+        malformed or duplicates are asked for again (duplicates with another
+        topic), up to retries times; only those go into the next request.
+        Returns posts in the order of assignments, None where none was made.
+        """
+        assignments = list(assignments)
+        posts = [None] * len(assignments)
+        pending = list(range(len(assignments)))
+        
+        for attempt in range(retries + 1):
+            if not pending:
+                break
+            if attempt:
+                print(f"🔄 Regenerating {len(pending)} of {len(assignments)} posts...")
+            
+            batch = [assignments[index] for index in pending]
+            try:
+                response = self.complete(
+                    messages=[
+                        {"role": "system", "content": self.system_prompt()},
+                        {"role": "user", "content": self.batch_prompt(batch)}
+                    ],
+                    temperature=0.8 + (random.random() * 0.2),
+                    max_tokens=BATCH_TOKENS_PER_POST * len(batch) + 50,
+                    response_format={"type": "json_object"}
+                )
+                contents = self.parse_batch(response.choices[0].message.content, len(batch))
+            except Exception as e:
+                print(f"❌ Error generating content: {e}")
+                break
+            
+            failed = []
+            for number, index in enumerate(pending, 1):
+                content_type, topic = assignments[index]
+                content = contents.get(number)
+                post = self.accept_post(content, content_type, topic) if content else None
+                if post:
+                    posts[index] = post
+                    continue
+                failed.append(index)
+                if content:
+                    # Duplicate: try a different topic
+                    assignments[index] = (content_type, random.choice(self.topics))
+            pending = failed
+        
+        if pending:
+            print(f"⚠️ {len(pending)} of {len(assignments)} posts not generated")
+        return posts
+    
     def generate_thread(self, topic=None, posts=3):
         """Generate a connected thread of posts"""
         if not topic:
@@ -209,8 +484,7 @@ class ExpertContentGenerator:
             3/{posts}: [third post]
             Make each part valuable on its own but better together."""
             
-            response = self.client.chat.completions.create(
-                model=self.model,
+            response = self.complete(
                 messages=[
                     {"role": "system", "content": "You are Dr. Carlos Ruiz Viquez a PhD in AI/ML expert creating educational threads. Be specific and unique."},
                     {"role": "user", "content": prompt}
@@ -243,16 +517,14 @@ class ExpertContentGenerator:
             print(f"❌ Thread generation error: {e}")
             return []
     
-    def generate_daily_content(self, posts_per_day=6):
-        """Generate a day's worth of varied content"""
-        daily_posts = []
+    def plan_assignments(self, count):
+        """(content type, topic) for count posts, planned up front for variety:
+        no type repeats within 3 posts, no topic within 2"""
+        plan = []
         used_types = []
         used_topics = []
         
-        print(f"🤖 Generating {posts_per_day} expert posts...\n")
-        
-        # Ensure variety
-        for i in range(posts_per_day):
+        for i in range(count):
             # Pick content type (avoid recent repeats)
             available_types = [t for t in self.content_types if t not in used_types[-3:]]
             if not available_types:
@@ -270,26 +542,55 @@ class ExpertContentGenerator:
             
             topic = random.choice(available_topics)
             used_topics.append(topic)
-            
-            # Generate post
-            post = self.generate_expert_post(content_type=content_type, topic=topic)
-            
-            if post:
-                daily_posts.append(post)
-                print(f"✅ {content_type.upper()}: {post['content'][:60]}...")
-            
-            # Small delay to respect rate limits
-            import time
-            time.sleep(0.5)
-        
-        # Add one thread
-        print("\n🧵 Generating educational thread...")
-        thread = self.generate_thread()
-        if thread:
-            daily_posts.extend(thread)
-            print(f"✅ Thread created with {len(thread)} parts")
+            plan.append((content_type, topic))
         
-        return daily_posts
+        return plan
+    
+    def generate_days(self, days=1, posts_per_day=6, workers=None, batch_size=None):
+        """Generate days of varied content (posts plus one thread a day)
+        
+        Types and topics are planned first, then up to workers requests
+        (GROQ_WORKERS) run at once within the Groq budget, each for one post
+        or, with batch_size above 1 (GROQ_BATCH_SIZE), for that many posts.
+        Posts come back in plan order, each day's thread after its posts.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+        
+        workers = workers or Config.GROQ_WORKERS
+        batch_size = batch_size or Config.GROQ_BATCH_SIZE
+        plan = self.plan_assignments(days * posts_per_day)
+        print(f"🤖 Generating {len(plan)} expert posts and {days} thread(s), {workers} at a time...\n")
+        
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            if batch_size > 1:
+                batches = [pool.submit(self.generate_batch, plan[start:start + batch_size])
+                           for start in range(0, len(plan), batch_size)]
+            else:
+                batches = [pool.submit(lambda pair: [self.generate_expert_post(*pair)], pair) for pair in plan]
+            thread_futures = [pool.submit(self.generate_thread) for _ in range(days)]
+            posts = [post for batch in batches for post in batch.result()]
+            
+            all_posts = []
+            for day in range(days):
+                if days > 1:
+                    print(f"\n📅 Day {day+1}")
+                day_slice = slice(day * posts_per_day, (day + 1) * posts_per_day)
+                for (content_type, _), post in zip(plan[day_slice], posts[day_slice]):
+                    if post:
+                        all_posts.append(post)
+                        print(f"✅ {content_type.upper()}: {post['content'][:60]}...")
+                
+                thread = thread_futures[day].result()
+                if thread:
+                    all_posts.extend(thread)
+                    print(f"🧵 Thread created with {len(thread)} parts")
+        
+        self.save_post_history()
+        return all_posts
+    
+    def generate_daily_content(self, posts_per_day=6, workers=None):
+        """Generate a day's worth of varied content"""
+        return self.generate_days(1, posts_per_day, workers)
     
     def prepare_posts(self, posts):
         """Prepare posts without time scheduling (simplified version)"""
@@ -303,20 +604,36 @@ class ExpertContentGenerator:
         
         return posts
     
+    def schedule_posts(self, posts, times=None, start=None):
+        """Give each post the next free daily time slot after start
+
+        Sets 'time_slot' and an absolute 'due_at', so post_expert_content
+        sends each one when it's due.
+        """
+        times = sorted(times or Config.EXPERT_POST_TIMES)
+        start = start or datetime.now()
+        day = start.replace(hour=0, minute=0, second=0, microsecond=0)
+        slots = []
+        while len(slots) < len(posts):
+            for time_slot in times:
+                hour, minute = (int(part) for part in time_slot.split(':'))
+                due = day.replace(hour=hour, minute=minute)
+                if due > start and len(slots) < len(posts):
+                    slots.append((time_slot, due))
+            day += timedelta(days=1)
+        
+        for post, (time_slot, due) in zip(posts, slots):
+            post['time_slot'] = time_slot
+            post['due_at'] = due.isoformat()
+        
+        return posts
+    
     def save_to_expert_queue(self, posts):
         """Save to a separate expert content queue"""
-        try:
-            with open('expert_queue.json', 'r') as f:
-                queue = json.load(f)
-        except:
-            queue = []
-        
-        queue.extend(posts)
-        
-        with open('expert_queue.json', 'w') as f:
-            json.dump(queue, f, indent=2)
+        queue = get_queue('expert', self.account)
+        queue.put_many(posts)
         
-        print(f"\n✅ Saved {len(posts)} posts to expert_queue.json")
+        print(f"\n✅ Saved {len(posts)} posts to the expert queue")
         print(f"📋 Total in queue: {len(queue)}")
     
     def preview_generation(self, count=3):
@@ -333,27 +650,24 @@ class ExpertContentGenerator:
                 print(f"📌 Topic: {post['topic']}")
                 print(f"📝 Content: {post['content']}")
                 print("-" * 60)
+        
+        self.save_post_history()
     
     def get_queue_status(self):
         """Get current queue status"""
-        try:
-            with open('expert_queue.json', 'r') as f:
-                queue = json.load(f)
-            return len(queue)
-        except:
-            return 0
+        return len(get_queue('expert', self.account))
     
     def clear_queue(self):
         """Clear the expert queue"""
-        with open('expert_queue.json', 'w') as f:
-            json.dump([], f)
+        get_queue('expert', self.account).clear()
         print("🗑️ Expert queue cleared")
 
 # Main execution
 if __name__ == "__main__":
     import sys
     
-    generator = ExpertContentGenerator()
+    # Optional account after the command: schedule acme
+    generator = ExpertContentGenerator(sys.argv[2] if len(sys.argv) > 2 else None)
     
     if len(sys.argv) > 1:
         command = sys.argv[1].lower()
@@ -369,26 +683,36 @@ if __name__ == "__main__":
             generator.preview_generation(count=4)
         
         elif command == "week":
-            # Generate a week of content
-            all_posts = []
-            for day in range(7):
-                print(f"\n📅 Generating content for Day {day+1}...")
-                daily = generator.generate_daily_content(posts_per_day=5)
-                all_posts.extend(daily)
+            # Generate a week of content (planned as one run, generated concurrently)
+            all_posts = generator.generate_days(days=7, posts_per_day=5)
             
             generator.save_to_expert_queue(all_posts)
             print(f"\n🎉 Generated {len(all_posts)} posts for the week!")
         
-        elif command == "status":
-            # Check queue status
-            count = generator.get_queue_status()
-            print(f"📋 Expert queue has {count} posts")
+        elif command == "schedule":
+            # Generate daily content, spread over the posting times
+            daily_posts = generator.generate_daily_content(posts_per_day=6)
+            scheduled = generator.schedule_posts(generator.prepare_posts(daily_posts))
+            generator.save_to_expert_queue(scheduled)
             
-            if count > 0:
-                with open('expert_queue.json', 'r') as f:
-                    queue = json.load(f)
+            if scheduled:
+                print(f"📅 Scheduled {scheduled[0]['due_at'][:16]} → {scheduled[-1]['due_at'][:16]}")
+        
+        elif command == "status":
+            # Check queue status (kept up to date by the queue itself)
+            queue = get_queue('expert', generator.account, migrate=False)
+            status = queue.stats(preview=3)
+            print(f"📋 Expert queue has {status['count']} posts")
+            
+            if status['count'] > 0:
+                print(f"⏳ Oldest waiting: {format_age(status['oldest_age'])}")
+                next_due = queue.next_due_in()
+                if next_due is not None:
+                    print(f"⏰ Next due: {'now' if next_due == 0 else 'in ' + format_age(next_due)}")
+                print("📊 By type: " + ", ".join(f"{t} {n}" for t, n in sorted(status['types'].items())))
+                print("🏷️  By topic: " + ", ".join(f"{t} {n}" for t, n in sorted(status['topics'].items())))
                 print("\nNext 3 posts:")
-                for i, post in enumerate(queue[:3]):
+                for i, post in enumerate(status['head']):
                     print(f"{i+1}. {post['content'][:80]}...")
         
         elif command == "clear":
@@ -403,8 +727,10 @@ if __name__ == "__main__":
             print("  preview - Preview generated content")
             print("  thread  - Generate a single thread")
             print("  week    - Generate a week of content")
+            print("  schedule - Generate daily content at the posting times")
             print("  status  - Check queue status")
             print("  clear   - Clear the queue")
+            print("\nAdd an account name after the command to use its queue and history")
             print("\nNo command = Generate daily content")
     
     else:
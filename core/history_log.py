@@ -0,0 +1,330 @@
+# history_log.py
+"""Append-only post history
+
+One JSON record per line (JSONL). Appending never reads the file, so
+logging a post costs the same however long the history gets.
+
+- Each record is a single O_APPEND write, so lines from several processes
+  never interleave. Rotation and the append that triggers it happen under
+  an flock on a file beside the log (post_history.jsonl.lock), so two
+  processes never rotate at once.
+- fsync is batched: after HISTORY_FSYNC_EVERY records or
+  HISTORY_FSYNC_INTERVAL seconds, and on close.
+- When the file reaches HISTORY_MAX_BYTES it is rotated like a log file
+  (post_history.jsonl.1, .2, ...), keeping HISTORY_BACKUPS old segments.
+- iter_history() streams records oldest first without loading them all.
+- A torn last line (crash mid-write) is skipped by the reader and dropped
+  by compaction.
+
+    python -m core.history_log stats
+    python -m core.history_log tail 20
+    python -m core.history_log compact [keep_days]
+"""
+import atexit
+import fcntl
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+from config import Config
+from core import serialization
+from core.accounts import account_path, is_default
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The JSON array history this log replaces
+LEGACY_FILE = 'post_history.json'
+
+
+def segment_paths(path):
+    """The log's files, oldest first"""
+    paths = []
+    index = 1
+    while os.path.exists(f"{path}.{index}"):
+        paths.append(f"{path}.{index}")
+        index += 1
+    paths.reverse()
+    if os.path.exists(path):
+        paths.append(path)
+    return paths
+
+
+@contextmanager
+def file_lock(path):
+    """Hold the lock other processes share on the log at path (flock on path.lock)"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    fd = os.open(path + ".lock", os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        os.close(fd)
+
+
+def iter_history(path=None, since=None):
+    """Stream history records, oldest first
+
+    since: only records with a timestamp at or after this datetime.
+    """
+    path = path or Config.HISTORY_FILE
+    since = since.isoformat() if since else None
+    for segment in segment_paths(path):
+        with open(segment, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = serialization.loads(line)
+                except ValueError:
+                    # Torn write from a crash; compaction removes it
+                    continue
+                if since and record.get('timestamp', '') < since:
+                    continue
+                yield record
+
+
+class HistoryLog:
+    """Appends records to a rotating JSONL file"""
+
+    def __init__(self, path=None, max_bytes=None, backups=None,
+                 fsync_every=None, fsync_interval=None):
+        self.path = path or Config.HISTORY_FILE
+        self.max_bytes = max_bytes if max_bytes is not None else Config.HISTORY_MAX_BYTES
+        self.backups = backups if backups is not None else Config.HISTORY_BACKUPS
+        self.fsync_every = fsync_every if fsync_every is not None else Config.HISTORY_FSYNC_EVERY
+        self.fsync_interval = fsync_interval if fsync_interval is not None else Config.HISTORY_FSYNC_INTERVAL
+        self._fd = None
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        # Reentrant, so a caller holding locked() can still append
+        self._lock = threading.RLock()
+        self._held = 0
+
+    def _open(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._fd = os.open(self.path, os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o644)
+        # End a line torn by a crash so the next record starts cleanly
+        size = os.fstat(self._fd).st_size
+        if size and os.pread(self._fd, 1, size - 1) != b'\n':
+            os.write(self._fd, b'\n')
+
+    def _current_fd(self):
+        """Open file descriptor, reopened if another process rotated the file"""
+        if self._fd is not None:
+            try:
+                if os.stat(self.path).st_ino == os.fstat(self._fd).st_ino:
+                    return self._fd
+            except FileNotFoundError:
+                pass
+            self._close_fd()
+        self._open()
+        return self._fd
+
+    @contextmanager
+    def locked(self):
+        """Hold the log's lock, shared with other processes, across several calls"""
+        with self._lock:
+            if self._held:
+                self._held += 1
+                try:
+                    yield
+                finally:
+                    self._held -= 1
+                return
+            with file_lock(self.path):
+                self._held = 1
+                try:
+                    yield
+                finally:
+                    self._held = 0
+
+    def _rotate(self):
+        """post_history.jsonl -> .1 -> .2 ..., dropping the oldest"""
+        self._close_fd()
+        if self.backups <= 0:
+            os.remove(self.path)
+            return
+        oldest = f"{self.path}.{self.backups}"
+        if os.path.exists(oldest):
+            os.remove(oldest)
+        for index in range(self.backups - 1, 0, -1):
+            if os.path.exists(f"{self.path}.{index}"):
+                os.replace(f"{self.path}.{index}", f"{self.path}.{index + 1}")
+        os.replace(self.path, f"{self.path}.1")
+
+    def append(self, record):
+        """Write one record (a dict) as a line"""
+        line = (serialization.dumps(record) + '\n').encode('utf-8')
+        # Another process may be checking the size or rotating at the same time
+        with self.locked():
+            fd = self._current_fd()
+            size = os.fstat(fd).st_size
+            if self.max_bytes and size and size + len(line) > self.max_bytes:
+                self._rotate()
+                fd = self._current_fd()
+            os.write(fd, line)
+            self._unsynced += 1
+            if (self._unsynced >= self.fsync_every
+                    or time.monotonic() - self._last_sync >= self.fsync_interval):
+                self._sync()
+
+    def _sync(self):
+        if self._fd is not None and self._unsynced:
+            os.fsync(self._fd)
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def flush(self):
+        """fsync anything written since the last sync"""
+        with self._lock:
+            self._sync()
+
+    def _close_fd(self):
+        if self._fd is not None:
+            self._sync()
+            os.close(self._fd)
+            self._fd = None
+
+    def close(self):
+        with self._lock:
+            self._close_fd()
+
+    def migrate_legacy_file(self):
+        """Convert an old post_history.json array, then rename it *.migrated"""
+        for path in {os.path.join(ROOT, LEGACY_FILE), os.path.abspath(LEGACY_FILE)}:
+            if not os.path.exists(path):
+                continue
+            try:
+                records = serialization.load(path)
+            except (OSError, ValueError) as e:
+                print(f"⚠️  Could not migrate {path}: {e}")
+                continue
+            for record in records:
+                self.append(record)
+            self.flush()
+            os.replace(path, f"{path}.migrated")
+            print(f"📦 Moved {len(records)} history records from {path} to {self.path}")
+
+
+def _close_synced(f):
+    f.flush()
+    os.fsync(f.fileno())
+    f.close()
+
+
+def compact(path=None, keep_days=None, max_bytes=None):
+    """Rewrite the log offline: drop torn lines and records older than keep_days
+
+    Records are rewritten oldest first into fresh segments, each replaced
+    atomically, holding the log's lock so no process appends or rotates
+    meanwhile. Returns (kept, dropped).
+    """
+    path = path or Config.HISTORY_FILE
+    with file_lock(path):
+        return _compact(path, keep_days, max_bytes)
+
+
+def _compact(path, keep_days, max_bytes):
+    max_bytes = max_bytes if max_bytes is not None else Config.HISTORY_MAX_BYTES
+    cutoff = (datetime.now() - timedelta(days=keep_days)).isoformat() if keep_days else None
+    old_segments = segment_paths(path)
+
+    # Write the surviving records to new temporary segments
+    new_segments = []
+    out = None
+    size = 0
+    kept = dropped = 0
+    for segment in old_segments:
+        with open(segment, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = serialization.loads(line)
+                except ValueError:
+                    dropped += 1
+                    continue
+                if cutoff and record.get('timestamp', '') < cutoff:
+                    dropped += 1
+                    continue
+                data = (serialization.dumps(record) + '\n').encode('utf-8')
+                if out is None or (max_bytes and size and size + len(data) > max_bytes):
+                    if out:
+                        _close_synced(out)
+                    new_segments.append(f"{path}.compact{len(new_segments)}")
+                    out = open(new_segments[-1], 'wb')
+                    size = 0
+                out.write(data)
+                size += len(data)
+                kept += 1
+    if out:
+        _close_synced(out)
+
+    # Newest segment becomes the live file, older ones .1, .2, ...
+    targets = [path] + [f"{path}.{i}" for i in range(1, len(new_segments))]
+    for temporary, target in zip(reversed(new_segments), targets):
+        os.replace(temporary, target)
+    for segment in old_segments:
+        if segment not in targets and os.path.exists(segment):
+            os.remove(segment)
+    return kept, dropped
+
+
+_logs = {}
+_log_lock = threading.Lock()
+
+
+def get_history_log(account=None):
+    """The process-wide history log of an account (synced and closed at exit)
+
+    Other accounts than the default one log to their own file next to
+    HISTORY_FILE (post_history.acme.jsonl).
+    """
+    key = None if is_default(account) else account
+    with _log_lock:
+        if key not in _logs:
+            log = HistoryLog(account_path(Config.HISTORY_FILE, key))
+            if key is None:
+                log.migrate_legacy_file()
+            atexit.register(log.close)
+            _logs[key] = log
+    return _logs[key]
+
+
+# Main execution
+if __name__ == "__main__":
+    import sys
+
+    command = sys.argv[1] if len(sys.argv) > 1 else "stats"
+
+    if command == "stats":
+        count = 0
+        first = last = None
+        for record in iter_history():
+            count += 1
+            first = first or record.get('timestamp')
+            last = record.get('timestamp')
+        segments = segment_paths(Config.HISTORY_FILE)
+        size = sum(os.path.getsize(segment) for segment in segments)
+        print(f"📜 {count} records in {len(segments)} files ({size / 1024:.0f} KB)")
+        if count:
+            print(f"   {first} → {last}")
+
+    elif command == "tail":
+        count = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+        for record in deque(iter_history(), maxlen=count):
+            results = record.get('results', {})
+            sent = [p for p, r in results.items() if r.get('success')]
+            print(f"{record.get('timestamp', '')[:16]}  {record.get('post', {}).get('title', '')[:50]}"
+                  f"  → {', '.join(sent) or 'nothing'}")
+
+    elif command == "compact":
+        keep_days = int(sys.argv[2]) if len(sys.argv) > 2 else None
+        kept, dropped = compact(keep_days=keep_days)
+        print(f"✅ Compacted history: kept {kept}, dropped {dropped}")
+
+    else:
+        print("Usage: python -m core.history_log [stats | tail [n] | compact [keep_days]]")
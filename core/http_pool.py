@@ -0,0 +1,73 @@
+# http_pool.py
+from urllib.parse import urlsplit
+
+from config import Config
+
+
+class HttpSessionPool:
+    """Keep-alive HTTP clients for the REST platforms, one per host
+
+    Each host gets its own httpx.AsyncClient with a bounded connection pool,
+    so back-to-back posts reuse the TCP+TLS connection instead of doing a
+    new handshake every time. Connection failures are retried by the
+    transport; requests that reached the server are never resent, since a
+    retried POST could publish twice.
+    """
+
+    def __init__(self, pool_size=None, connect_timeout=None, read_timeout=None,
+                 retries=None, verify=True):
+        self.pool_size = pool_size if pool_size is not None else Config.HTTP_POOL_SIZE
+        self.connect_timeout = connect_timeout if connect_timeout is not None else Config.HTTP_CONNECT_TIMEOUT
+        self.read_timeout = read_timeout if read_timeout is not None else Config.HTTP_READ_TIMEOUT
+        self.retries = retries if retries is not None else Config.HTTP_RETRIES
+        self.verify = verify
+        self._clients = {}
+
+    def _host_key(self, url):
+        parts = urlsplit(url)
+        return f"{parts.scheme}://{parts.netloc}"
+
+    def client(self, url):
+        """Return the client for url's host, creating it on first use"""
+        key = self._host_key(url)
+        if key not in self._clients:
+            import httpx
+
+            limits = httpx.Limits(
+                max_connections=self.pool_size,
+                max_keepalive_connections=self.pool_size
+            )
+            transport = httpx.AsyncHTTPTransport(
+                retries=self.retries,
+                limits=limits,
+                verify=self.verify
+            )
+            self._clients[key] = httpx.AsyncClient(
+                transport=transport,
+                timeout=httpx.Timeout(
+                    self.read_timeout,
+                    connect=self.connect_timeout,
+                    pool=self.connect_timeout
+                )
+            )
+        return self._clients[key]
+
+    async def request(self, method, url, **kwargs):
+        """Send a request through the pooled client for url's host"""
+        return await self.client(url).request(method, url, **kwargs)
+
+    async def post(self, url, **kwargs):
+        return await self.request('POST', url, **kwargs)
+
+    async def get(self, url, **kwargs):
+        return await self.request('GET', url, **kwargs)
+
+    def hosts(self):
+        """Hosts that currently have a client"""
+        return list(self._clients.keys())
+
+    async def aclose(self):
+        """Close every client and its connections"""
+        clients, self._clients = self._clients, {}
+        for client in clients.values():
+            await client.aclose()
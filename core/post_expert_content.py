@@ -1,74 +1,95 @@
 # post_expert_content.py
-import json
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from datetime import datetime
-from social_poster import SocialMediaPoster
+from core.social_poster import SocialMediaPoster
+from core import delivery
+from core.post_queue import format_age, get_queue
 
-def post_expert_content():
-    """Post expert content to Twitter and LinkedIn"""
-    try:
-        with open('expert_queue.json', 'r') as f:
-            queue = json.load(f)
-    except:
-        print("❌ No expert content in queue")
-        return
-    
-    if not queue:
+def post_expert_content(account=None):
+    """Post an account's due expert content to Twitter and LinkedIn"""
+    queue = get_queue('expert', account)
+
+    if not len(queue):
         print("📭 Expert queue is empty")
         return
-    
-    # Get current time
-    now = datetime.now()
-    current_time = now.strftime("%H:%M")
-    
-    # Find posts scheduled for this time (with 5-minute window)
-    posts_to_send = []
-    remaining = []
-    
-    for post in queue:
-        if 'time_slot' in post:
-            # Check if it's time to post (within 5 minutes)
-            post_time = post['time_slot']
-            if abs(int(post_time.split(':')[0]) - now.hour) == 0:
-                if abs(int(post_time.split(':')[1]) - now.minute) <= 5:
-                    posts_to_send.append(post)
-                else:
-                    remaining.append(post)
-            else:
-                remaining.append(post)
+
+    # Claim one due post at a time (posts without a time slot are due at
+    # once), so each lease only has to cover the post being sent
+    entry = queue.claim_due(count=1)
+
+    if not entry:
+        current_time = datetime.now().strftime("%H:%M")
+        next_due = queue.next_due_in()
+        if next_due is not None:
+            print(f"⏰ No posts due at {current_time}, next in {format_age(next_due)}")
         else:
-            # No time slot, post it now
-            posts_to_send.append(post)
-    
-    if not posts_to_send:
-        print(f"⏰ No posts scheduled for {current_time}")
+            print(f"⏰ No posts due at {current_time}")
         return
-    
+
     # Initialize poster
-    poster = SocialMediaPoster()
-    
+    poster = SocialMediaPoster(account=account)
+    platforms = poster.get_enabled_platforms()
+
     # Post each
-    for post in posts_to_send:
-        print(f"\n📤 Posting: {post['content'][:60]}...")
-        
-        # Short posts work well as both tweet and LinkedIn post
+    handled = set()
+    while entry:
+        item_id, post = entry[0]
+        if item_id in handled:
+            # Came straight back: nothing more to send for it this run
+            queue.release(item_id)
+            break
+        handled.add(item_id)
+        post_one(queue, poster, platforms, item_id, post)
+        entry = queue.claim_due(count=1)
+
+    print(f"\n📋 {len(queue)} posts remaining in queue")
+
+def post_one(queue, poster, platforms, item_id, post):
+    """Send one claimed post to its due platforms and settle it"""
+    # Failed platforms wait out their backoff; the item isn't due until then
+    due = delivery.due_platforms(post, platforms)
+    if not due:
+        if delivery.is_done(post, platforms):
+            queue.ack(item_id)
+        else:
+            delivery.release(queue, item_id, post, platforms)
+        return
+
+    print(f"\n📤 Posting: {post['content'][:60]}...")
+
+    # Short posts work well as both tweet and LinkedIn post
+    try:
         results = poster.post_to_all(
             title="",  # No title for short posts
             content=post['content'],
-            url=""  # No URL for these expert posts
+            url="",  # No URL for these expert posts
+            platforms=due
         )
-        
-        # Show results
-        for platform, result in results.items():
-            if result['success']:
-                print(f"✅ {platform}: Posted successfully")
-            else:
-                print(f"❌ {platform}: {result['error']}")
-    
-    # Save remaining posts back to queue
-    with open('expert_queue.json', 'w') as f:
-        json.dump(remaining, f, indent=2)
-    
-    print(f"\n📋 {len(remaining)} posts remaining in queue")
+    except Exception as e:
+        # Back off (or dead-letter) this one and carry on with the rest
+        print(f"❌ {e}")
+        queue.nack(item_id, error=str(e))
+        return
+
+    # Show results
+    for platform, result in results.items():
+        if result['success']:
+            print(f"✅ {platform}: Posted successfully")
+        else:
+            print(f"❌ {platform}: {result['error']}")
+
+    delivery.record_results(post, results)
+
+    # Remove it once every platform is done; if nothing went out it backs
+    # off (and is dead-lettered after too many tries)
+    outcome = delivery.settle(queue, item_id, post, results, platforms)
+    if outcome == 'dead':
+        print("💀 Post failed too many times, moved to dead letters (python -m core.post_queue dead)")
+    elif outcome == 'retry':
+        print(f"⚠️ Post kept for retry: {delivery.describe(post, platforms)}")
 
 if __name__ == "__main__":
-    post_expert_content()
\ No newline at end of file
+    # Optional account name: python core/post_expert_content.py acme
+    post_expert_content(sys.argv[1] if len(sys.argv) > 1 else None)
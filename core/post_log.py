@@ -0,0 +1,358 @@
+# post_log.py
+"""Shared post log with a cursor per platform
+
+A post is appended to the log once. Every platform then reads the log
+through its own cursor and posts at its own pace: Twitter drains at its
+quota while Dev.to or Medium move at theirs, and a slow or failing
+platform never holds up the others. Entries are trimmed once every
+platform has passed them.
+
+    log = get_post_log('content')
+    log.append_many(posts)
+    run_sync(drain(log, poster.engine))   # every platform catches up
+    log.depths()                          # {'twitter': 3, 'devto': 0, ...}
+
+Each cursor keeps a tally of the entries still ahead of it that the
+platform takes, so depths() reads counts instead of the log.
+
+A platform's cursor is leased while it posts, so several processes can
+drain the same log without posting an entry twice. A failed entry is
+retried with backoff and skipped after DELIVERY_MAX_ATTEMPTS; a rate-limit
+deferral just waits. The log lives in the queue database.
+
+    python -m core.post_log status [log]
+"""
+import asyncio
+import functools
+import threading
+import time
+
+from config import Config
+from core import serialization
+from core.delivery import retry_delay
+from core.post_queue import PAGE_SIZE, connect, default_owner
+
+
+def takes(post, platform):
+    """Whether an entry is meant for platform (entries without 'platforms' go to all)"""
+    return platform in post.get('platforms', [platform])
+
+
+# Moves a cursor past the entry seq: one fewer pending, unless it was already past
+PASS_ENTRY = "pending = pending - (position < ?), position = MAX(position, ?)"
+
+
+class PostLog:
+    """Append-only log of posts, consumed per platform"""
+
+    def __init__(self, name='content', path=None, owner=None, lease_seconds=None):
+        self.name = name
+        self.path = path or Config.QUEUE_DB
+        self.owner = owner or default_owner()
+        self.lease_seconds = lease_seconds if lease_seconds is not None else Config.QUEUE_LEASE_SECONDS
+        self._conn = connect(self.path)
+        self._lock = threading.Lock()
+
+    def _write(self, func):
+        """Run func(conn) in one write transaction"""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                result = func(self._conn)
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+            return result
+
+    def _read(self, sql, params=()):
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def append(self, post):
+        """Add one post; returns its sequence number"""
+        return self.append_many([post])[0]
+
+    def append_many(self, posts):
+        """Add posts in order, in one transaction; returns their sequence numbers
+
+        A post may carry 'platforms' to go to only those platforms.
+        """
+        return self._write(lambda conn: [self._insert(conn, post, time.time()) for post in posts])
+
+    def move_from(self, queue, claimed, transform=None):
+        """Append claimed queue items and remove them from the queue, in one
+        transaction; returns their sequence numbers
+
+        A crash leaves an item either queued or in the log, never both. Items
+        whose lease was lost to another worker are left to it. transform(post)
+        gives the entry to append (default: the post itself).
+        """
+        if queue.path != self.path:
+            raise ValueError(f"queue {queue.name} is not in the log's database ({self.path})")
+
+        def move(conn):
+            now = time.time()
+            seqs = []
+            for item_id, post in claimed:
+                if queue._owned(conn, "DELETE FROM items", (), item_id):
+                    seqs.append(self._insert(conn, transform(post) if transform else post, now))
+            return seqs
+
+        return self._write(move)
+
+    def _insert(self, conn, post, now):
+        """Append one entry and count it for the platforms that take it"""
+        if 'platforms' in post:
+            for platform in post['platforms']:
+                self._cursor(conn, platform)
+            marks = ", ".join("?" * len(post['platforms']))
+            conn.execute(f"UPDATE log_cursors SET pending = pending + 1 "
+                         f"WHERE log = ? AND platform IN ({marks})", (self.name, *post['platforms']))
+        else:
+            conn.execute("UPDATE log_cursors SET pending = pending + 1 WHERE log = ?", (self.name,))
+        return conn.execute(
+            "INSERT INTO post_log (log, payload, appended_at) VALUES (?, ?, ?)",
+            (self.name, serialization.dumps(post), now)
+        ).lastrowid
+
+    def _cursor(self, conn, platform):
+        """The platform's cursor (created, and its tally counted, on first use)"""
+        conn.execute("INSERT OR IGNORE INTO log_cursors (log, platform) VALUES (?, ?)",
+                     (self.name, platform))
+        position, pending, *rest = conn.execute(
+            "SELECT position, pending, retry_at, lease_owner, lease_expires FROM log_cursors "
+            "WHERE log = ? AND platform = ?", (self.name, platform)
+        ).fetchone()
+        if pending is None:
+            conn.execute("UPDATE log_cursors SET pending = ? WHERE log = ? AND platform = ?",
+                         (self._count_pending(conn, platform, position), self.name, platform))
+        return (position, *rest)
+
+    def _count_pending(self, conn, platform, position):
+        """Entries past position that the platform takes (reads the log; once per cursor)"""
+        count = 0
+        while True:
+            rows = conn.execute(
+                "SELECT seq, payload FROM post_log WHERE log = ? AND seq > ? ORDER BY seq LIMIT ?",
+                (self.name, position, PAGE_SIZE)
+            ).fetchall()
+            count += sum(1 for _, payload in rows if takes(serialization.loads(payload), platform))
+            if len(rows) < PAGE_SIZE:
+                return count
+            position = rows[-1][0]
+
+    def claim_next(self, platform, lease_seconds=None):
+        """(seq, post) of the platform's next entry, leasing its cursor; None if
+        it is caught up, waiting to retry, or being drained elsewhere"""
+        lease_seconds = lease_seconds if lease_seconds is not None else self.lease_seconds
+
+        def take(conn):
+            now = time.time()
+            position, retry_at, owner, expires = self._cursor(conn, platform)
+            if owner not in (None, self.owner) and expires and expires > now:
+                return None
+            if retry_at and retry_at > now:
+                return None
+
+            # Skip entries meant for other platforms
+            entry = None
+            while entry is None:
+                rows = conn.execute(
+                    "SELECT seq, payload FROM post_log WHERE log = ? AND seq > ? ORDER BY seq LIMIT ?",
+                    (self.name, position, PAGE_SIZE)
+                ).fetchall()
+                for seq, payload in rows:
+                    post = serialization.loads(payload)
+                    if takes(post, platform):
+                        entry = (seq, post)
+                        break
+                    position = seq
+                if len(rows) < PAGE_SIZE:
+                    break
+
+            conn.execute(
+                "UPDATE log_cursors SET position = ?, lease_owner = ?, lease_expires = ? "
+                "WHERE log = ? AND platform = ?",
+                (position, self.owner if entry else None, now + lease_seconds if entry else None,
+                 self.name, platform)
+            )
+            return entry
+
+        return self._write(take)
+
+    def _release(self, conn, platform, sql, params):
+        """Update the platform's cursor and drop its lease, if this owner still holds it"""
+        return conn.execute(
+            f"UPDATE log_cursors SET {sql}, lease_owner = NULL, lease_expires = NULL "
+            "WHERE log = ? AND platform = ? AND (lease_owner IS NULL OR lease_owner = ?)",
+            params + (self.name, platform, self.owner)
+        ).rowcount == 1
+
+    def _settle(self, platform, sql, params):
+        return self._write(lambda conn: self._release(conn, platform, sql, params))
+
+    def advance(self, platform, seq):
+        """The platform is done with seq (posted, or given up on)"""
+        return self._settle(platform, f"{PASS_ENTRY}, attempts = 0, retry_at = NULL, error = NULL",
+                            (seq, seq))
+
+    def fail(self, platform, seq, error=None, retry_after=None):
+        """Record a failed attempt: 'retry' after a backoff, or 'given_up' (entry
+        skipped); None if the cursor's lease was lost to another worker"""
+        def record(conn):
+            row = conn.execute(
+                "SELECT attempts FROM log_cursors WHERE log = ? AND platform = ? "
+                "AND (lease_owner IS NULL OR lease_owner = ?)", (self.name, platform, self.owner)
+            ).fetchone()
+            if row is None:
+                return None
+            attempts = row[0] + 1
+            if attempts >= Config.DELIVERY_MAX_ATTEMPTS:
+                self._release(conn, platform, f"{PASS_ENTRY}, attempts = 0, retry_at = NULL, error = ?",
+                              (seq, seq, error))
+                return 'given_up'
+            retry_at = time.time() + retry_delay(attempts, retry_after)
+            self._release(conn, platform, "attempts = ?, retry_at = ?, error = ?",
+                          (attempts, retry_at, error))
+            return 'retry'
+
+        # Read, count and store in one transaction, so no attempt is lost
+        return self._write(record)
+
+    def defer(self, platform, retry_after, error=None):
+        """Pause the platform without counting an attempt (rate limited)"""
+        return self._settle(platform, "retry_at = ?, error = ?", (time.time() + retry_after, error))
+
+    def depths(self, platforms=None):
+        """Queue depth per platform: entries past its cursor it takes, {platform: count}
+
+        Read from the cursors' tallies. A platform that never read the log
+        gets a cursor, counted once.
+        """
+        pending = dict(self._read(
+            "SELECT platform, pending FROM log_cursors WHERE log = ?", (self.name,)))
+        platforms = platforms or sorted(pending)
+        if any(pending.get(platform) is None for platform in platforms):
+            def count(conn):
+                for platform in platforms:
+                    self._cursor(conn, platform)
+                return dict(conn.execute(
+                    "SELECT platform, pending FROM log_cursors WHERE log = ?", (self.name,)).fetchall())
+            pending = self._write(count)
+        return {platform: pending[platform] for platform in platforms}
+
+    def cursors(self):
+        """Every platform's cursor: {platform: {position, attempts, retry_at, error, leased}}"""
+        now = time.time()
+        return {platform: {'position': position, 'attempts': attempts, 'retry_at': retry_at,
+                           'error': error, 'leased': bool(expires and expires > now)}
+                for platform, position, attempts, retry_at, error, expires in self._read(
+                    "SELECT platform, position, attempts, retry_at, error, lease_expires "
+                    "FROM log_cursors WHERE log = ? ORDER BY platform", (self.name,))}
+
+    def trim(self, platforms=()):
+        """Delete entries every platform has passed; returns how many
+
+        Every platform with a cursor on the log counts, plus platforms (the
+        enabled ones) that haven't read it yet: entries they still need stay.
+        """
+        def delete(conn):
+            for platform in platforms:
+                self._cursor(conn, platform)
+            position = conn.execute("SELECT MIN(position) FROM log_cursors WHERE log = ?",
+                                    (self.name,)).fetchone()[0]
+            if position is None:
+                return 0
+            return conn.execute("DELETE FROM post_log WHERE log = ? AND seq <= ?",
+                                (self.name, position)).rowcount
+
+        return self._write(delete)
+
+    def __len__(self):
+        return self._read("SELECT COUNT(*) FROM post_log WHERE log = ?", (self.name,))[0][0]
+
+    def close(self):
+        self._conn.close()
+
+
+async def drain(log, engine, platforms=None, limit=None, on_result=None):
+    """Let every platform catch up on the log, each at its own pace
+
+    One consumer per platform posts its entries in order until it is
+    caught up, has a failure to wait out, or has posted limit entries.
+    on_result(platform, post, result) is called after each attempt.
+    Returns {platform: posted}.
+    """
+    platforms = platforms or engine.get_enabled_platforms()
+    # The log is SQLite: run its calls in the executor so one platform
+    # waiting on a locked database doesn't stall the others
+    loop = asyncio.get_running_loop()
+
+    def blocking(func, *args):
+        return loop.run_in_executor(None, functools.partial(func, *args))
+
+    # The lease covers a post waiting for its rate-limit budget and then
+    # running into its timeout, so no one else claims the entry meanwhile
+    lease = log.lease_seconds + engine.rate_limiter.max_wait + engine.platform_timeout
+
+    async def consume(platform):
+        posted = 0
+        while limit is None or posted < limit:
+            entry = await blocking(log.claim_next, platform, lease)
+            if entry is None:
+                break
+            seq, post = entry
+            result = await engine.post_to_platform(
+                platform, engine.create_post(post.get('title', ''), post.get('content', ''), post.get('url', '')))
+            if on_result:
+                on_result(platform, post, result)
+
+            if result.get('deferred'):
+                await blocking(log.defer, platform, result.get('retry_after', 0), result.get('error'))
+                break
+            if result.get('success'):
+                await blocking(log.advance, platform, seq)
+                posted += 1
+            elif await blocking(log.fail, platform, seq, result.get('error'),
+                                result.get('retry_after')) == 'retry':
+                break
+        return posted
+
+    counts = await asyncio.gather(*(consume(platform) for platform in platforms))
+    await blocking(log.trim, platforms)
+    return dict(zip(platforms, counts))
+
+
+_logs = {}
+_logs_lock = threading.Lock()
+
+
+def get_post_log(name='content'):
+    """The process-wide post log called name"""
+    with _logs_lock:
+        if name not in _logs:
+            _logs[name] = PostLog(name)
+        return _logs[name]
+
+
+# Main execution
+if __name__ == "__main__":
+    import sys
+
+    command = sys.argv[1] if len(sys.argv) > 1 else "status"
+
+    if command == "status":
+        log = get_post_log(sys.argv[2] if len(sys.argv) > 2 else 'content')
+        print(f"📜 {log.name} log: {len(log)} entries")
+        depths = log.depths()
+        for platform, cursor in log.cursors().items():
+            state = ""
+            if cursor['leased']:
+                state = " (posting)"
+            elif cursor['retry_at'] and cursor['retry_at'] > time.time():
+                state = f" (retry in {cursor['retry_at'] - time.time():.0f}s: {cursor['error']})"
+            print(f"   {platform}: {depths[platform]} behind{state}")
+
+    else:
+        print("Usage: python -m core.post_log [status [log]]")
@@ -0,0 +1,730 @@
+# post_queue.py
+"""Durable post queues in SQLite
+
+Every queue (content, expert, ...) lives in one SQLite database in WAL
+mode, so readers never block the writer and a crash mid-write can't lose
+the queue. Items keep their JSON shape: a queue item is exactly what used
+to be an element of content_queue.json / expert_queue.json.
+
+    queue = get_queue('expert')
+    queue.put_many(posts)
+    claim = queue.claim()            # (id, item), leased to this process
+    ...post it...
+    queue.ack(claim[0])              # done: remove it
+    queue.release(claim[0], item)    # or put it back with new delivery state
+    queue.nack(claim[0], item, error) # or count a failure: retried later, or dead-lettered
+
+A claimed item is leased to one consumer for QUEUE_LEASE_SECONDS, so any
+number of worker processes can drain the same queue without posting an
+item twice. If a worker dies, its lease expires and the item is claimed
+again.
+
+A failed item (nack) is retried after an exponential backoff; other items
+are claimed meanwhile. After QUEUE_MAX_ATTEMPTS failures it moves to the
+dead-letter store, where it can be inspected, requeued or purged.
+
+The old JSON file in the working directory is imported the first time a
+queue is opened for posting or generating (and renamed to *.migrated);
+status commands leave it alone. From the command line:
+
+    python -m core.post_queue status
+    python -m core.post_queue reclaim
+    python -m core.post_queue import expert expert_queue.json
+    python -m core.post_queue export expert expert_queue.json
+    python -m core.post_queue dead [queue]
+    python -m core.post_queue requeue <queue> [id ...]
+    python -m core.post_queue purge <queue> [id ...]
+"""
+import os
+import socket
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+
+from config import Config
+from core import serialization
+from core.accounts import is_default
+
+# The file each queue used to be, in the working directory (where the old code opened it)
+LEGACY_FILES = {
+    'content': 'content_queue.json',
+    'expert': 'expert_queue.json',
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    queue TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    enqueued_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS items_queue ON items (queue, id);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+# Per-queue tallies kept by triggers: kind 'total' (name ''), 'type', 'topic';
+# plus 'dead' (name ''), the queue's items in the dead-letter store
+STAT_COLUMNS = [('total', "''"),
+                ('type', "COALESCE(json_extract({row}.payload, '$.type'), '')"),
+                ('topic', "COALESCE(json_extract({row}.payload, '$.topic'), '')")]
+
+
+def _count_statements(row, delta):
+    return "".join(
+        f"INSERT INTO queue_stats (queue, kind, name, count) "
+        f"VALUES ({row}.queue, '{kind}', {name.format(row=row)}, {delta}) "
+        f"ON CONFLICT (queue, kind, name) DO UPDATE SET count = count + {delta}; "
+        for kind, name in STAT_COLUMNS
+    )
+
+
+# A time_slot that passed less than this long ago is still due today
+TIME_SLOT_GRACE = 5 * 60
+
+
+def due_timestamp(item, now):
+    """When an item is due, as epoch seconds
+
+    'due_at' is an absolute ISO time. A legacy 'time_slot' ("HH:MM") means
+    its next occurrence. Anything else is due at once.
+    """
+    if item.get('due_at'):
+        return datetime.fromisoformat(item['due_at']).timestamp()
+    if item.get('time_slot'):
+        hour, minute = (int(part) for part in item['time_slot'].split(':'))
+        moment = datetime.fromtimestamp(now)
+        due = moment.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        if due.timestamp() < now - TIME_SLOT_GRACE:
+            due += timedelta(days=1)
+        return due.timestamp()
+    return now
+
+
+def _backfill_due_at(conn):
+    """Give existing items their due time (enqueue time unless scheduled)"""
+    conn.execute("UPDATE items SET due_at = enqueued_at")
+    now = time.time()
+    rows = conn.execute(
+        "SELECT id, payload FROM items "
+        "WHERE json_extract(payload, '$.time_slot') IS NOT NULL "
+        "OR json_extract(payload, '$.due_at') IS NOT NULL"
+    ).fetchall()
+    for item_id, payload in rows:
+        conn.execute("UPDATE items SET due_at = ? WHERE id = ?",
+                     (due_timestamp(serialization.loads(payload), now), item_id))
+
+
+# Schema changes, applied in order; PRAGMA user_version counts those done
+MIGRATIONS = [
+    # 1: leases
+    ["ALTER TABLE items ADD COLUMN lease_owner TEXT",
+     "ALTER TABLE items ADD COLUMN lease_expires REAL"],
+    # 2: status metadata maintained on every enqueue/dequeue
+    ["""CREATE TABLE queue_stats (
+            queue TEXT NOT NULL,
+            kind TEXT NOT NULL,
+            name TEXT NOT NULL,
+            count INTEGER NOT NULL,
+            PRIMARY KEY (queue, kind, name)
+        )""",
+     f"CREATE TRIGGER items_count_insert AFTER INSERT ON items BEGIN {_count_statements('NEW', 1)}END",
+     f"CREATE TRIGGER items_count_delete AFTER DELETE ON items BEGIN {_count_statements('OLD', -1)}END",
+     "CREATE TRIGGER items_count_update AFTER UPDATE OF payload ON items "
+     "WHEN json_extract(OLD.payload, '$.type') IS NOT json_extract(NEW.payload, '$.type') "
+     "OR json_extract(OLD.payload, '$.topic') IS NOT json_extract(NEW.payload, '$.topic') "
+     f"BEGIN {_count_statements('OLD', -1)}{_count_statements('NEW', 1)}END"]
+    + [f"INSERT INTO queue_stats SELECT queue, '{kind}', {name.format(row='items')}, COUNT(*) "
+       f"FROM items GROUP BY 1, 2, 3" for kind, name in STAT_COLUMNS]
+    + ["CREATE INDEX items_lease ON items (queue, lease_expires)"],
+    # 3: due-time index for scheduled posts
+    ["ALTER TABLE items ADD COLUMN due_at REAL",
+     _backfill_due_at,
+     "CREATE INDEX items_due ON items (queue, due_at, id)"],
+    # 4: failure counts, retry backoff and the dead-letter store
+    ["ALTER TABLE items ADD COLUMN attempts INTEGER NOT NULL DEFAULT 0",
+     "ALTER TABLE items ADD COLUMN available_at REAL",
+     """CREATE TABLE dead_letters (
+            id INTEGER PRIMARY KEY,
+            queue TEXT NOT NULL,
+            payload TEXT NOT NULL,
+            enqueued_at REAL NOT NULL,
+            attempts INTEGER NOT NULL,
+            error TEXT,
+            failed_at REAL NOT NULL
+        )""",
+     "CREATE INDEX dead_letters_queue ON dead_letters (queue, id)"],
+    # 5: shared post log with a cursor per platform (core/post_log.py)
+    ["""CREATE TABLE post_log (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            log TEXT NOT NULL,
+            payload TEXT NOT NULL,
+            appended_at REAL NOT NULL
+        )""",
+     "CREATE INDEX post_log_log ON post_log (log, seq)",
+     """CREATE TABLE log_cursors (
+            log TEXT NOT NULL,
+            platform TEXT NOT NULL,
+            position INTEGER NOT NULL DEFAULT 0,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            retry_at REAL,
+            error TEXT,
+            lease_owner TEXT,
+            lease_expires REAL,
+            PRIMARY KEY (log, platform)
+        )"""],
+    # 6: status counts for retries and dead letters without scanning
+    ["CREATE INDEX items_available ON items (queue, available_at)",
+     "CREATE TRIGGER dead_letters_count_insert AFTER INSERT ON dead_letters BEGIN "
+     "INSERT INTO queue_stats (queue, kind, name, count) VALUES (NEW.queue, 'dead', '', 1) "
+     "ON CONFLICT (queue, kind, name) DO UPDATE SET count = count + 1; END",
+     "CREATE TRIGGER dead_letters_count_delete AFTER DELETE ON dead_letters BEGIN "
+     "UPDATE queue_stats SET count = count - 1 "
+     "WHERE queue = OLD.queue AND kind = 'dead' AND name = ''; END",
+     "INSERT INTO queue_stats SELECT queue, 'dead', '', COUNT(*) FROM dead_letters GROUP BY 1"],
+    # 7: per-platform count of post log entries past the cursor (NULL = not counted yet)
+    ["ALTER TABLE log_cursors ADD COLUMN pending INTEGER"],
+]
+
+# Claimable: not leased, and not waiting out a retry backoff
+AVAILABLE = ("(lease_expires IS NULL OR lease_expires <= :now) "
+             "AND (available_at IS NULL OR available_at <= :now)")
+
+# Rows fetched at a time when scanning a queue
+PAGE_SIZE = 100
+
+
+def connect(path=None):
+    """Open the queue database (WAL mode, waits on locks instead of failing)"""
+    path = path or Config.QUEUE_DB
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    # Autocommit; writes use explicit BEGIN IMMEDIATE transactions
+    conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    _migrate(conn)
+    return conn
+
+
+def _migrate(conn):
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        for number, statements in enumerate(MIGRATIONS[version:], version + 1):
+            for statement in statements:
+                if callable(statement):
+                    statement(conn)
+                else:
+                    conn.execute(statement)
+            conn.execute(f"PRAGMA user_version = {number}")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+
+def default_owner():
+    """Lease owner name for this process"""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class PostQueue:
+    """One named FIFO queue of post dicts"""
+
+    def __init__(self, name, path=None, owner=None, lease_seconds=None, max_attempts=None):
+        self.name = name
+        self.path = path or Config.QUEUE_DB
+        self.owner = owner or default_owner()
+        self.lease_seconds = lease_seconds if lease_seconds is not None else Config.QUEUE_LEASE_SECONDS
+        self.max_attempts = max_attempts if max_attempts is not None else Config.QUEUE_MAX_ATTEMPTS
+        self._conn = connect(self.path)
+        self._lock = threading.Lock()
+
+    def _write(self, func):
+        """Run func(conn) in one write transaction"""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                result = func(self._conn)
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+            return result
+
+    def _read(self, sql, params=()):
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def put(self, item):
+        """Append one item; returns its id"""
+        return self.put_many([item])[0]
+
+    def put_many(self, items):
+        """Append items in order, in one transaction; returns their ids
+
+        Items with a 'due_at' (ISO time) or 'time_slot' ("HH:MM") are due
+        then; others are due at once.
+        """
+        return self._write(lambda conn: self._insert(conn, items))
+
+    def _insert(self, conn, items):
+        now = time.time()
+        ids = []
+        for item in items:
+            due_at = due_timestamp(item, now)
+            if due_at != now:
+                item = dict(item, due_at=datetime.fromtimestamp(due_at).isoformat())
+            ids.append(conn.execute(
+                "INSERT INTO items (queue, payload, enqueued_at, due_at) VALUES (?, ?, ?, ?)",
+                (self.name, serialization.dumps(item), now, due_at)
+            ).lastrowid)
+        return ids
+
+    def first(self, predicate=None):
+        """(id, item) of the oldest item (matching predicate), or None
+
+        Read only: the item is not claimed. Use claim() to post it.
+        """
+        for entry in self:
+            if predicate is None or predicate(entry[1]):
+                return entry
+        return None
+
+    def claim_many(self, count=None, predicate=None, lease_seconds=None):
+        """Lease up to count unclaimed items (matching predicate), oldest first
+
+        Items whose lease expired count as unclaimed. Returns [(id, item)];
+        each must be ack()ed or release()d before its lease runs out.
+        """
+        return self._claim(count, predicate, lease_seconds)
+
+    def claim_due(self, count=None, now=None, lease_seconds=None):
+        """Lease up to count unclaimed items that are due, earliest due first
+
+        Reads the due-time index, so it costs O(log n) however many items
+        are scheduled for later.
+        """
+        return self._claim(count, None, lease_seconds, due_by=now or time.time())
+
+    def _claim(self, count, predicate, lease_seconds, due_by=None):
+        lease_seconds = lease_seconds if lease_seconds is not None else self.lease_seconds
+        if due_by is None:
+            # Queue order
+            where, order = "id > :id", "id"
+        else:
+            # Due order, up to due_by
+            where, order = "due_at <= :due_by AND (due_at, id) > (:due_at, :id)", "due_at, id"
+
+        def take(conn):
+            now = time.time()
+            claimed = []
+            position = {'id': 0, 'due_at': float('-inf')}
+            while count is None or len(claimed) < count:
+                rows = conn.execute(
+                    f"SELECT id, payload, due_at FROM items WHERE queue = :queue AND {where} "
+                    f"AND {AVAILABLE} ORDER BY {order} LIMIT :limit",
+                    dict(position, queue=self.name, due_by=due_by, now=now, limit=PAGE_SIZE)
+                ).fetchall()
+                for item_id, payload, _ in rows:
+                    item = serialization.loads(payload)
+                    if predicate is None or predicate(item):
+                        claimed.append((item_id, item))
+                        if count is not None and len(claimed) == count:
+                            break
+                if len(rows) < PAGE_SIZE:
+                    break
+                position = {'id': rows[-1][0], 'due_at': rows[-1][2]}
+            conn.executemany(
+                "UPDATE items SET lease_owner = ?, lease_expires = ? WHERE id = ?",
+                [(self.owner, now + lease_seconds, item_id) for item_id, _ in claimed]
+            )
+            return claimed
+
+        return self._write(take)
+
+    def claim(self, predicate=None, lease_seconds=None):
+        """Lease the oldest unclaimed item (matching predicate): (id, item) or None"""
+        claimed = self.claim_many(1, predicate, lease_seconds)
+        return claimed[0] if claimed else None
+
+    def pop(self):
+        """Remove and return the oldest unclaimed item, or None"""
+        def take(conn):
+            row = conn.execute(
+                f"SELECT id, payload FROM items WHERE queue = :queue AND {AVAILABLE} "
+                "ORDER BY id LIMIT 1",
+                {'queue': self.name, 'now': time.time()}
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute("DELETE FROM items WHERE id = ?", (row[0],))
+            return serialization.loads(row[1])
+
+        return self._write(take)
+
+    def _owned(self, conn, sql, params, item_id):
+        """Run sql on item_id only while this owner holds its lease (or nobody does)"""
+        cursor = conn.execute(
+            f"{sql} WHERE id = ? AND (lease_owner IS NULL OR lease_owner = ?)",
+            params + (item_id, self.owner)
+        )
+        return cursor.rowcount == 1
+
+    def ack(self, item_id):
+        """Remove a finished item; False if its lease was lost to another worker"""
+        return self._write(lambda conn: self._owned(conn, "DELETE FROM items", (), item_id))
+
+    def release(self, item_id, item=None, retry_at=None):
+        """Give a claimed item back, optionally with its new state (e.g. delivery results)
+
+        With retry_at (epoch seconds) it is neither claimable nor due before
+        then, e.g. while its failed platforms back off.
+        """
+        sql, params = "UPDATE items SET lease_owner = NULL, lease_expires = NULL", ()
+        if item is not None:
+            sql, params = sql + ", payload = ?", params + (serialization.dumps(item),)
+        if retry_at is not None:
+            sql, params = sql + ", available_at = ?, due_at = MAX(due_at, ?)", params + (retry_at, retry_at)
+        return self._write(lambda conn: self._owned(conn, sql, params, item_id))
+
+    def nack(self, item_id, item=None, error=None, retry_at=None):
+        """Give a claimed item back after a failed attempt
+
+        It is retried after an exponential backoff (or at retry_at, epoch
+        seconds), while other items are claimed. After QUEUE_MAX_ATTEMPTS
+        failures it moves to the dead-letter store instead. Returns 'retry',
+        'dead', or None if its lease was lost to another worker.
+        """
+        def fail(conn):
+            row = conn.execute(
+                "SELECT payload, enqueued_at, attempts FROM items "
+                "WHERE id = ? AND (lease_owner IS NULL OR lease_owner = ?)",
+                (item_id, self.owner)
+            ).fetchone()
+            if row is None:
+                return None
+            payload = serialization.dumps(item) if item is not None else row[0]
+            attempts = row[2] + 1
+            now = time.time()
+
+            if attempts >= self.max_attempts:
+                conn.execute(
+                    "INSERT INTO dead_letters (id, queue, payload, enqueued_at, attempts, error, failed_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (item_id, self.name, payload, row[1], attempts, error, now)
+                )
+                conn.execute("DELETE FROM items WHERE id = ?", (item_id,))
+                return 'dead'
+
+            from core.delivery import retry_delay  # only failures need it
+            available_at = retry_at or now + retry_delay(
+                attempts, base=Config.QUEUE_RETRY_BASE, maximum=Config.QUEUE_RETRY_MAX)
+            conn.execute(
+                "UPDATE items SET payload = ?, attempts = ?, available_at = ?, "
+                "due_at = MAX(due_at, ?), lease_owner = NULL, lease_expires = NULL WHERE id = ?",
+                (payload, attempts, available_at, available_at, item_id)
+            )
+            return 'retry'
+
+        return self._write(fail)
+
+    def dead_letters(self):
+        """Dead-lettered items: [{'id', 'item', 'attempts', 'error', 'failed_at'}]"""
+        rows = self._read(
+            "SELECT id, payload, attempts, error, failed_at FROM dead_letters "
+            "WHERE queue = ? ORDER BY id", (self.name,)
+        )
+        return [{'id': item_id, 'item': serialization.loads(payload), 'attempts': attempts,
+                 'error': error, 'failed_at': failed_at}
+                for item_id, payload, attempts, error, failed_at in rows]
+
+    def requeue_dead(self, ids=None):
+        """Put dead-lettered items (all, or those ids) back with fresh attempts"""
+        def requeue(conn):
+            rows = self._dead_rows(conn, "SELECT id, payload, enqueued_at", ids)
+            now = time.time()
+            conn.executemany(
+                "INSERT INTO items (queue, payload, enqueued_at, due_at) VALUES (?, ?, ?, ?)",
+                [(self.name, payload, enqueued_at, now) for _, payload, enqueued_at in rows]
+            )
+            conn.executemany("DELETE FROM dead_letters WHERE id = ?", [(row[0],) for row in rows])
+            return len(rows)
+
+        return self._write(requeue)
+
+    def purge_dead(self, ids=None):
+        """Delete dead-lettered items (all, or those ids); returns how many"""
+        def purge(conn):
+            rows = self._dead_rows(conn, "SELECT id", ids)
+            conn.executemany("DELETE FROM dead_letters WHERE id = ?", rows)
+            return len(rows)
+
+        return self._write(purge)
+
+    def _dead_rows(self, conn, select, ids):
+        rows = conn.execute(f"{select} FROM dead_letters WHERE queue = ? ORDER BY id",
+                            (self.name,)).fetchall()
+        if ids is not None:
+            ids = set(ids)
+            rows = [row for row in rows if row[0] in ids]
+        return rows
+
+    def renew(self, item_id, lease_seconds=None):
+        """Extend this owner's lease on an item (for long-running posts)"""
+        lease_seconds = lease_seconds if lease_seconds is not None else self.lease_seconds
+        return self._write(lambda conn: self._owned(
+            conn, "UPDATE items SET lease_expires = ?", (time.time() + lease_seconds,), item_id))
+
+    def update(self, item_id, item):
+        """Store an item's new state; it keeps its place and any lease"""
+        self._write(lambda conn: conn.execute(
+            "UPDATE items SET payload = ? WHERE id = ?", (serialization.dumps(item), item_id)))
+
+    def next_due_in(self, now=None):
+        """Seconds until the next unclaimed item is due (0 = now, None = empty)
+
+        An item backing off (nack, or release with retry_at) has its due time
+        moved to the end of the backoff, so it isn't due before then.
+        """
+        now = now or time.time()
+        rows = self._read(
+            "SELECT due_at FROM items WHERE queue = :queue "
+            "AND (lease_expires IS NULL OR lease_expires <= :now) ORDER BY due_at, id LIMIT 1",
+            {'queue': self.name, 'now': now}
+        )
+        return max(0.0, rows[0][0] - now) if rows else None
+
+    def reclaim_expired(self):
+        """Clear leases that ran out (their workers died); returns how many"""
+        return self._write(lambda conn: conn.execute(
+            "UPDATE items SET lease_owner = NULL, lease_expires = NULL "
+            "WHERE queue = ? AND lease_expires <= ?", (self.name, time.time())
+        ).rowcount)
+
+    def leased(self):
+        """Number of items currently claimed by a worker"""
+        return self._read(
+            "SELECT COUNT(*) FROM items WHERE queue = ? AND lease_expires > ?",
+            (self.name, time.time())
+        )[0][0]
+
+    def peek(self, count=1):
+        """The oldest `count` items, without removing them"""
+        rows = self._read(
+            "SELECT payload FROM items WHERE queue = ? ORDER BY id LIMIT ?",
+            (self.name, count)
+        )
+        return [serialization.loads(payload) for payload, in rows]
+
+    def __iter__(self):
+        """(id, item) pairs, oldest first, read a page at a time"""
+        last_id = 0
+        while True:
+            rows = self._read(
+                "SELECT id, payload FROM items WHERE queue = ? AND id > ? ORDER BY id LIMIT ?",
+                (self.name, last_id, PAGE_SIZE)
+            )
+            for item_id, payload in rows:
+                yield item_id, serialization.loads(payload)
+            if len(rows) < PAGE_SIZE:
+                return
+            last_id = rows[-1][0]
+
+    def __len__(self):
+        rows = self._read(
+            "SELECT count FROM queue_stats WHERE queue = ? AND kind = 'total'", (self.name,))
+        return rows[0][0] if rows else 0
+
+    def stats(self, preview=3):
+        """Queue status without reading the queue
+
+        Counts come from the tallies the triggers keep. Leased and retrying
+        items are counted on their indexes, which hold only those items past
+        now; the age and preview read only the first few rows of the index.
+        """
+        status = {'count': 0, 'leased': self.leased(), 'types': {}, 'topics': {},
+                  'oldest_age': None, 'head': [], 'dead': 0,
+                  'retrying': self._read(
+                      "SELECT COUNT(*) FROM items WHERE queue = ? AND available_at > ?",
+                      (self.name, time.time()))[0][0]}
+        for kind, name, count in self._read(
+                "SELECT kind, name, count FROM queue_stats WHERE queue = ? AND count > 0",
+                (self.name,)):
+            if kind == 'total':
+                status['count'] = count
+            elif kind == 'dead':
+                status['dead'] = count
+            else:
+                status[f"{kind}s"][name or 'none'] = count
+
+        head = self._read(
+            "SELECT enqueued_at, payload FROM items WHERE queue = ? ORDER BY id LIMIT ?",
+            (self.name, max(preview, 1))
+        )
+        if head:
+            status['oldest_age'] = time.time() - head[0][0]
+            status['head'] = [serialization.loads(payload) for _, payload in head[:preview]]
+        return status
+
+    def items(self):
+        """Every item, oldest first"""
+        return [item for _, item in self]
+
+    def clear(self):
+        self._write(lambda conn: conn.execute("DELETE FROM items WHERE queue = ?", (self.name,)))
+
+    def import_json(self, path):
+        """Append the items of a JSON array file; returns how many"""
+        items = serialization.load(path, default=[])
+        self.put_many(items)
+        return len(items)
+
+    def export_json(self, path, backend=None):
+        """Write the queue as an array file (the old queue file format)"""
+        items = self.items()
+        serialization.save(path, items, backend)
+        return len(items)
+
+    def migrate_legacy_file(self):
+        """Import the queue's old JSON file once, then rename it *.migrated
+
+        Reading, inserting and renaming happen inside one write transaction,
+        so when two processes start together only the first imports the file;
+        the second finds it gone.
+        """
+        if self.name not in LEGACY_FILES:
+            return 0
+        path = os.path.abspath(LEGACY_FILES[self.name])
+        if not os.path.exists(path):
+            return 0
+
+        def move(conn):
+            try:
+                items = serialization.load(path)
+            except FileNotFoundError:
+                return 0  # another process got here first
+            if not items:
+                return 0
+            self._insert(conn, items)
+            os.replace(path, f"{path}.migrated")
+            return len(items)
+
+        try:
+            count = self._write(move)
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Could not migrate {path}: {e}")
+            return 0
+        if count:
+            print(f"📦 Moved {count} posts from {path} into the {self.name} queue")
+        return count
+
+    def close(self):
+        self._conn.close()
+
+
+def format_age(seconds):
+    """'3d 4h', '2h 5m' or '7m'"""
+    minutes = int(seconds // 60)
+    days, minutes = divmod(minutes, 24 * 60)
+    hours, minutes = divmod(minutes, 60)
+    if days:
+        return f"{days}d {hours}h"
+    if hours:
+        return f"{hours}h {minutes}m"
+    return f"{minutes}m"
+
+
+_queues = {}
+_migrated = set()
+_queues_lock = threading.Lock()
+
+
+def partition_name(name, account=None):
+    """Queue name for an account's partition ('acme:content'; the default account's is plain)"""
+    return name if is_default(account) else f"{account}:{name}"
+
+
+def get_queue(name, account=None, migrate=True):
+    """The process-wide queue called name, in an account's partition
+
+    The old JSON file is imported into the default account's queue on first
+    use. Status commands pass migrate=False: looking at a queue moves nothing.
+    """
+    name = partition_name(name, account)
+    with _queues_lock:
+        if name not in _queues:
+            _queues[name] = PostQueue(name)
+        if migrate and name not in _migrated:
+            _queues[name].migrate_legacy_file()
+            _migrated.add(name)
+        return _queues[name]
+
+
+def queue_names():
+    """Names of the known queues plus any others in the database"""
+    conn = connect()
+    try:
+        names = [row[0] for row in conn.execute(
+            "SELECT DISTINCT queue FROM items UNION SELECT DISTINCT queue FROM dead_letters")]
+    finally:
+        conn.close()
+    return sorted(set(LEGACY_FILES) | set(names))
+
+
+# Main execution
+if __name__ == "__main__":
+    import sys
+
+    command = sys.argv[1] if len(sys.argv) > 1 else "status"
+
+    if command == "status":
+        for name in queue_names():
+            status = get_queue(name, migrate=False).stats()
+            print(f"📋 {name}: {status['count']} posts ({status['leased']} being posted, "
+                  f"{status['retrying']} waiting to retry, {status['dead']} dead-lettered)")
+            if status['count']:
+                print(f"   oldest: {format_age(status['oldest_age'])}")
+                for kind in ('types', 'topics'):
+                    tally = sorted(status[kind].items(), key=lambda pair: -pair[1])
+                    print(f"   {kind}: " + ", ".join(f"{k} {v}" for k, v in tally))
+
+    elif command == "reclaim":
+        for name in queue_names():
+            count = get_queue(name).reclaim_expired()
+            if count:
+                print(f"♻️  {name}: reclaimed {count} expired leases")
+
+    elif command == "import" and len(sys.argv) == 4:
+        count = get_queue(sys.argv[2]).import_json(sys.argv[3])
+        print(f"✅ Imported {count} posts into the {sys.argv[2]} queue")
+
+    elif command == "export" and len(sys.argv) == 4:
+        count = get_queue(sys.argv[2]).export_json(sys.argv[3])
+        print(f"✅ Exported {count} posts to {sys.argv[3]}")
+
+    elif command == "dead":
+        for name in sys.argv[2:] or queue_names():
+            for dead in get_queue(name, migrate=False).dead_letters():
+                failed = datetime.fromtimestamp(dead['failed_at']).strftime('%Y-%m-%d %H:%M')
+                text = dead['item'].get('content') or dead['item'].get('title') or ''
+                print(f"💀 {name} #{dead['id']}  {failed}  {dead['attempts']} attempts  {text[:50]}")
+                print(f"   {dead['error'] or 'no error recorded'}")
+
+    elif command in ("requeue", "purge") and len(sys.argv) >= 3:
+        queue = get_queue(sys.argv[2])
+        ids = [int(arg) for arg in sys.argv[3:]] or None
+        if command == "requeue":
+            print(f"♻️  Requeued {queue.requeue_dead(ids)} dead-lettered posts")
+        else:
+            print(f"🗑️ Purged {queue.purge_dead(ids)} dead-lettered posts")
+
+    else:
+        print("Usage: python -m core.post_queue [status | reclaim | import <queue> <file> | export <queue> <file>\n"
+              "                                  | dead [queue] | requeue <queue> [id ...] | purge <queue> [id ...]]")
@@ -0,0 +1,279 @@
+# rate_limiter.py
+import asyncio
+import threading
+import time
+from datetime import datetime
+
+from config import Config
+from core.accounts import account_config, is_default
+
+# Known posting quotas as (requests, seconds). They seed each platform's
+# bucket; the platform's own rate-limit headers correct it as we go.
+DEFAULT_QUOTAS = {
+    'twitter': (17, 24 * 3600),     # X API free tier: 17 posts per user per 24h
+    'linkedin': (150, 24 * 3600),   # Member shares per day
+    'facebook': (200, 3600),        # Graph API calls per user per hour
+    'devto': (10, 30),              # Article creations per 30 seconds
+    'medium': (10, 3600),           # No published quota; stay conservative
+    'reddit': (60, 60),             # OAuth requests per minute (praw)
+    'mastodon': (300, 3 * 3600),    # Statuses per account per 3 hours
+}
+
+# Header pairs (remaining, reset) that platforms send, most specific first
+RATE_LIMIT_HEADERS = [
+    ('x-user-limit-24hour-remaining', 'x-user-limit-24hour-reset'),  # Twitter daily cap
+    ('x-rate-limit-remaining', 'x-rate-limit-reset'),                # Twitter
+    ('x-ratelimit-remaining', 'x-ratelimit-reset'),                  # Mastodon, Reddit, Dev.to
+    ('ratelimit-remaining', 'ratelimit-reset'),                      # IETF draft
+]
+
+
+def _parse_reset(value, now):
+    """Reset header as epoch seconds: accepts epoch, delta seconds, ISO 8601
+    or an HTTP date (Retry-After: Wed, 21 Oct 2015 07:28:00 GMT)"""
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        try:
+            return datetime.fromisoformat(str(value).replace('Z', '+00:00')).timestamp()
+        except ValueError:
+            pass
+        from email.utils import parsedate_to_datetime  # rare, and slow to import
+        try:
+            return parsedate_to_datetime(str(value)).timestamp()
+        except (TypeError, ValueError):
+            return None
+    # Anything this large is already an epoch timestamp
+    return number if number > 1e9 else now + number
+
+
+def parse_rate_limit_headers(headers):
+    """Most restrictive (remaining, reset_epoch) in the headers, or None"""
+    now = time.time()
+    found = []
+    for remaining_name, reset_name in RATE_LIMIT_HEADERS:
+        remaining = headers.get(remaining_name)
+        reset = headers.get(reset_name)
+        if remaining is None or reset is None:
+            continue
+        try:
+            remaining = int(float(remaining))
+        except ValueError:
+            continue
+        reset_at = _parse_reset(reset, now)
+        if reset_at is not None:
+            found.append((remaining, reset_at))
+
+    retry_after = headers.get('retry-after')
+    if retry_after is not None:
+        reset_at = _parse_reset(retry_after, now)
+        if reset_at is not None:
+            found.append((0, reset_at))
+
+    if not found:
+        return None
+    # Fewest calls left wins; among exhausted limits, the latest reset
+    return min(found, key=lambda pair: (pair[0], -pair[1]))
+
+
+class TokenBucket:
+    """Token bucket for one platform, corrected by the platform's headers
+
+    Tokens refill continuously at capacity/period. When the platform reports
+    how many calls are left in its current window, that count also caps
+    what we send until the window resets.
+    """
+
+    def __init__(self, capacity, period):
+        self.capacity = capacity
+        self.period = period
+        self.tokens = float(capacity)
+        self.server_remaining = None
+        self.server_reset = None
+        self._updated = time.time()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        elapsed = now - self._updated
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.capacity / self.period)
+        self._updated = now
+        if self.server_reset is not None and now >= self.server_reset:
+            self.server_remaining = None
+            self.server_reset = None
+
+    def _wait_time(self, now, amount=1):
+        if self.server_remaining is not None and self.server_remaining < amount:
+            return max(0.0, self.server_reset - now)
+        if self.tokens < amount:
+            return (amount - self.tokens) * self.period / self.capacity
+        return 0.0
+
+    def reserve(self, amount=1):
+        """Take amount tokens if they are free; otherwise return seconds until they are
+
+        More than the capacity is treated as the whole capacity.
+        """
+        with self._lock:
+            amount = min(amount, self.capacity)
+            now = time.time()
+            self._refill(now)
+            wait = self._wait_time(now, amount)
+            if wait > 0:
+                return wait
+            self.tokens -= amount
+            if self.server_remaining is not None:
+                self.server_remaining -= amount
+            return 0.0
+
+    def refund(self, amount):
+        """Give back tokens taken but not used (a negative amount takes more)"""
+        with self._lock:
+            self._refill(time.time())
+            self.tokens = min(self.capacity, self.tokens + amount)
+
+    def update(self, remaining, reset_at):
+        """Apply what the platform reported about its current window"""
+        with self._lock:
+            self._refill(time.time())
+            self.server_remaining = remaining
+            self.server_reset = reset_at
+            self.tokens = min(self.tokens, max(0, remaining))
+
+    def status(self):
+        with self._lock:
+            now = time.time()
+            self._refill(now)
+            return {
+                'available': int(self.tokens),
+                'capacity': self.capacity,
+                'period': self.period,
+                'server_remaining': self.server_remaining,
+                'resets_at': datetime.fromtimestamp(self.server_reset).isoformat() if self.server_reset else None,
+                'wait': round(self._wait_time(now), 1)
+            }
+
+
+class RateLimiter:
+    """One token bucket per platform"""
+
+    def __init__(self, quotas=None, max_wait=None, account=None):
+        self.quotas = dict(DEFAULT_QUOTAS)
+        self.quotas.update(account_config(account).RATE_LIMITS)
+        if quotas:
+            self.quotas.update(quotas)
+        # Longest a caller blocks for a token before the call is deferred
+        self.max_wait = max_wait if max_wait is not None else Config.RATE_LIMIT_MAX_WAIT
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, platform):
+        with self._lock:
+            if platform not in self._buckets:
+                capacity, period = self.quotas.get(platform, (60, 60))
+                self._buckets[platform] = TokenBucket(capacity, period)
+            return self._buckets[platform]
+
+    def reserve(self, platform):
+        """Take a token now, or return the seconds to wait for one"""
+        return self.bucket(platform).reserve()
+
+    def acquire(self, platform, max_wait=None):
+        """Block until a token is free; returns the remaining wait if that would exceed max_wait"""
+        max_wait = self.max_wait if max_wait is None else max_wait
+        while True:
+            wait = self.reserve(platform)
+            if wait == 0:
+                return 0.0
+            if wait > max_wait:
+                return wait
+            time.sleep(wait)
+
+    async def acquire_async(self, platform, max_wait=None):
+        """acquire() for the event loop"""
+        max_wait = self.max_wait if max_wait is None else max_wait
+        while True:
+            wait = self.reserve(platform)
+            if wait == 0:
+                return 0.0
+            if wait > max_wait:
+                return wait
+            await asyncio.sleep(wait)
+
+    def observe_headers(self, platform, headers):
+        """Update a bucket from an HTTP response's rate-limit headers"""
+        parsed = parse_rate_limit_headers(headers)
+        if parsed:
+            self.bucket(platform).update(*parsed)
+
+    def observe(self, platform, remaining, reset_at):
+        """Update a bucket from limits an SDK tracks itself (praw, Mastodon.py)"""
+        if remaining is not None and reset_at:
+            self.bucket(platform).update(int(remaining), float(reset_at))
+
+    def status(self):
+        """Current budget of every platform used so far"""
+        with self._lock:
+            platforms = list(self._buckets)
+        return {platform: self.bucket(platform).status() for platform in platforms}
+
+
+class GroqLimiter:
+    """Groq's two budgets: requests per minute and tokens per minute
+
+    A completion reserves one request and its estimated tokens (prompt
+    plus max_tokens) before it is sent; settle() then corrects the token
+    budget with the usage Groq reports.
+    """
+
+    def __init__(self, requests_per_minute=None, tokens_per_minute=None):
+        self.requests = TokenBucket(requests_per_minute or Config.GROQ_RPM, 60)
+        self.tokens = TokenBucket(tokens_per_minute or Config.GROQ_TPM, 60)
+
+    def acquire(self, tokens):
+        """Block until a request and tokens are free; returns the tokens taken
+
+        An estimate above the per-minute budget takes the whole budget (see
+        TokenBucket.reserve), so pass the returned amount to settle().
+        """
+        tokens = min(tokens, self.tokens.capacity)
+        for bucket, amount in ((self.tokens, tokens), (self.requests, 1)):
+            while True:
+                wait = bucket.reserve(amount)
+                if wait == 0:
+                    break
+                time.sleep(wait)
+        return tokens
+
+    def settle(self, reserved, used):
+        """Correct the token budget once the real usage is known
+
+        reserved is what acquire() returned, not the estimate asked for.
+        """
+        if used is not None:
+            self.tokens.refund(reserved - used)
+
+    def status(self):
+        return {'requests': self.requests.status(), 'tokens': self.tokens.status()}
+
+
+_limiters = {}
+_limiter_lock = threading.Lock()
+_groq_limiter = None
+
+
+def get_rate_limiter(account=None):
+    """The process-wide rate limiter of an account (each account has its own quota)"""
+    key = None if is_default(account) else account
+    with _limiter_lock:
+        if key not in _limiters:
+            _limiters[key] = RateLimiter(account=key)
+    return _limiters[key]
+
+
+def get_groq_limiter():
+    """The process-wide Groq budget, shared by every generator"""
+    global _groq_limiter
+    with _limiter_lock:
+        if _groq_limiter is None:
+            _groq_limiter = GroqLimiter()
+    return _groq_limiter
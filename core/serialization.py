@@ -0,0 +1,131 @@
+# serialization.py
+"""Saving and loading queue and history files
+
+Every file the tools persist (post history, published articles, queue
+exports) goes through save() and load(), so the format is chosen in one
+place:
+
+- json: the standard library, always available
+- orjson: the same JSON, several times faster (pip install orjson)
+- msgpack: compact binary (pip install msgpack)
+
+SERIALIZER picks one; 'auto' (the default) uses orjson when it is
+installed and stdlib JSON otherwise. msgpack is only used when asked for,
+since its files aren't human-readable. load() detects the format from the
+file itself, so switching backends never strands existing files.
+
+dumps()/loads() are the JSON text form, for single records stored
+elsewhere (queue payloads in SQLite, history log lines). They use stdlib
+json: for one small record orjson saves microseconds, while importing it
+costs ~10 ms on every command's startup.
+"""
+import importlib
+import json
+import os
+
+from config import Config
+
+BACKENDS = ('json', 'orjson', 'msgpack')
+
+# First byte of a JSON document (after any whitespace or BOM)
+JSON_START = b'{["0123456789-tfn'
+
+
+_modules = {}
+
+
+def _module(name):
+    """A backend's module, imported on first use (None if not installed)"""
+    if name not in _modules:
+        try:
+            _modules[name] = importlib.import_module(name)
+        except ImportError:
+            _modules[name] = None
+    return _modules[name]
+
+
+def available_backends():
+    """The backends installed here"""
+    return [name for name in BACKENDS if _module(name) is not None]
+
+
+def resolve_backend(name=None):
+    """The backend to write with: name, else SERIALIZER ('auto' = fastest JSON)"""
+    name = (name or Config.SERIALIZER).lower()
+    if name == 'auto':
+        return 'orjson' if _module('orjson') is not None else 'json'
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown serializer {name!r} (choose from {', '.join(BACKENDS)} or auto)")
+    if name not in available_backends():
+        raise ValueError(f"Serializer {name!r} is not installed (pip install {name})")
+    return name
+
+
+def dumps(obj):
+    """obj as compact JSON text"""
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':'))
+
+
+def loads(text):
+    """Parse JSON text (str or bytes)"""
+    return json.loads(text)
+
+
+def encode(obj, backend=None):
+    """obj as bytes in the given backend's format"""
+    backend = resolve_backend(backend)
+    if backend == 'msgpack':
+        return _module('msgpack').packb(obj, use_bin_type=True)
+    if backend == 'orjson':
+        return _module('orjson').dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def detect_format(data):
+    """'json' or 'msgpack', from the first bytes of a file"""
+    stripped = data.lstrip(b'\xef\xbb\xbf \t\r\n')
+    if not stripped or stripped[:1] in JSON_START:
+        return 'json'
+    return 'msgpack'
+
+
+def decode(data):
+    """Parse bytes written by any backend"""
+    if detect_format(data) == 'msgpack':
+        if _module('msgpack') is None:
+            raise ValueError("File is in msgpack format but msgpack is not installed (pip install msgpack)")
+        return _module('msgpack').unpackb(data, raw=False)
+    data = data.lstrip(b'\xef\xbb\xbf')
+    if not data.strip():
+        return None
+    orjson = _module('orjson')
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def save(path, obj, backend=None):
+    """Write obj to path atomically (temp file + rename)"""
+    import tempfile
+    data = encode(obj, backend)
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            # On disk before the rename, so a crash leaves the old or the new file
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def load(path, default=None):
+    """Read a file written by any backend; default if it doesn't exist"""
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except FileNotFoundError:
+        return default
+    return decode(data)
@@ -1,56 +1,163 @@
 # main.py
-from social_poster import SocialMediaPoster
-import json
+from config import Config
+from core.social_poster import SocialMediaPoster
+from core import delivery
+from core.post_queue import get_queue
+from core.renderer import PostRenderer
 import sys
 
 def post_from_queue():
     """Post the next item from content queue"""
-    poster = SocialMediaPoster()
-    
-    # Load content queue
-    try:
-        with open('content_queue.json', 'r') as f:
-            posts = json.load(f)
-    except FileNotFoundError:
-        print("❌ content_queue.json not found!")
-        return
-    except json.JSONDecodeError:
-        print("❌ content_queue.json is not valid JSON!")
-        return
+    queue = get_queue('content')
     
-    if not posts:
+    if not len(queue):
         print("📭 No posts in queue!")
         return
     
-    # Get the first post
-    next_post = posts[0]
+    poster = SocialMediaPoster()
+    
+    # Get the first post with a platform due (failed platforms back off)
+    platforms = poster.get_enabled_platforms()
+    entry = queue.claim(lambda post: delivery.due_platforms(post, platforms))
+    if entry is None:
+        print("⏳ No post is due yet (waiting to retry failed platforms)")
+        return
+    item_id, next_post = entry
     
     print(f"📤 Posting: {next_post['title']}")
     
-    # Post to all platforms
-    results = poster.post_to_all(
-        title=next_post['title'],
-        content=next_post['content'],
-        url=next_post['url']
-    )
+    # Post only to platforms that haven't succeeded yet
+    try:
+        results = poster.post_to_all(
+            title=next_post['title'],
+            content=next_post['content'],
+            url=next_post['url'],
+            platforms=delivery.due_platforms(next_post, platforms)
+        )
+    except Exception as e:
+        # A post that breaks the poster backs off instead of blocking the queue
+        queue.nack(item_id, error=str(e))
+        raise
     
     # Show results
-    all_success = True
     for platform, result in results.items():
         if result['success']:
             print(f"✅ {platform}: Posted successfully!")
         else:
             print(f"❌ {platform}: {result['error']}")
-            all_success = False
-    
-    # If posted successfully, remove from queue
-    if all_success:
-        posts.pop(0)
-        with open('content_queue.json', 'w') as f:
-            json.dump(posts, f, indent=2)
-        print(f"✅ Removed from queue. {len(posts)} posts remaining.")
+    
+    delivery.record_results(next_post, results)
+    
+    # Remove once every platform succeeded or was given up on
+    outcome = delivery.settle(queue, item_id, next_post, results, platforms)
+    if outcome == 'done':
+        print(f"✅ Removed from queue. {len(queue)} posts remaining.")
+    elif outcome == 'dead':
+        print("💀 Post failed too many times, moved to dead letters (python -m core.post_queue dead)")
     else:
-        print("⚠️  Post kept in queue due to errors.")
+        print(f"⚠️  Post kept in queue for retry: {delivery.describe(next_post, platforms)}")
+
+def drain_queue(concurrency=None):
+    """Post every item in the content queue as one batch"""
+    queue = get_queue('content')
+    
+    if not len(queue):
+        print("📭 No posts in queue!")
+        return
+    
+    poster = SocialMediaPoster()
+    
+    # Claim every item with platforms due; each goes only to those platforms.
+    # The lease covers every post in the batch running into its timeout.
+    platforms = poster.get_enabled_platforms()
+    concurrency = concurrency or Config.POST_MANY_CONCURRENCY
+    lease = Config.QUEUE_LEASE_SECONDS + poster.engine.platform_timeout * len(queue) / concurrency
+    claimed = queue.claim_many(
+        predicate=lambda post: delivery.due_platforms(post, platforms),
+        lease_seconds=lease
+    )
+    batch = [(item_id, post, dict(post, platforms=delivery.due_platforms(post, platforms)))
+             for item_id, post in claimed]
+    
+    if not batch:
+        print("⏳ No post is due yet (waiting to retry failed platforms)")
+        return
+    
+    print(f"📤 Draining {len(batch)} posts...")
+    
+    done = 0
+    for i, results in poster.post_many([request for _, _, request in batch], concurrency=concurrency):
+        item_id, post, _ = batch[i]
+        delivery.record_results(post, results)
+        # Saved as each post finishes, so an interrupted drain loses nothing
+        if delivery.settle(queue, item_id, post, results, platforms) == 'done':
+            done += 1
+        failed = [p for p, r in results.items() if not r['success']]
+        if failed:
+            print(f"❌ {post['title']}: failed on {', '.join(failed)}")
+        else:
+            print(f"✅ {post['title']}: posted")
+    
+    print(f"📋 Done with {done}, {len(queue)} posts remaining.")
+
+def stream_queue():
+    """Move the due posts of the content queue into the post log, then let each platform catch up
+
+    Every platform posts at its own pace; entries a slow or rate-limited
+    platform hasn't reached yet stay in the log for the next run.
+    """
+    # Imported here to keep the other commands' startup short
+    from datetime import datetime
+    from core.async_poster import run_sync
+    from core.history_log import get_history_log
+    from core.post_log import drain, get_post_log
+    
+    queue = get_queue('content')
+    log = get_post_log('content')
+    poster = SocialMediaPoster()
+    platforms = poster.get_enabled_platforms()
+    history = get_history_log()
+    
+    # Only posts that are due; platforms an item already reached (partly
+    # posted items) are left out. Moved in one transaction, so a crash
+    # can't leave a post both queued and in the log
+    claimed = queue.claim_due()
+    if claimed:
+        moved = log.move_from(queue, claimed, lambda post: dict(
+            post, platforms=delivery.outstanding_platforms(post, platforms)))
+        print(f"📥 Moved {len(moved)} posts into the post log")
+    
+    def report(platform, post, result):
+        if result['success']:
+            print(f"✅ {platform}: {post.get('title', '')[:50]}")
+        else:
+            print(f"❌ {platform}: {post.get('title', '')[:50]} - {result['error']}")
+        history.append({'timestamp': datetime.now().isoformat(), 'post': post,
+                        'results': {platform: result}})
+    
+    posted = run_sync(drain(log, poster.engine, platforms, on_result=report))
+    depths = log.depths(platforms)
+    for platform in platforms:
+        print(f"📋 {platform}: posted {posted[platform]}, {depths[platform]} behind")
+
+def show_log_depths():
+    """How far behind each platform is in the post log"""
+    from core.post_log import get_post_log
+    
+    log = get_post_log('content')
+    platforms = SocialMediaPoster().get_enabled_platforms()
+    print(f"📜 {len(log)} posts in the log")
+    for platform, depth in log.depths(platforms).items():
+        print(f"   {platform}: {depth} behind")
+
+def check_queue():
+    """Pre-render every queued post and list the ones that get shortened"""
+    posts = get_queue('content').items()
+    
+    problems = PostRenderer().check_many(posts, ['twitter', 'mastodon', 'linkedin'])
+    for index, platform, payload in problems:
+        print(f"✂️  {posts[index]['title'][:50]} → {platform}: shortened to {payload['length']}/{payload['limit']}")
+    print(f"📋 Checked {len(posts)} posts, {len(problems)} payloads shortened.")
 
 def post_single(title, content, url):
     """Post a single item directly"""
@@ -71,6 +178,18 @@ def main():
     if len(sys.argv) > 1:
         if sys.argv[1] == "queue":
             post_from_queue()
+        elif sys.argv[1] == "drain":
+            # Post the whole queue, e.g. after an outage
+            concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else None
+            drain_queue(concurrency)
+        elif sys.argv[1] == "stream":
+            # Each platform posts the queue at its own pace
+            stream_queue()
+        elif sys.argv[1] == "depth":
+            show_log_depths()
+        elif sys.argv[1] == "check":
+            # Preview how queued posts fit each platform's limits
+            check_queue()
         elif sys.argv[1] == "test":
             # Test post
             post_single(
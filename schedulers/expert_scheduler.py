@@ -1,39 +1,50 @@
 # expert_scheduler.py
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import schedule
 import time
 import subprocess
 from datetime import datetime
+from config import Config
+from core.post_expert_content import post_expert_content
+from core.post_queue import get_queue
 
-def generate_daily_expert_content():
-    """Generate expert content for the day"""
-    print(f"\n🌅 {datetime.now().strftime('%Y-%m-%d %H:%M')} - Generating daily expert content...")
-    subprocess.run(["python", "expert_content_generator.py"])
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Longest sleep between checks, so new posts from other processes are noticed
+MAX_SLEEP = 300
 
-def post_scheduled_content():
-    """Check and post any scheduled content"""
-    subprocess.run(["python", "post_expert_content.py"])
+def generate_daily_expert_content(account=None):
+    """Generate expert content for the day, scheduled at the posting times"""
+    print(f"\n🌅 {datetime.now().strftime('%Y-%m-%d %H:%M')} - Generating daily expert content...")
+    command = [sys.executable, os.path.join(ROOT, "core", "expert_content_generator.py"), "schedule"]
+    subprocess.run(command + ([account] if account else []))
 
-def run_expert_scheduler():
-    """Run the expert content scheduler"""
-    print("🤖 Expert Content Scheduler Started")
+def run_expert_scheduler(account=None):
+    """Run the expert content scheduler (for one account's expert queue)"""
+    print("🤖 Expert Content Scheduler Started" + (f" for {account}" if account else ""))
     print("📅 Schedule:")
     print("  - Daily content generation: 7:00 AM")
-    print("  - Posting times: 9:00, 10:30, 11:45, 14:00, 15:30, 17:00, 18:30")
+    print(f"  - Posting times: {', '.join(Config.EXPERT_POST_TIMES)}")
     
     # Generate content every morning
-    schedule.every().day.at("07:00").do(generate_daily_expert_content)
-    
-    # Check for posts throughout the day
-    post_times = ["09:00", "10:30", "11:45", "14:00", "15:30", "17:00", "18:30"]
-    for time_slot in post_times:
-        schedule.every().day.at(time_slot).do(post_scheduled_content)
-    
-    # Also check every 30 minutes as backup
-    schedule.every(30).minutes.do(post_scheduled_content)
+    schedule.every().day.at("07:00").do(generate_daily_expert_content, account)
     
+    queue = get_queue('expert', account)
     while True:
         schedule.run_pending()
-        time.sleep(60)  # Check every minute
+        
+        # Post whatever is due, then sleep until the next post or job
+        if queue.next_due_in() == 0:
+            post_expert_content(account)
+        
+        waits = [MAX_SLEEP, schedule.idle_seconds()]
+        next_due = queue.next_due_in()
+        if next_due is not None:
+            waits.append(next_due)
+        time.sleep(max(1, min(w for w in waits if w is not None)))
 
 if __name__ == "__main__":
-    run_expert_scheduler()
\ No newline at end of file
+    # Optional account name: python schedulers/expert_scheduler.py acme
+    run_expert_scheduler(sys.argv[1] if len(sys.argv) > 1 else None)
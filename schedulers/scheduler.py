@@ -1,46 +1,51 @@
 # scheduler.py
 import schedule
 import time
-import json
 from datetime import datetime
 from core.social_poster import SocialMediaPoster
+from core import delivery
+from core.post_queue import get_queue
+from core.history_log import get_history_log
 
 class ContentScheduler:
-    def __init__(self, queue_file='content_queue.json'):
-        self.queue_file = queue_file
-        self.poster = SocialMediaPoster()
+    def __init__(self, queue_name='content', account=None):
+        # Each account posts from its own queue partition with its own credentials
+        self.account = account
+        self.queue = get_queue(queue_name, account)
+        self.poster = SocialMediaPoster(account=account)
+        self.history = get_history_log(account)
         
     def load_queue(self):
-        """Load posts from queue file"""
-        try:
-            with open(self.queue_file, 'r') as f:
-                return json.load(f)
-        except:
-            return []
-    
-    def save_queue(self, posts):
-        """Save remaining posts"""
-        with open(self.queue_file, 'w') as f:
-            json.dump(posts, f, indent=2)
+        """Posts waiting in the queue, oldest first"""
+        return self.queue.items()
     
     def post_next(self):
-        """Post the next item in queue"""
-        posts = self.load_queue()
-        
-        if not posts:
+        """Post the next item in queue; False if nothing was due"""
+        if not len(self.queue):
             print("📭 No posts in queue")
-            return
+            return False
         
-        # Get next post
-        next_post = posts.pop(0)
+        # Get next post with a platform due (failed platforms back off)
+        platforms = self.poster.get_enabled_platforms()
+        entry = self.queue.claim(lambda post: delivery.due_platforms(post, platforms))
+        if entry is None:
+            print("⏳ No post is due yet (waiting to retry failed platforms)")
+            return False
+        item_id, next_post = entry
         print(f"\n📤 Posting: {next_post['title']}")
         
-        # Post to all platforms
-        results = self.poster.post_to_all(
-            title=next_post['title'],
-            content=next_post['content'],
-            url=next_post['url']
-        )
+        # Post only to platforms that haven't succeeded yet
+        try:
+            results = self.poster.post_to_all(
+                title=next_post['title'],
+                content=next_post['content'],
+                url=next_post['url'],
+                platforms=delivery.due_platforms(next_post, platforms)
+            )
+        except Exception as e:
+            # A post that breaks the poster backs off instead of blocking the queue
+            self.queue.nack(item_id, error=str(e))
+            raise
         
         # Log results
         for platform, result in results.items():
@@ -49,11 +54,15 @@ class ContentScheduler:
             else:
                 print(f"❌ {platform}: {result['error']}")
         
-        # Save remaining posts
-        self.save_queue(posts)
+        delivery.record_results(next_post, results)
+        
+        # Remove once every platform succeeded or was given up on;
+        # repeated failures back off and end up in the dead letters
+        delivery.settle(self.queue, item_id, next_post, results, platforms)
         
         # Log to history
         self.log_post(next_post, results)
+        return True
     
     def log_post(self, post, results):
         """Keep history of posted content"""
@@ -62,18 +71,11 @@ class ContentScheduler:
             'post': post,
             'results': results
         }
+        if self.account:
+            history['account'] = self.account
         
-        # Append to history file
-        try:
-            with open('post_history.json', 'r') as f:
-                history_list = json.load(f)
-        except:
-            history_list = []
-        
-        history_list.append(history)
-        
-        with open('post_history.json', 'w') as f:
-            json.dump(history_list, f, indent=2)
+        # Append to history log (one line, the file is never rewritten)
+        self.history.append(history)
 
 def run_scheduler():
     """Main scheduler function"""
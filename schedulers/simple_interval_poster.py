@@ -1,68 +1,48 @@
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-import tweepy
-import requests
 from datetime import datetime
-import json
 from config import Config  # Now it can find config.py in root
 import time
 from core.social_poster import SocialMediaPoster
+from core import delivery
+from core.post_queue import get_queue
 
-def load_expert_queue():
-    """Load posts from expert queue"""
-    # Try multiple locations
-    possible_paths = [
-        'expert_queue.json',
-        'core/expert_queue.json',
-        os.path.join(os.path.dirname(__file__), '..', 'core', 'expert_queue.json')
-    ]
-    
-    for path in possible_paths:
-        if os.path.exists(path):
-            try:
-                with open(path, 'r') as f:
-                    queue = json.load(f)
-                    print(f"✅ Loaded {len(queue)} posts from {path}")
-                    return queue
-            except Exception as e:
-                print(f"❌ Error reading {path}: {e}")
-    
-        print("❌ No expert_queue.json found in any expected location")
-    return []
-
-def save_expert_queue(queue):
-    """Save updated queue"""
-    with open('expert_queue.json', 'w') as f:
-        json.dump(queue, f, indent=2)
-
-def post_next_expert_content():
-    """Post the next item from expert queue"""
-    queue = load_expert_queue()
-
-    print(f"DEBUG: Queue loaded with {len(queue)} items")  # Add this
-    if queue and len(queue) > 0:
-        print(f"DEBUG: First item: {queue[0]['content'][:50]}...")  # Add this
+def post_next_expert_content(account=None):
+    """Post the next item from an account's expert queue"""
+    queue = get_queue('expert', account)
         
-    if not queue:
+    if not len(queue):
         print(f"📭 {datetime.now().strftime('%H:%M')} - No posts in expert queue")
         return False
     
-    # Get next post (ignore scheduled times)
-    next_post = queue.pop(0)
+    # Post it
+    poster = SocialMediaPoster(account=account)
+    platforms = poster.get_enabled_platforms()
+    
+    # Get next post with a platform due (ignore scheduled times; failed
+    # platforms wait out their backoff)
+    entry = queue.claim(lambda post: delivery.due_platforms(post, platforms))
+    if entry is None:
+        print(f"⏳ {datetime.now().strftime('%H:%M')} - No post is due yet (waiting to retry failed platforms)")
+        return False
+    item_id, next_post = entry
     
     print(f"\n📤 {datetime.now().strftime('%H:%M')} - Posting: {next_post['content'][:60]}...")
     
-    # Post it
-    poster = SocialMediaPoster()
-    
     # Only truncate for Twitter and Mastodon, pass full content for others
     content = next_post['content']
-    results = poster.post_to_all(
-        title="",
-        content=content,
-        url=""
-    )
+    try:
+        results = poster.post_to_all(
+            title="",
+            content=content,
+            url="",
+            platforms=delivery.due_platforms(next_post, platforms)
+        )
+    except Exception as e:
+        # A post that breaks the poster backs off; the next one goes out meanwhile
+        queue.nack(item_id, error=str(e))
+        raise
     
     # Show results
     success = False
@@ -73,21 +53,23 @@ def post_next_expert_content():
         else:
             print(f"❌ {platform}: {result['error']}")
     
-    if success:
-        # Save updated queue
-        save_expert_queue(queue)
+    delivery.record_results(next_post, results)
+    
+    # Failures back off instead of holding up the queue; a post that keeps
+    # failing moves to the dead letters
+    outcome = delivery.settle(queue, item_id, next_post, results, platforms)
+    if outcome == 'done':
         print(f"📋 {len(queue)} posts remaining")
+    elif outcome == 'dead':
+        print("💀 Post failed too many times, moved to dead letters (python -m core.post_queue dead)")
     else:
-        # Put post back if failed
-        queue.insert(0, next_post)
-        save_expert_queue(queue)
-        print("⚠️ Post returned to queue due to errors")
+        print(f"⚠️ Post kept for retry: {delivery.describe(next_post, platforms)}")
     
     return success
 
-def run_interval_poster(interval_minutes=30):
+def run_interval_poster(interval_minutes=30, account=None):
     """Post every X minutes"""
-    print(f"🤖 Interval Poster Started")
+    print(f"🤖 Interval Poster Started" + (f" for {account}" if account else ""))
     print(f"⏰ Will post every {interval_minutes} minutes")
     print(f"📅 Starting at: {datetime.now().strftime('%Y-%m-%d %H:%M')}")
     print("Press Ctrl+C to stop\n")
@@ -95,7 +77,7 @@ def run_interval_poster(interval_minutes=30):
     while True:
         try:
             # Post content
-            post_next_expert_content()
+            post_next_expert_content(account)
             
             # Wait for next interval
             print(f"\n💤 Sleeping {interval_minutes} minutes until next post...")
@@ -121,4 +103,7 @@ if __name__ == "__main__":
     else:
         interval = 30
     
-    run_interval_poster(interval_minutes=interval)
\ No newline at end of file
+    # Optional account name after the interval
+    account = sys.argv[2] if len(sys.argv) > 2 else None
+    
+    run_interval_poster(interval_minutes=interval, account=account)
\ No newline at end of file
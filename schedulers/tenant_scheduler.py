@@ -0,0 +1,115 @@
+# tenant_scheduler.py
+"""One process posting for every account
+
+Each account (see core/accounts.py) has its own content queue partition,
+credentials and rate-limit budgets. At each posting time every account
+with queued posts gets one post. The posts run on a shared pool of
+TENANT_WORKERS threads in round-robin order, starting one account later
+each round, so a busy account never holds up the others.
+
+    python schedulers/tenant_scheduler.py           # run on the daily schedule
+    python schedulers/tenant_scheduler.py round     # post one round now
+    python schedulers/tenant_scheduler.py status    # queued posts per account
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import schedule
+import time
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from config import Config
+from core.accounts import account_names, is_default
+from schedulers.scheduler import ContentScheduler
+
+POSTING_TIMES = ["09:00", "13:00", "18:00"]
+
+class TenantScheduler:
+    def __init__(self, accounts=None, workers=None, queue_name='content'):
+        accounts = accounts or account_names()
+        self.schedulers = {
+            account: ContentScheduler(queue_name, None if is_default(account) else account)
+            for account in accounts
+        }
+        self.rotation = deque(self.schedulers)
+        self.workers = workers or Config.TENANT_WORKERS
+        self.pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='tenant')
+    
+    def ready_accounts(self):
+        """Accounts with credentials and posts waiting, in this round's order"""
+        return [account for account in self.rotation
+                if self.schedulers[account].poster.get_enabled_platforms()
+                and len(self.schedulers[account].queue)]
+    
+    def _post(self, account):
+        try:
+            return self.schedulers[account].post_next()
+        except Exception as e:
+            print(f"❌ {account}: {e}")
+            return False
+    
+    def run_round(self, posts_per_account=1):
+        """Post up to posts_per_account items for every account; returns {account: posted}"""
+        accounts = self.ready_accounts()
+        # Next round starts with the next account
+        self.rotation.rotate(-1)
+        
+        # Interleaved (a, b, c, a, b, c, ...): the pool runs jobs in order
+        jobs = [account for _ in range(posts_per_account) for account in accounts]
+        futures = [(account, self.pool.submit(self._post, account)) for account in jobs]
+        
+        posted = Counter()
+        for account, future in futures:
+            if future.result():
+                posted[account] += 1
+        
+        for account in accounts:
+            print(f"👤 {account}: posted {posted[account]}, {len(self.schedulers[account].queue)} queued")
+        return posted
+    
+    def status(self):
+        """{account: (queued posts, enabled platforms)}"""
+        return {account: (len(scheduler.queue), scheduler.poster.get_enabled_platforms())
+                for account, scheduler in self.schedulers.items()}
+    
+    def close(self):
+        self.pool.shutdown(wait=True)
+
+def run_tenant_scheduler():
+    """Post for every account at the posting times"""
+    scheduler = TenantScheduler()
+    
+    for posting_time in POSTING_TIMES:
+        schedule.every().day.at(posting_time).do(scheduler.run_round)
+    
+    print(f"📅 Tenant scheduler started for {len(scheduler.schedulers)} accounts "
+          f"({scheduler.workers} workers)")
+    print(f"Posting times: {', '.join(POSTING_TIMES)}")
+    print("Press Ctrl+C to stop\n")
+    
+    try:
+        while True:
+            schedule.run_pending()
+            time.sleep(60)  # Check every minute
+    finally:
+        scheduler.close()
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else "run"
+    
+    if command == "round":
+        scheduler = TenantScheduler()
+        scheduler.run_round()
+        scheduler.close()
+    
+    elif command == "status":
+        scheduler = TenantScheduler()
+        for account, (queued, platforms) in scheduler.status().items():
+            print(f"👤 {account}: {queued} queued, platforms: {', '.join(platforms) or 'none configured'}")
+        scheduler.close()
+    
+    elif command == "run":
+        run_tenant_scheduler()
+    
+    else:
+        print("Usage: python schedulers/tenant_scheduler.py [run | round | status]")
@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+"""Benchmark: one request per post versus several posts per request
+
+Generates the same planned posts twice against the Groq API: one chat
+completion per post (generate_expert_post), then batch_size posts per
+completion with a JSON reply (generate_batch). Reports requests, prompt
+and completion tokens, and wall time per post for each.
+
+Runs in a temporary directory, so the real post history is neither read
+nor written. Needs GROQ_API_KEY.
+
+Usage: python scripts/bench_batch_generation.py [posts] [batch_size]
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import tempfile
+import time
+
+from core.expert_content_generator import ExpertContentGenerator
+
+POSTS = 10
+BATCH_SIZE = 5
+
+
+def run(label, posts, generate):
+    """Generate posts in a fresh history; returns the report line"""
+    with tempfile.TemporaryDirectory() as directory:
+        cwd = os.getcwd()
+        os.chdir(directory)
+        try:
+            generator = ExpertContentGenerator()
+            plan = generator.plan_assignments(posts)
+            start = time.perf_counter()
+            made = [post for post in generate(generator, plan) if post]
+            elapsed = time.perf_counter() - start
+        finally:
+            os.chdir(cwd)
+
+    usage = generator.usage
+    count = max(len(made), 1)
+    return (f"{label:>12}  {len(made):>5}  {usage['requests']:>8}  "
+            f"{usage['prompt_tokens'] / count:>13.0f}  {usage['completion_tokens'] / count:>13.0f}  "
+            f"{elapsed / count:>10.2f}s")
+
+
+def main():
+    if not os.environ.get("GROQ_API_KEY"):
+        print("❌ GROQ_API_KEY not found in environment")
+        sys.exit(1)
+
+    posts = int(sys.argv[1]) if len(sys.argv) > 1 else POSTS
+    batch_size = int(sys.argv[2]) if len(sys.argv) > 2 else BATCH_SIZE
+
+    print(f"🏁 {posts} posts, one at a time, no concurrency\n")
+    print(f"{'path':>12}  {'posts':>5}  {'requests':>8}  {'prompt tok/post':>13}  "
+          f"{'reply tok/post':>13}  {'time/post':>11}")
+
+    print(run("per post", posts,
+              lambda generator, plan: [generator.generate_expert_post(*pair) for pair in plan]))
+    print(run(f"batch of {batch_size}", posts,
+              lambda generator, plan: [post for start in range(0, len(plan), batch_size)
+                                       for post in generator.generate_batch(plan[start:start + batch_size])]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python
+"""Benchmark: bare per-request connections vs HttpSessionPool
+
+Drains a queue of posts back to back against four local HTTPS servers (one
+per REST platform: LinkedIn, Facebook, Dev.to, Medium) and reports wall time
+and how many TCP+TLS handshakes each approach paid for.
+
+Usage: python scripts/bench_http_pool.py [posts]
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+import ssl
+import subprocess
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+
+from core.http_pool import HttpSessionPool
+
+PLATFORMS = ['linkedin', 'facebook', 'devto', 'medium']
+
+
+class CountingHandler(BaseHTTPRequestHandler):
+    """Answers every POST with 201; one handler instance per connection"""
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        self.rfile.read(length)
+        body = b'{"id": "1"}'
+        self.send_response(201)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_certificate(directory):
+    """Self-signed certificate for localhost, or None without openssl"""
+    cert = os.path.join(directory, 'cert.pem')
+    key = os.path.join(directory, 'key.pem')
+    try:
+        subprocess.run(
+            ['openssl', 'req', '-x509', '-newkey', 'rsa:2048', '-nodes',
+             '-keyout', key, '-out', cert, '-days', '1', '-subj', '/CN=localhost'],
+            check=True, capture_output=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return cert, key
+
+
+def start_servers(certificate):
+    servers = []
+    for _ in PLATFORMS:
+        server = ThreadingHTTPServer(('127.0.0.1', 0), CountingHandler)
+        server.daemon_threads = True
+        server.lock = threading.Lock()
+        server.connections = 0
+        if certificate:
+            context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            context.load_cert_chain(*certificate)
+            server.socket = context.wrap_socket(server.socket, server_side=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+    return servers
+
+
+async def drain_bare(urls, posts):
+    """What bare requests.post did: a fresh connection for every call"""
+    for _ in range(posts):
+        for url in urls:
+            async with httpx.AsyncClient(verify=False) as client:
+                response = await client.post(url, json={'text': 'post'})
+                assert response.status_code == 201
+
+
+async def drain_pooled(urls, posts):
+    """Same queue through one HttpSessionPool"""
+    pool = HttpSessionPool(verify=False)
+    try:
+        for _ in range(posts):
+            for url in urls:
+                response = await pool.post(url, json={'text': 'post'})
+                assert response.status_code == 201
+    finally:
+        await pool.aclose()
+
+
+def run(name, drain, servers, urls, posts):
+    for server in servers:
+        server.connections = 0
+    start = time.perf_counter()
+    asyncio.run(drain(urls, posts))
+    elapsed = time.perf_counter() - start
+    handshakes = sum(server.connections for server in servers)
+    requests_sent = posts * len(urls)
+    print(f"{name:<8} {elapsed:8.3f}s  {elapsed / requests_sent * 1000:7.2f} ms/request  "
+          f"{handshakes:5d} handshakes")
+    return elapsed, handshakes
+
+
+def main():
+    posts = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+
+    with tempfile.TemporaryDirectory() as directory:
+        certificate = make_certificate(directory)
+        servers = start_servers(certificate)
+        scheme = 'https' if certificate else 'http'
+        urls = [f"{scheme}://localhost:{server.server_address[1]}/{platform}"
+                for server, platform in zip(servers, PLATFORMS)]
+
+        print(f"📊 Draining {posts} posts x {len(urls)} REST platforms over {scheme.upper()}\n")
+        bare_time, bare_handshakes = run('bare', drain_bare, servers, urls, posts)
+        pooled_time, pooled_handshakes = run('pooled', drain_pooled, servers, urls, posts)
+
+        print(f"\n✅ Pooled sessions saved {bare_handshakes - pooled_handshakes} handshakes "
+              f"and ran {bare_time / pooled_time:.1f}x faster")
+        if not certificate:
+            print("ℹ️  openssl not found - measured TCP only, TLS savings not included")
+
+        for server in servers:
+            server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+"""Benchmark: near-duplicate lookups against a large post history
+
+Indexes synthetic posts (35 words drawn from a Zipf-distributed
+vocabulary) at 1k, 10k and 100k posts, then looks up unrelated posts and
+reworded copies of indexed posts (a few words replaced). Reports build
+time, lookup latency (p50/p99) and how many rewordings were caught versus
+how many unrelated posts were wrongly flagged.
+
+Usage: python scripts/bench_near_duplicate.py [sizes...]
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import random
+import time
+
+from config import Config
+from core.near_duplicate import NearDuplicateIndex, shingles
+
+SIZES = [1_000, 10_000, 100_000]
+LOOKUPS = 1_000
+WORDS_PER_POST = 35
+VOCABULARY = [f"word{n}" for n in range(30_000)]
+WEIGHTS = [1 / (n + 1) for n in range(len(VOCABULARY))]
+
+
+def make_post(rng):
+    return rng.choices(VOCABULARY, WEIGHTS, k=WORDS_PER_POST)
+
+
+def reword(rng, words, replaced):
+    words = list(words)
+    for position in rng.sample(range(len(words)), replaced):
+        words[position] = rng.choices(VOCABULARY, WEIGHTS)[0]
+    return words
+
+
+def jaccard(first, second):
+    first, second = shingles(first, Config.NEAR_DUPLICATE_SHINGLE), shingles(second, Config.NEAR_DUPLICATE_SHINGLE)
+    return len(first & second) / len(first | second)
+
+
+def percentile(times, fraction):
+    return sorted(times)[int(fraction * (len(times) - 1))]
+
+
+def timed_lookups(index, texts):
+    times, hits = [], 0
+    for text in texts:
+        start = time.perf_counter()
+        match = index.find(text)
+        times.append(time.perf_counter() - start)
+        hits += match is not None
+    return times, hits
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or SIZES
+    index = NearDuplicateIndex()
+    print(f"🏁 Threshold {index.threshold}, {index.length} values per signature "
+          f"({index.bands} bands x {index.rows} rows), {index.shingle_size}-word shingles")
+
+    for size in sizes:
+        rng = random.Random(size)
+        posts = [make_post(rng) for _ in range(size)]
+        index = NearDuplicateIndex()
+        start = time.perf_counter()
+        for number, words in enumerate(posts):
+            index.add(number, ' '.join(words))
+        build = time.perf_counter() - start
+
+        unrelated = [' '.join(make_post(rng)) for _ in range(LOOKUPS)]
+        originals = [' '.join(words) for words in rng.sample(posts, LOOKUPS)]
+        reworded = [' '.join(reword(rng, text.split(), 4)) for text in originals]
+        above = sum(jaccard(a, b) >= index.threshold for a, b in zip(originals, reworded))
+
+        miss_times, false_hits = timed_lookups(index, unrelated)
+        hit_times, caught = timed_lookups(index, reworded)
+        times = miss_times + hit_times
+
+        print(f"\n📦 {size:,} posts indexed in {build:.1f}s")
+        print(f"   lookup p50 {percentile(times, 0.5) * 1e6:.0f}µs, p99 {percentile(times, 0.99) * 1e6:.0f}µs")
+        print(f"   rewordings caught: {caught}/{LOOKUPS} ({above} at or above the threshold)")
+        print(f"   unrelated flagged: {false_hits}/{LOOKUPS}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+"""Benchmark: draining one queue with 1, 2, 4 and 8 worker processes
+
+Each worker claims an item, "posts" it (sleeps for the simulated posting
+time), and acks it, until the queue is empty. Reports throughput and checks
+that every item was posted exactly once. One worker is killed mid-run in
+the crash round to show its claimed item is reclaimed after the lease runs
+out.
+
+Usage: python scripts/bench_queue_workers.py [items] [post_ms]
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import multiprocessing
+import tempfile
+import time
+from collections import Counter
+
+from core.post_queue import PostQueue
+
+WORKER_COUNTS = [1, 2, 4, 8]
+
+
+def worker(db_path, post_seconds, lease_seconds, results, crash_after=None):
+    queue = PostQueue('bench', path=db_path, lease_seconds=lease_seconds)
+    posted = 0
+    while True:
+        claim = queue.claim()
+        if claim is None:
+            # Nothing free: done unless a dead worker's lease is about to expire
+            if not queue.leased() and not len(queue):
+                break
+            time.sleep(lease_seconds / 10)
+            continue
+        item_id, item = claim
+        if crash_after is not None and posted == crash_after:
+            os._exit(1)  # die holding the lease
+        time.sleep(post_seconds)
+        if queue.ack(item_id):
+            results.put(item['n'])
+            posted += 1
+
+
+def run(workers, items, post_seconds, lease_seconds=2.0, crash=False):
+    with tempfile.TemporaryDirectory() as directory:
+        db_path = os.path.join(directory, 'queue.db')
+        PostQueue('bench', path=db_path).put_many([{'n': n} for n in range(items)])
+
+        # SimpleQueue writes synchronously, so a killed worker's results survive
+        results = multiprocessing.SimpleQueue()
+        processes = [
+            multiprocessing.Process(target=worker, args=(
+                db_path, post_seconds, lease_seconds, results,
+                5 if crash and i == 0 else None))
+            for i in range(workers)
+        ]
+        start = time.perf_counter()
+        for process in processes:
+            process.start()
+
+        posted = []
+        while len(posted) < items:
+            posted.append(results.get())
+        elapsed = time.perf_counter() - start
+        for process in processes:
+            process.join()
+
+    counts = Counter(posted)
+    duplicates = sum(1 for count in counts.values() if count > 1)
+    missing = items - len(counts)
+    return elapsed, duplicates, missing
+
+
+def main():
+    items = int(sys.argv[1]) if len(sys.argv) > 1 else 400
+    post_ms = float(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    print(f"🏁 {items} items, {post_ms:g} ms per post\n")
+    print(f"{'workers':>7}  {'time':>7}  {'posts/s':>8}  {'speedup':>7}  duplicates  missing")
+
+    baseline = None
+    failed = False
+    for workers in WORKER_COUNTS:
+        elapsed, duplicates, missing = run(workers, items, post_ms / 1000)
+        rate = items / elapsed
+        baseline = baseline or rate
+        failed |= bool(duplicates or missing)
+        print(f"{workers:>7}  {elapsed:6.2f}s  {rate:8.1f}  {rate / baseline:6.1f}x  "
+              f"{duplicates:>10}  {missing:>7}")
+
+    elapsed, duplicates, missing = run(4, items, post_ms / 1000, crash=True)
+    failed |= bool(duplicates or missing)
+    print(f"\n💥 4 workers, one killed mid-run: {elapsed:.2f}s, "
+          f"{duplicates} duplicates, {missing} missing (its item was reclaimed)")
+
+    if failed:
+        print("\n❌ Items were posted twice or lost")
+        sys.exit(1)
+    print("\n✅ Every item posted exactly once")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+"""Benchmark: saving and loading history files with each serializer
+
+Writes post-history-shaped records at 1k, 10k and 100k records with the
+old json.dump(indent=2) and with every installed backend of
+core.serialization, and reports save time, load time and file size.
+
+Usage: python scripts/bench_serializers.py [sizes...]
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from core import serialization
+
+SIZES = [1_000, 10_000, 100_000]
+REPEATS = 3
+
+TYPES = ['breakthrough', 'myth_buster', 'case_study', 'paper_insight', 'question', 'thought_leader']
+TOPICS = ['transformers', 'MLOps', 'AI ethics', 'federated learning', 'AI efficiency']
+
+
+def make_records(count):
+    """Records shaped like the post history (post, per-platform results)"""
+    rng = random.Random(count)
+    start = datetime(2025, 1, 1)
+    records = []
+    for n in range(count):
+        words = ' '.join(rng.choice(TOPICS + TYPES) for _ in range(35))
+        records.append({
+            'timestamp': (start + timedelta(minutes=30 * n)).isoformat(),
+            'post': {'content': f"🧠 {words[:240]}", 'type': rng.choice(TYPES),
+                     'topic': rng.choice(TOPICS), 'queue_position': n % 7 + 1},
+            'results': {
+                'twitter': {'success': True, 'id': str(rng.getrandbits(60)),
+                            'url': f"https://twitter.com/i/status/{rng.getrandbits(60)}"},
+                'linkedin': {'success': rng.random() > 0.1, 'error': None},
+            },
+        })
+    return records
+
+
+def old_save(path, records):
+    with open(path, 'w') as f:
+        json.dump(records, f, indent=2)
+
+
+def old_load(path):
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def best_time(func):
+    times = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or SIZES
+    backends = serialization.available_backends()
+    missing = [name for name in serialization.BACKENDS if name not in backends]
+
+    print(f"🏁 Backends: {', '.join(backends)}"
+          + (f" (not installed: {', '.join(missing)})" if missing else ""))
+
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            records = make_records(size)
+            print(f"\n📦 {size:,} records")
+            print(f"{'format':>16}  {'save':>9}  {'load':>9}  {'size':>9}")
+
+            path = os.path.join(directory, 'old.json')
+            save = best_time(lambda: old_save(path, records))
+            load = best_time(lambda: old_load(path))
+            print(f"{'json indent=2':>16}  {save * 1000:7.1f}ms  {load * 1000:7.1f}ms  "
+                  f"{os.path.getsize(path) / 1024:7.0f}KB")
+
+            for backend in backends:
+                path = os.path.join(directory, f"{backend}.dat")
+                save = best_time(lambda: serialization.save(path, records, backend))
+                load = best_time(lambda: serialization.load(path))
+                if serialization.load(path) != records:
+                    print(f"❌ {backend} did not round-trip")
+                    sys.exit(1)
+                print(f"{backend:>16}  {save * 1000:7.1f}ms  {load * 1000:7.1f}ms  "
+                      f"{os.path.getsize(path) / 1024:7.0f}KB")
+
+
+if __name__ == "__main__":
+    main()
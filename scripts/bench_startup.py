@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+"""Cold-start benchmark for the CLI entry points
+
+Runs each command under `python -X importtime`, several times, and fails
+(exit code 1) when the median import time goes over its budget or when a
+heavy SDK gets imported at startup. Run from the repository root:
+
+    python scripts/bench_startup.py
+"""
+import sys
+import os
+import statistics
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# (name, command, import-time budget in ms). The status commands read the
+# queue database, so they load config and sqlite3 but nothing else.
+COMMANDS = [
+    ('main.py', ['-c', 'import main'], 150),
+    ('generate_content.py status', [os.path.join('scripts', 'generate_content.py'), 'status'], 90),
+    ('check_status.py', [os.path.join('scripts', 'check_status.py')], 90),
+]
+
+# SDKs that must only be imported when their platform or command runs
+HEAVY_MODULES = ['tweepy', 'praw', 'mastodon', 'groq', 'httpx', 'requests']
+
+RUNS = 5
+
+
+def measure(args):
+    """Total import time (ms) and top-level packages imported by one run"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime'] + args,
+        cwd=ROOT, capture_output=True, text=True
+    )
+    total_us = 0
+    modules = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, _, name = line[len('import time:'):].split('|')
+        total_us += int(self_us)
+        modules.add(name.strip().split('.')[0])
+    return total_us / 1000, modules
+
+
+def main():
+    failures = []
+    print(f"🚀 Cold start, median of {RUNS} runs\n")
+
+    for name, args, budget in COMMANDS:
+        times = []
+        modules = set()
+        for _ in range(RUNS):
+            elapsed, imported = measure(args)
+            times.append(elapsed)
+            modules |= imported
+        median = statistics.median(times)
+        heavy = sorted(m for m in HEAVY_MODULES if m in modules)
+
+        ok = median <= budget and not heavy
+        print(f"{'✅' if ok else '❌'} {name:<28} {median:7.1f} ms (budget {budget} ms)")
+        if median > budget:
+            failures.append(f"{name}: {median:.1f} ms over the {budget} ms budget")
+        if heavy:
+            failures.append(f"{name}: imports {', '.join(heavy)} at startup")
+
+    if failures:
+        print("\n❌ Startup regressed:")
+        for failure in failures:
+            print(f"  - {failure}")
+        sys.exit(1)
+
+    print("\n✅ Startup within budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,18 @@
 #!/usr/bin/env python
 """Check system status"""
 import sys
-import json
-sys.path.append('..')
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.post_queue import format_age, get_queue
 
 def check_status():
     print("📊 System Status\n")
     
     # Check queues
-    for queue_file in ['content_queue.json', 'expert_queue.json']:
-        try:
-            with open(f'data/{queue_file}', 'r') as f:
-                items = json.load(f)
-                print(f"{queue_file}: {len(items)} items")
-        except:
-            print(f"{queue_file}: Empty or not found")
+    for name in ['content', 'expert']:
+        status = get_queue(name, migrate=False).stats(preview=0)
+        oldest = f", oldest {format_age(status['oldest_age'])}" if status['count'] else ""
+        print(f"{name} queue: {status['count']} items{oldest}")
     
     print("\n✅ System ready")
 
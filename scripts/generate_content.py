@@ -1,18 +1,45 @@
 # generate_content.py
-from groq_generator import AIContentGenerator
 import sys
-import json
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.post_queue import format_age, get_queue
 
-def show_queue_status():
-    """Display current queue status"""
-    try:
-        with open('content_queue.json', 'r') as f:
-            queue = json.load(f)
-        print(f"\n📋 Current queue has {len(queue)} posts")
-    except:
-        print("\n📋 Queue is empty or not found")
+def show_queue_status(preview=0):
+    """Display current queue status (and the next `preview` posts)"""
+    status = get_queue('content', migrate=False).stats(preview=preview)
+    print(f"\n📋 Current queue has {status['count']} posts")
+    if status['count']:
+        print(f"⏳ Oldest waiting: {format_age(status['oldest_age'])}")
+    if status['head']:
+        print(f"\nNext {len(status['head'])} posts:")
+        for i, post in enumerate(status['head']):
+            print(f"{i+1}. {post.get('title', 'No title')}")
+
+def show_help():
+    """Display available commands"""
+    print("\n📚 AI Content Generator - Commands:")
+    print("\nUsage: python generate_content.py [command]\n")
+    print("Commands:")
+    print("  preview  - Preview 3 AI-generated posts (no saving)")
+    print("  single   - Generate and queue 1 post")
+    print("  week     - Generate and queue 7 posts")
+    print("  status   - Show current queue status")
+    print("  help     - Show this help message")
+    print("\nNo command - Generate and queue 3 posts (default)")
 
 def main():
+    # Commands that don't need the generator (or its imports)
+    command = sys.argv[1].lower() if len(sys.argv) > 1 else None
+    
+    if command == "status":
+        # Just show queue status (read only: an old queue file stays put)
+        show_queue_status(preview=3)
+        return
+    
+    if command == "help":
+        show_help()
+        return
+    
     # Check if API key exists
     import os
     if not os.getenv("GROQ_API_KEY"):
@@ -22,6 +49,7 @@ def main():
     
     # Create generator instance
     try:
+        from groq_generator import AIContentGenerator
         generator = AIContentGenerator()
     except Exception as e:
         print(f"❌ Error creating generator: {e}")
@@ -57,31 +85,6 @@ def main():
             else:
                 print("❌ Failed to generate post")
         
-        elif command == "status":
-            # Just show queue status
-            show_queue_status()
-            try:
-                with open('content_queue.json', 'r') as f:
-                    queue = json.load(f)
-                if queue:
-                    print("\nNext 3 posts:")
-                    for i, post in enumerate(queue[:3]):
-                        print(f"{i+1}. {post.get('title', 'No title')}")
-            except:
-                pass
-        
-        elif command == "help":
-            # Show help
-            print("\n📚 AI Content Generator - Commands:")
-            print("\nUsage: python generate_content.py [command]\n")
-            print("Commands:")
-            print("  preview  - Preview 3 AI-generated posts (no saving)")
-            print("  single   - Generate and queue 1 post")
-            print("  week     - Generate and queue 7 posts")
-            print("  status   - Show current queue status")
-            print("  help     - Show this help message")
-            print("\nNo command - Generate and queue 3 posts (default)")
-        
         else:
             print(f"❌ Unknown command: {command}")
             print("Use 'python generate_content.py help' for available commands")
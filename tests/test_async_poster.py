@@ -0,0 +1,67 @@
+import asyncio
+import sqlite3
+
+from core.async_poster import AsyncSocialMediaPoster
+from core.rate_limiter import RateLimiter
+
+
+class Registry:
+    """Stand-in ClientRegistry with twitter and mastodon configured"""
+
+    def is_configured(self, platform):
+        return platform in ('twitter', 'mastodon')
+
+    def configured_platforms(self):
+        return ['twitter', 'mastodon']
+
+    def get(self, platform):
+        return object()
+
+
+class LockedLedger:
+    def get(self, fingerprint, platform):
+        raise sqlite3.OperationalError("database is locked")
+
+    def record(self, fingerprint, platform, result):
+        raise sqlite3.OperationalError("database is locked")
+
+
+def make_poster(ledger):
+    poster = AsyncSocialMediaPoster(registry=Registry(), ledger=ledger,
+                                    rate_limiter=RateLimiter(), expansion_cache=object())
+
+    async def ok(post):
+        return {'success': True, 'id': post['title'], 'url': None}
+
+    async def broken(post):
+        raise RuntimeError("boom")
+
+    poster._platform_posters = lambda: {'twitter': ok, 'mastodon': broken}
+    return poster
+
+
+def collect(poster, posts):
+    async def run():
+        return [entry async for entry in poster.post_many(posts)]
+    return asyncio.run(asyncio.wait_for(run(), timeout=5))
+
+
+def test_post_many_reports_items_whose_ledger_is_locked():
+    results = collect(make_poster(LockedLedger()), [{'title': 'a'}, {'title': 'b'}])
+
+    assert sorted(index for index, _ in results) == [0, 1]
+    for _, by_platform in results:
+        assert set(by_platform) == {'twitter', 'mastodon'}
+        assert not any(result['success'] for result in by_platform.values())
+
+
+def test_post_many_reports_a_poster_that_raises():
+    class Ledger(LockedLedger):
+        def get(self, fingerprint, platform):
+            return None
+
+    results = dict(collect(make_poster(Ledger()), [{'title': 'a'}]))
+
+    # Recording failed, but the tweet did go out
+    assert results[0]['twitter']['success']
+    assert not results[0]['mastodon']['success']
@@ -0,0 +1,74 @@
+import time
+from datetime import datetime
+
+import pytest
+
+from core import delivery
+from core.post_queue import PostQueue
+
+PLATFORMS = ['twitter', 'devto']
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return PostQueue('content', path=str(tmp_path / 'queue.db'))
+
+
+def attempt(queue, results):
+    item_id, item = queue.claim()
+    delivery.record_results(item, results)
+    return item_id, item, delivery.settle(queue, item_id, item, results, PLATFORMS)
+
+
+def test_partial_success_keeps_item_until_failed_platform_is_due(queue):
+    queue.put({'title': 'post'})
+
+    item_id, item, outcome = attempt(queue, {
+        'twitter': {'success': True, 'id': '1'},
+        'devto': {'success': False, 'error': 'boom'},
+    })
+
+    assert outcome == 'retry'
+    [(stored_id, stored)] = list(queue)
+    assert stored_id == item_id
+    assert stored['deliveries']['twitter']['status'] == 'sent'
+    assert stored['deliveries']['devto']['status'] == 'failed'
+    # Not an item failure: no attempt counted against it
+    assert queue.dead_letters() == []
+
+    # Held back (and not due) until devto may be retried
+    retry_at = datetime.fromisoformat(stored['deliveries']['devto']['next_attempt_at']).timestamp()
+    assert queue.claim() is None
+    assert queue.claim_due() == []
+    assert queue.next_due_in() == pytest.approx(retry_at - time.time(), abs=1)
+    assert delivery.due_platforms(stored, PLATFORMS) == []
+
+
+def test_retry_posts_only_to_failed_platform_and_finishes(queue):
+    queue.put({'title': 'post'})
+    item_id, item, _ = attempt(queue, {
+        'twitter': {'success': True, 'id': '1'},
+        'devto': {'success': False, 'error': 'boom'},
+    })
+    queue.release(item_id, item, retry_at=time.time() - 1)  # skip the backoff
+
+    item_id, item = queue.claim()
+    assert delivery.due_platforms(item, PLATFORMS, now=datetime.max) == ['devto']
+    results = {'devto': {'success': True, 'id': '2'}}
+    delivery.record_results(item, results)
+
+    assert delivery.settle(queue, item_id, item, results, PLATFORMS) == 'done'
+    assert len(queue) == 0
+
+
+def test_nothing_sent_counts_as_item_failure(queue):
+    queue.put({'title': 'post'})
+
+    _, _, outcome = attempt(queue, {
+        'twitter': {'success': False, 'error': 'down'},
+        'devto': {'success': False, 'error': 'down'},
+    })
+
+    assert outcome == 'retry'
+    assert queue.claim() is None
+    assert queue._read("SELECT attempts FROM items")[0][0] == 1
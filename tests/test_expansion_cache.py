@@ -0,0 +1,26 @@
+import os
+
+from core.expansion_cache import ExpansionCache
+
+
+def test_failed_disk_write_leaves_no_temp_file(tmp_path, monkeypatch):
+    cache = ExpansionCache(directory=str(tmp_path))
+    key = cache.make_key('content', 'model', 1)
+
+    def fail(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, 'replace', fail)
+    cache.put(key, 'expanded')
+
+    assert os.listdir(tmp_path) == []
+    # Still served from memory
+    assert cache.get(key) == 'expanded'
+
+
+def test_disk_tier_survives_a_new_cache(tmp_path):
+    cache = ExpansionCache(directory=str(tmp_path))
+    key = cache.make_key('content', 'model', 1)
+    cache.put(key, 'expanded')
+
+    assert ExpansionCache(directory=str(tmp_path)).get(key) == 'expanded'
@@ -0,0 +1,39 @@
+import multiprocessing
+
+from core.history_log import HistoryLog, compact, iter_history
+
+WRITERS = 4
+RECORDS = 200
+
+
+def write_records(path, writer):
+    log = HistoryLog(path, max_bytes=2000, backups=1000, fsync_every=1000)
+    for index in range(RECORDS):
+        log.append({'writer': writer, 'index': index})
+    log.close()
+
+
+def test_processes_rotating_together_keep_every_record(tmp_path):
+    path = str(tmp_path / 'history.jsonl')
+    processes = [multiprocessing.Process(target=write_records, args=(path, writer))
+                 for writer in range(WRITERS)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+    records = {(record['writer'], record['index']) for record in iter_history(path)}
+    assert len(records) == WRITERS * RECORDS
+
+
+def test_locked_allows_appending_while_held(tmp_path):
+    path = str(tmp_path / 'history.jsonl')
+    log = HistoryLog(path)
+    with log.locked():
+        log.append({'n': 1})
+        with log.locked():
+            log.append({'n': 2})
+    log.close()
+
+    assert compact(path) == (2, 0)
+    assert [record['n'] for record in iter_history(path)] == [1, 2]
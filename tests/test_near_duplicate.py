@@ -0,0 +1,57 @@
+import random
+
+from core.near_duplicate import NearDuplicateIndex, candidate_probability
+
+PAIRS = 300
+WORDS = 38
+
+
+def jaccard_pair(rng, similarity):
+    """Two texts of WORDS distinct words whose word sets have this Jaccard similarity"""
+    shared = round(2 * WORDS * similarity / (1 + similarity))
+    words = [f"w{rng.getrandbits(40)}" for _ in range(2 * WORDS - shared)]
+    return ' '.join(words[:WORDS]), ' '.join(words[:shared] + words[WORDS:])
+
+
+def caught(similarity, seed=1):
+    """Share of pairs at similarity whose second text finds the first"""
+    rng = random.Random(seed)
+    index = NearDuplicateIndex(threshold=0.25, length=128, shingle_size=1)
+    hits = 0
+    for _ in range(PAIRS):
+        first, second = jaccard_pair(rng, similarity)
+        index.add('first', first)
+        hits += index.find(second) is not None
+    return hits / PAIRS
+
+
+def test_recall_follows_banding_curve():
+    index = NearDuplicateIndex(threshold=0.25, length=128)
+    for similarity in (0.3, 0.4, 0.5):
+        expected = candidate_probability(similarity, index.bands, index.rows)
+        assert caught(similarity) >= expected - 0.1, similarity
+
+
+def test_pairs_well_above_threshold_are_caught():
+    assert caught(0.5) >= 0.95
+    assert caught(0.7) == 1.0
+
+
+def test_unrelated_texts_are_rarely_flagged():
+    assert caught(0.05) <= 0.05
+
+
+def test_reworded_post_is_found():
+    index = NearDuplicateIndex()
+    index.add('original', "Sparse attention cuts transformer inference cost by skipping tokens "
+                          "that barely matter, and most models lose almost no accuracy doing it")
+    match = index.find("Sparse attention cuts transformer inference cost by skipping tokens "
+                       "that hardly matter, and most models lose almost no quality doing it")
+    assert match is not None and match[0] == 'original'
+
+
+def test_remove_drops_key():
+    index = NearDuplicateIndex()
+    index.add('a', "one two three four five six")
+    index.remove('a')
+    assert 'a' not in index and index.find("one two three four five six") is None
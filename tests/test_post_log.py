@@ -0,0 +1,54 @@
+import asyncio
+import time
+
+from core.post_log import PostLog, drain
+
+
+class Limiter:
+    max_wait = 60
+
+
+class Engine:
+    """Stand-in posting engine recording how long each cursor stays leased"""
+
+    platform_timeout = 600
+    rate_limiter = Limiter()
+
+    def __init__(self, log):
+        self.log = log
+        self.leased_for = []
+
+    def get_enabled_platforms(self):
+        return ['twitter', 'devto']
+
+    def create_post(self, title, content, url):
+        return {'title': title, 'content': content, 'url': url}
+
+    async def post_to_platform(self, platform, post):
+        expires = self.log._read("SELECT lease_expires FROM log_cursors WHERE platform = ?", (platform,))[0][0]
+        self.leased_for.append(expires - time.time())
+        if post['title'] == 'bad' and platform == 'devto':
+            return {'success': False, 'error': 'nope'}
+        return {'success': True}
+
+
+def test_drain_posts_each_platform_and_keeps_failures(tmp_path):
+    log = PostLog('content', path=str(tmp_path / 'q.db'), lease_seconds=30)
+    log.append_many([{'title': 'a'}, {'title': 'bad'}, {'title': 'c', 'platforms': ['twitter']}])
+    engine = Engine(log)
+
+    assert asyncio.run(drain(log, engine)) == {'twitter': 3, 'devto': 1}
+    assert log.depths() == {'devto': 1, 'twitter': 0}
+    assert log.cursors()['devto']['attempts'] == 1
+    # Trimmed up to the failed entry devto still needs
+    assert len(log) == 2
+
+
+def test_drain_lease_outlasts_a_slow_post(tmp_path):
+    log = PostLog('content', path=str(tmp_path / 'q.db'), lease_seconds=30)
+    log.append({'title': 'a', 'platforms': ['twitter']})
+    engine = Engine(log)
+
+    asyncio.run(drain(log, engine, ['twitter']))
+
+    assert min(engine.leased_for) > engine.platform_timeout + Limiter.max_wait
@@ -0,0 +1,108 @@
+import time
+
+import pytest
+
+from core import post_queue, serialization
+from core.post_queue import PostQueue
+
+
+@pytest.fixture
+def db(tmp_path):
+    return str(tmp_path / 'queue.db')
+
+
+def test_claim_hides_item_until_ack_or_release(db):
+    queue = PostQueue('content', path=db, owner='a')
+    other = PostQueue('content', path=db, owner='b')
+    first, second = queue.put_many([{'title': 'one'}, {'title': 'two'}])
+
+    assert queue.claim() == (first, {'title': 'one'})
+    assert other.claim() == (second, {'title': 'two'})
+    assert other.claim() is None
+
+    # Only the lease holder may settle an item
+    assert not other.ack(first)
+    assert queue.release(first, {'title': 'one', 'seen': True})
+    assert other.claim() == (first, {'title': 'one', 'seen': True})
+    assert other.ack(first)
+    assert len(queue) == 1
+
+
+def test_expired_lease_is_claimable_again(db):
+    queue = PostQueue('content', path=db, owner='a')
+    other = PostQueue('content', path=db, owner='b')
+    item_id = queue.put({'title': 'one'})
+
+    queue.claim(lease_seconds=0.05)
+    time.sleep(0.1)
+    assert other.claim()[0] == item_id
+    # The first owner lost it
+    assert not queue.ack(item_id)
+
+
+def test_renew_extends_only_own_lease(db):
+    queue = PostQueue('content', path=db, owner='a')
+    other = PostQueue('content', path=db, owner='b')
+    item_id = queue.put({'title': 'one'})
+
+    queue.claim(lease_seconds=0.05)
+    assert queue.renew(item_id, lease_seconds=60)
+    assert not other.renew(item_id)
+    time.sleep(0.1)
+    assert other.claim() is None
+
+
+def test_claim_due_takes_due_items_earliest_first(db):
+    queue = PostQueue('expert', path=db)
+    now = time.time()
+    later = queue.put({'content': 'later', 'due_at': '2999-01-01T00:00:00'})
+    second = queue.put({'content': 'second', 'due_at': '2000-01-02T00:00:00'})
+    first = queue.put({'content': 'first', 'due_at': '2000-01-01T00:00:00'})
+
+    assert [item_id for item_id, _ in queue.claim_due(now=now)] == [first, second]
+    assert queue.claim_due(now=now) == []
+    # Claiming in queue order ignores due times
+    assert queue.claim_many() == [(later, {'content': 'later', 'due_at': '2999-01-01T00:00:00'})]
+
+
+def test_release_with_retry_at_holds_item_back(db):
+    queue = PostQueue('expert', path=db)
+    item_id = queue.put({'content': 'x'})
+    queue.claim_due()
+
+    assert queue.release(item_id, retry_at=time.time() + 300)
+    assert queue.claim_due() == []
+    assert queue.claim() is None
+    assert 290 < queue.next_due_in() <= 300
+    assert queue.claim_due(now=time.time() + 400) == []  # due, but not yet available
+
+
+def test_nack_backs_off_then_dead_letters(db):
+    queue = PostQueue('content', path=db, max_attempts=2)
+    item_id = queue.put({'title': 'one'})
+
+    queue.claim()
+    assert queue.nack(item_id, error='boom') == 'retry'
+    assert queue.claim() is None
+    assert queue.next_due_in() > 0
+
+    queue.release(item_id, retry_at=time.time() - 1)  # skip the backoff
+    queue.claim()
+    assert queue.nack(item_id, error='boom again') == 'dead'
+    assert len(queue) == 0
+    [dead] = queue.dead_letters()
+    assert (dead['id'], dead['attempts'], dead['error']) == (item_id, 2, 'boom again')
+
+    assert queue.requeue_dead() == 1
+    assert queue.claim()[1] == {'title': 'one'}
+
+
+def test_migrate_legacy_file_imports_once(db, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    serialization.save(post_queue.LEGACY_FILES['content'], [{'title': 'old'}, {'title': 'older'}])
+    queue = PostQueue('content', path=db)
+
+    assert queue.migrate_legacy_file() == 2
+    assert queue.migrate_legacy_file() == 0
+    assert [item['title'] for item in queue.items()] == ['old', 'older']
+    assert (tmp_path / 'content_queue.json.migrated').exists()
@@ -0,0 +1,42 @@
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from core.client_registry import tweet_limits_hook
+from core.rate_limiter import parse_rate_limit_headers
+
+
+def test_retry_after_as_http_date():
+    at = datetime.now(timezone.utc).replace(microsecond=0) + timedelta(minutes=5)
+    assert parse_rate_limit_headers({'retry-after': format_datetime(at, usegmt=True)}) == (0, at.timestamp())
+
+
+def test_retry_after_as_seconds_and_garbage():
+    remaining, reset_at = parse_rate_limit_headers({'retry-after': '30'})
+    assert remaining == 0 and reset_at > datetime.now().timestamp() + 25
+    assert parse_rate_limit_headers({'retry-after': 'soon'}) is None
+
+
+class Limiter:
+    def __init__(self):
+        self.seen = []
+
+    def observe_headers(self, platform, headers):
+        self.seen.append((platform, headers))
+
+
+def response(method, url):
+    return SimpleNamespace(request=SimpleNamespace(method=method, url=url),
+                           headers={'x-rate-limit-remaining': '1'})
+
+
+def test_tweet_hook_only_observes_posting():
+    limiter = Limiter()
+    hook = tweet_limits_hook(limiter)
+
+    hook(response('POST', 'https://api.twitter.com/2/tweets'))
+    hook(response('GET', 'https://api.twitter.com/2/users/me'))
+    hook(response('DELETE', 'https://api.twitter.com/2/tweets/123'))
+    hook(response('GET', 'https://api.twitter.com/2/users/1/tweets?max_results=5'))
+
+    assert limiter.seen == [('twitter', {'x-rate-limit-remaining': '1'})]
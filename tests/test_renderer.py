@@ -0,0 +1,54 @@
+from core.renderer import PostRenderer, platform_length, truncate
+
+URL = 'https://example.com/a/very/long/path/to/the/article?with=query&and=more'
+
+
+def test_truncate_prefers_full_sentences():
+    text = "First sentence here. Second sentence is rather longer than the first one."
+    assert truncate(text, 36) == "First sentence here."
+    # Unless that would drop more than half the room
+    assert truncate(text, 44) == "First sentence here. Second sentence is..."
+
+
+def test_truncate_falls_back_to_words():
+    text = "one two three four five six seven eight nine ten"
+    result = truncate(text, 20)
+    assert result == "one two three..."
+    assert len(result) <= 20
+
+
+def test_short_text_is_untouched():
+    assert truncate("Short.", 280) == "Short."
+
+
+def test_twitter_counts_links_as_tco():
+    text = f"Read this {URL}"
+    assert platform_length(text, 'twitter') == len("Read this ") + 23
+
+
+def test_twitter_keeps_title_and_link_when_shortening_content():
+    post = {'title': 'A title', 'content': 'word ' * 200, 'url': URL}
+    tweet = PostRenderer().render_twitter(post)
+
+    assert tweet['truncated']
+    assert tweet['length'] <= 280
+    assert tweet['text'].startswith('A title\n\n')
+    assert tweet['text'].endswith(f'\n\n{URL}')
+
+
+def test_truncation_never_splits_a_link():
+    text = 'intro ' * 40 + URL + ' outro'
+    result = truncate(text, 250)
+    assert URL not in result
+    assert 'https' not in result
+
+
+def test_overlong_title_is_shortened_but_link_kept():
+    post = {'title': 'A very long title ' * 30, 'content': 'Some content.', 'url': URL}
+    renderer = PostRenderer()
+
+    for platform, limit in (('twitter', 280), ('mastodon', 500)):
+        payload = renderer.render(post, [platform])[platform]
+        assert payload['truncated']
+        assert payload['text'].endswith(f'\n\n{URL}')
+        assert payload['length'] == platform_length(payload['text'], platform) <= limit